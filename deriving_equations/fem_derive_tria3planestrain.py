@@ -73,7 +73,7 @@ Me = sympy.zeros(num_nodes*DOF, num_nodes*DOF)
 C = E/((1+nu)*(1-2*nu))*sympy.Matrix(
         [[1-nu, nu, 0],
          [nu, 1-nu, 0],
-         [0, 0, 1-2*nu]])
+         [0, 0, (1-2*nu)/2]])
 BL = Matrix(
         # u v (node 1, node2, node3)
         [[N1x, 0, N2x, 0, N3x, 0],         #exx = u,x
@@ -5,9 +5,11 @@ import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.linalg import eigh, cholesky
+from scipy.linalg import eigh
 
 from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
+from tudaesasII.utils import animate
 
 # number of nodes along x
 nx = 10
@@ -65,9 +67,9 @@ Kuu = K[bu, :][:, bu]
 Muu = M[bu, :][:, bu]
 
 # solving symmetric eigenvalue problem
-L = cholesky(Muu, lower=True)
-Linv = np.linalg.inv(L)
-Kuutilde = (Linv @ Kuu) @ Linv.T
+transf = CholeskyTransform(Kuu, Muu)
+L = transf.L
+Kuutilde = transf.Ktilde()
 
 eigvals, V = eigh(Kuutilde)
 wn = eigvals**0.5
@@ -95,11 +97,13 @@ for I in range(nmodes):
     c1.append( V[:, I] @ L.T @ u0u )
     c2.append( V[:, I] @ L.T @ v0u / wn[I] )
 
+modes = transf.to_physical(V[:, :nmodes])
+
 def ufunc(t):
     tmp = 0
     for I in range(nmodes):
         tmp += (c1[I]*np.cos(wn[I]*t[:, None]) +
-                c2[I]*np.sin(wn[I]*t[:, None]))*(Linv.T@V[:, I])
+                c2[I]*np.sin(wn[I]*t[:, None]))*modes[:, I]
     return tmp
 
 # to plot
@@ -109,44 +113,32 @@ uu = ufunc(t)
 u_xt = np.zeros((t.shape[0], K.shape[0]))
 u_xt[:, bu] = uu
 
-plt.ion()
+# deformed geometry of all frames
+xplot = xmesh + u_xt[:, 0::DOF]
+yplot = ymesh + u_xt[:, 1::DOF]
 
 fig, axes = plt.subplots(nrows=2, figsize=(10, 5))
 for s in axes[0].spines.values():
     s.set_visible(False)
+axes[0].set_xticks([])
+axes[0].set_yticks([])
+axes[0].set_xlim(0, 1.1*length)
+axes[0].set_ylim(-2, 2)
 axes[1].spines['right'].set_visible(False)
 axes[1].spines['top'].set_visible(False)
+axes[1].set_xlim(0, t.max())
 axes[1].set_ylim(u_xt[:, 1::DOF].min(), u_xt[:, 1::DOF].max())
-
-data = []
-line = axes[1].plot([], [], '-')[0]
-line2 = axes[1].plot([], [], 'ro')[0]
-for i, ti in enumerate(t):
-    ui = u_xt[i, :]
-    u1 = ui[0::DOF]
-    u2 = ui[1::DOF]
-
-    axes[0].clear()
-    axes[0].set_xticks([])
-    axes[0].set_yticks([])
-    axes[0].set_xlim(0, 1.1*length)
-    axes[0].set_ylim(-2, 2)
-    axes[0].set_title('t = %1.3f' % ti)
-    xplot = xmesh + u1
-    yplot = ymesh + u2
-    axes[0].plot(xplot, yplot, 'k')
-    axes[0].scatter(xplot[-1], yplot[-1], c='r')
-
-    axes[1].set_xlim(max(0, ti-0.5), ti+0.01)
-    data.append([ti, u2[-1]])
-    line.set_data(np.asarray(data).T)
-    line2.set_data(ti, u2[-1])
-
-    plt.pause(1e-15)
-
-    if not plt.fignum_exists(fig.number):
-        fig.savefig('plot_subplots.png', bbox_inches='tight')
-        break
+axes[1].plot(t, yplot[:, -1], '-', color='lightgray')
+
+beam = axes[0].plot([], [], 'k')[0]
+tip = axes[0].plot([], [], 'ro')[0]
+title = axes[0].set_title('')
+tip_history = axes[1].plot([], [], 'ro')[0]
+ani = animate(fig, [beam, tip, title, tip_history],
+        [(xplot, yplot), (xplot[:, -1:], yplot[:, -1:]),
+         ['t = %1.3f' % ti for ti in t], (t[:, None], yplot[:, -1:])])
+plt.show()
+fig.savefig('plot_subplots.png', bbox_inches='tight')
 
 # frequency analysis
 num = 100000
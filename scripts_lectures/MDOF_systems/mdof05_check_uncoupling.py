@@ -2,9 +2,10 @@ import sys
 sys.path.append('../..')
 
 import numpy as np
-from scipy.linalg import eigh, cholesky
+from scipy.linalg import eigh
 
 from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
 
 # number of nodes along x
 nx = 100
@@ -67,9 +68,9 @@ eigvals_g, U = eigh(a=Kuu, b=Muu)
 wn_g = eigvals_g**0.5
 
 # solving symmetric eigenvalue problem
-L = cholesky(Muu, lower=True)
-Linv = np.linalg.inv(L)
-Kuutilde = (Linv @ Kuu) @ Linv.T
+transf = CholeskyTransform(Kuu, Muu)
+L = transf.L
+Kuutilde = transf.Ktilde()
 
 #NOTE checking if Kuutilde is symmetric
 assert np.allclose(Kuutilde, Kuutilde.T)
@@ -5,10 +5,10 @@ import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.linalg import cholesky
-from numpy.linalg import eigh
 
 from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
+from tudaesasII.modal import modal_convolution, SeparableLoad
 
 
 m2mm = 1000
@@ -90,17 +90,15 @@ Kuk = K[bu, :][:, bk]
 Kkk = K[bk, :][:, bk]
 
 # finding natural frequencies and orthonormal base
-L = cholesky(Muu, lower=True)
-Linv = np.linalg.inv(L)
-Ktilde = Linv @ Kuu @ Linv.T
-gamma, V = eigh(Ktilde) # already gives V[:, i] normalized to 1
+transf = CholeskyTransform(Kuu, Muu)
+L = transf.L
+gamma, V = transf.eigh() # already gives V[:, i] normalized to 1
 omegan = gamma**0.5
 print('First 5 natural frequencies', omegan[:5])
 
 # calculating vibration modes from orthonormal base (remember U = L^(-T) V)
 modes = np.zeros((DOF*n, len(gamma)))
-for i in range(modes.shape[1]):
-    modes[bu, i] = Linv.T @ V[:, i]
+modes[bu] = transf.to_physical(V)
 
 # ploting vibration modes
 for i in range(5):
@@ -174,42 +172,35 @@ c1 = r0
 c2 = rdot0/omegan[:nmodes]
 
 # dynamic analysis
-# NOTE this can be further vectorized using NumPy bradcasting, but I kept this
-# loop in order to make the code more understandable
-f = np.zeros_like(fg)
 u = np.zeros((DOF*n, len(t)))
-rpc = np.zeros((nmodes, len(t)))
 
-on = omegan[:nmodes][:, None]
-
-# convolution integral: general load as a sequence of impulse loads
-
-def r_t(t, t1, t2, on, fmodaln):
-    tn = (t1 + t2)/2
-    dt = t2 - t1
-    # undamped function
-    H = np.heaviside(t - tn, 1.)
-    h = 1/on*np.sin(on*(t - tn))*H
-    return fmodaln*dt*h
+# load as a sum of spatial shapes times time functions, projected to the modal
+# space only once per spatial shape
+# - gravitational forces, constant in time
+# - wind forces, rhoair*(v + v/10*sin(wind_freq*t))**2/2 = q*(1 + sin(wind_freq*t)/10)**2
+load = SeparableLoad()
+load.add(fg)
+fwind = np.zeros(DOF*n)
+fwind[0::DOF] = wind_area*rhoair*wind_speed**2/2
+load.add(fwind, lambda t: (1 + np.sin(wind_freq*t)/10)**2)
+modal_load = load.project(lambda f: P.T @ transf.force(f[bu]))
+
+# modal forces at the middle of each time interval
+tn = (t[:-1] + t[1:])/2
+fmodal = modal_load(tn)
+
+# convolution integral: general load as a sequence of impulse loads,
+# calculated for all modes at once using FFT (undamped)
+rpc = modal_convolution(fmodal, t, omegan[:nmodes], 0.)
 
-for t1, t2 in zip(t[:-1], t[1:]):
-    tn = (t1 + t2)/2
-    f[:] = fg #gravitational forces
-    wind_speed_total = wind_speed + wind_speed/10*np.sin(wind_freq*tn)
-    f_wind = wind_area*rhoair*wind_speed_total**2/2
-    f[0::DOF] = f_wind
-
-    # calculating modal forces
-    fmodaln = (P.T @ Linv @ f[bu])[:, None]
-    # convolution
-    rpc += r_t(t, t1, t2, on, fmodaln)
+on = omegan[:nmodes][:, None]
 
 # superposition with homogeneous solution (using initial conditions)
 rh = c1[:, None]*np.sin(on*t) + c2[:, None]*np.cos(on*t)
 r = rh + rpc
 
 # transforming from r-space to displacement
-u[bu] = Linv.T @ P @ r
+u[bu] = transf.to_physical(P @ r)
 
 plt.clf()
 fig = plt.gcf()
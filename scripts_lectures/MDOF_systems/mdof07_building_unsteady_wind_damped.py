@@ -5,10 +5,11 @@ import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.linalg import cholesky
-from numpy.linalg import eigh
 
 from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
+from tudaesasII.modal import modal_convolution, ModalResult, SeparableLoad
+from tudaesasII.utils import animate
 
 
 m2mm = 1000
@@ -90,17 +91,15 @@ Kuk = K[bu, :][:, bk]
 Kkk = K[bk, :][:, bk]
 
 # finding natural frequencies and orthonormal base
-L = cholesky(Muu, lower=True)
-Linv = np.linalg.inv(L)
-Ktilde = Linv @ Kuu @ Linv.T
-gamma, V = eigh(Ktilde) # already gives V[:, i] normalized to 1
+transf = CholeskyTransform(Kuu, Muu)
+L = transf.L
+gamma, V = transf.eigh() # already gives V[:, i] normalized to 1
 omegan = gamma**0.5
 print('First 5 natural frequencies', omegan[:5])
 
 # calculating vibration modes from orthonormal base (remember U = L^(-T) V)
 modes = np.zeros((DOF*n, len(gamma)))
-for i in range(modes.shape[1]):
-    modes[bu, i] = Linv.T @ V[:, i]
+modes[bu] = transf.to_physical(V)
 
 # ploting vibration modes
 for i in range(5):
@@ -182,66 +181,57 @@ phi[check] = np.arctan(od[check]*r0[check]/(zeta[check]*on[check]*r0[check] + rd
 A0 = np.sqrt(r0**2 + (zeta*on/od*r0 + rdot0/od)**2)
 
 # dynamic analysis
-# NOTE this can be further vectorized using NumPy bradcasting, but I kept this
-# loop in order to make the code more understandable
-f = np.zeros_like(fg)
-u = np.zeros((DOF*n, len(t)))
-rpc = np.zeros((nmodes, len(t)))
+# load as a sum of spatial shapes times time functions, projected to the modal
+# space only once per spatial shape
+# - gravitational forces, constant in time
+# - wind forces, rhoair*(v + v/10*sin(wind_freq*t))**2/2 = q*(1 + sin(wind_freq*t)/10)**2
+load = SeparableLoad()
+load.add(fg)
+fwind = np.zeros(DOF*n)
+fwind[0::DOF] = wind_area*rhoair*wind_speed**2/2
+load.add(fwind, lambda t: (1 + np.sin(wind_freq*t)/10)**2)
+modal_load = load.project(lambda f: P.T @ transf.force(f[bu]))
+
+# modal forces at the middle of each time interval
+tn = (t[:-1] + t[1:])/2
+fmodal = modal_load(tn)
+
+# convolution integral: general load as a sequence of impulse loads,
+# calculated for all modes at once using FFT
+rpc = modal_convolution(fmodal, t, on, zeta)
 
 on = on[:, None]
 od = od[:, None]
 zeta = zeta[:, None]
 
-# convolution integral: general load as a sequence of impulse loads
-
-def r_t(t, t1, t2, on, zeta, od, fmodaln):
-    tn = (t1 + t2)/2
-    dt = t2 - t1
-    # damped function
-    H = np.heaviside(t - tn, 1.)
-    h = np.zeros((fmodaln.shape[0], t.shape[0]))
-    check = t >= tn
-    h[:, check] = 1/od*np.exp(-zeta*on*(t[check] - tn))*np.sin(od*(t[check] - tn))*H[check]
-    return fmodaln*dt*h
-
-for t1, t2 in zip(t[:-1], t[1:]):
-    tn = (t1 + t2)/2
-    f[:] = fg #gravitational forces
-    wind_speed_total = wind_speed + wind_speed/10*np.sin(wind_freq*tn)
-    f_wind = wind_area*rhoair*wind_speed_total**2/2
-    f[0::DOF] = f_wind
-
-    # calculating modal forces
-    fmodaln = (P.T @ Linv @ f[bu])[:, None]
-    # convolution
-    rpc += r_t(t, t1, t2, on, zeta, od, fmodaln)
-
 # superposition between homogeneous solution and forced solution
 rh = A0[:, None]*np.exp(-zeta*on*t)*np.sin(od*t + phi[:, None])
 r = rh + rpc
 
-# transforming from r-space to displacement
-u[bu] = Linv.T @ P @ r
+# transforming from r-space to displacement, only when plotting
+result = ModalResult(transf.to_physical(P), r, t, bu=bu)
+
+# lateral displacements of all plotted frames
+steps = slice(0, None, plot_freq)
+ux = result.u(slice(0, None, DOF), steps).T*m2mm
 
 plt.clf()
 fig = plt.gcf()
-for i in range(len(t)):
-    if i % plot_freq == 0:
-        plt.cla()
-        plt.title('Oscillating building, t=%1.3f s' % t[i])
-        plt.xlim(-60, 60)
-        plt.ylim(0, y.max()*1.1)
-        plt.plot(u[0::DOF, i]*m2mm, y)
-        plt.xlabel('Lateral displacement, $mm$')
-        plt.ylabel('Height, $m$')
-        utip = u[0::DOF, i][-1]
-        plt.text(0, y.max()*1.05, '%1.2f mm' % (utip*m2mm))
-        plt.pause(1e-9)
-        if not plt.fignum_exists(fig.number):
-            break
+ax = plt.gca()
+ax.set_xlim(-60, 60)
+ax.set_ylim(0, y.max()*1.1)
+ax.set_xlabel('Lateral displacement, $mm$')
+ax.set_ylabel('Height, $m$')
+building = ax.plot([], [])[0]
+title = ax.set_title('')
+tip = ax.text(0, y.max()*1.05, '')
+ani = animate(fig, [building, title, tip],
+        [(ux, y), ['Oscillating building, t=%1.3f s' % ti for ti in t[steps]],
+         ['%1.2f mm' % utip for utip in ux[:, -1]]])
+plt.show()
 
 plt.clf()
-plt.plot(t, u[0::DOF, :][-1]*m2mm)
+plt.plot(t, result.u(DOF*(n - 1))*m2mm)
 plt.ylabel('Lateral displacement, $mm$')
 plt.xlabel('Time, $s$')
 plt.show()
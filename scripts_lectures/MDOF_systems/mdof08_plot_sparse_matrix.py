@@ -5,9 +5,9 @@ import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.linalg import cholesky
 
 from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
 
 
 m2mm = 1000
@@ -89,9 +89,8 @@ Kuk = K[bu, :][:, bk]
 Kkk = K[bk, :][:, bk]
 
 # finding natural frequencies and orthonormal base
-L = cholesky(Muu, lower=True)
-Linv = np.linalg.inv(L)
-Ktilde = Linv @ Kuu @ Linv.T
+transf = CholeskyTransform(Kuu, Muu)
+Ktilde = transf.Ktilde()
 
 from tudaesasII.utils import plot_sparse_matrix
 
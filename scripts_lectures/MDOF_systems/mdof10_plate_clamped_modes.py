@@ -9,7 +9,8 @@ import numpy as np
 from scipy.linalg import eigh
 from composites.laminate import read_isotropic
 
-from tudaesasII.quad4r import Quad4R, update_K, update_M, DOF
+from tudaesasII.quad4r import (Quad4R, update_K, update_M,
+        membrane_bending_uncoupled, SUBSET_DOFS)
 
 
 plot = True
@@ -45,6 +46,11 @@ n4s = nids_mesh[:-1, 1:].flatten()
 
 plate = read_isotropic(thickness=h, E=E, nu=nu, calc_scf=True)
 
+# isotropic plate, B matrix is zero and the u, v displacements are uncoupled
+# from the bending problem, only w, phix, phiy are assembled
+assert membrane_bending_uncoupled(plate.ABDE)
+DOF = len(SUBSET_DOFS['bending'])
+
 K = np.zeros((DOF*nx*ny, DOF*nx*ny))
 M = np.zeros((DOF*nx*ny, DOF*nx*ny))
 quads = []
@@ -69,8 +75,8 @@ for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
     quad.scf23 = plate.scf_k23
     quad.h = h
     quad.ABDE = plate.ABDE
-    update_K(quad, nid_pos, ncoords, K)
-    update_M(quad, nid_pos, ncoords, M)
+    update_K(quad, nid_pos, ncoords, K, subset='bending')
+    update_M(quad, nid_pos, ncoords, M, subset='bending')
     quads.append(quad)
 
 print('elements created')
@@ -79,13 +85,9 @@ print('elements created')
 # simply supported
 bk = np.zeros(K.shape[0], dtype=bool) #array to store known DOFs
 check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+bk[0::DOF] = check
+bk[1::DOF] = check
 bk[2::DOF] = check
-bk[3::DOF] = check
-bk[4::DOF] = check
-
-#eliminating all u,v displacements
-bk[0::DOF] = True
-bk[1::DOF] = True
 
 bu = ~bk # same as np.logical_not, defining unknown DOFs
 
@@ -102,7 +104,7 @@ for (i,j), mode in np.ndenumerate(modes):
     ax = axes[i, j]
     u = np.zeros(K.shape[0], dtype=float)
     u[bu] = U[:, mode]
-    ax.contourf(xmesh, ymesh, u[2::DOF].reshape(xmesh.shape), cmap=cm.jet)
+    ax.contourf(xmesh, ymesh, u[0::DOF].reshape(xmesh.shape), cmap=cm.jet)
     ax.set_title('mode = %d\n$\omega=%1.2f rad/s$' % (mode+1, omegan[mode]))
 plt.show()
 
@@ -1,6 +1,11 @@
+import sys
+sys.path.append('../..')
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+from tudaesasII.modal import modal_recurrence
+
 def u_t(fn, zeta, m, k, t1, t2, t):
     tn = (t1 + t2)/2
     dt = t2 - t1
@@ -33,7 +38,7 @@ if True:
     plt.hlines(0, xmin=tload.min(), xmax=tload.max(), colors='k', linestyles='--')
     for t1, t2 in zip(tapprox[:-1], tapprox[1:]):
         tn = (t1 + t2)/2
-        fn = forcefunc(tn)
+        fn = forcefunc(tn)[0]
         plt.plot((t1, t1), (0, fn), 'k--')
         plt.plot((t1, t2), (fn, fn), 'k--')
         plt.plot((t2, t2), (0, fn), 'k--')
@@ -47,7 +52,7 @@ for intervals in [2, 6, 10, 14]:
     tapprox = np.linspace(tload.min(), tload.max(), intervals+1)
     for t1, t2 in zip(tapprox[:-1], tapprox[1:]):
         tn = (t1 + t2)/2
-        fn = forcefunc(tn)
+        fn = forcefunc(tn)[0]
         plt.plot((t1, t1), (0, fn), 'k--')
         plt.plot((t1, t2), (fn, fn), 'k--')
         plt.plot((t2, t2), (0, fn), 'k--')
@@ -62,14 +67,18 @@ for intervals in [2, 6, 10, 14]:
     k = 30
     m = 2
     zeta = 0.1
-    ans = 0
-    t1s = []
-    t2s = []
-    for t1, t2 in zip(tapprox[:-1], tapprox[1:]):
-        tn = (t1 + t2)/2
-        ans += u_t(forcefunc(tn), zeta, m, k, t1, t2, t)
+    # impulse responses of all intervals at once, one row per interval
+    t1s = tapprox[:-1, None]
+    t2s = tapprox[1:, None]
+    tns = (t1s + t2s)/2
+    ans = u_t(forcefunc(tns), zeta, m, k, t1s, t2s, t).sum(axis=0)
     ax.plot(t, ans, label='%d intervals' % intervals)
 
+# exact response for the load linearly interpolated at all times in t
+omegan = np.sqrt(k/m)
+uexact = modal_recurrence(forcefunc(t)/m, t, omegan, zeta)[0][0]
+ax.plot(t, uexact, 'k--', label='piecewise linear')
+
 ax.set_xlabel('$t$')
 ax.set_ylabel('$u(t)$')
 ax.legend(loc='upper center')
@@ -1,3 +1,6 @@
+import sys
+sys.path.append('..')
+
 import numpy as np
 import sympy
 from sympy import cos, sin, sqrt, pi
@@ -31,7 +34,8 @@ etan = Fn/(omegan**2 - Omega**2)*cos(Omega*t) + k1*cos(omegan*t)
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+
+from tudaesasII.utils import animate
 
 plt.cla()
 nmaxs = [1, 2, 3, 4, 5, 10, 40]
@@ -79,14 +83,9 @@ if True:
     ts = np.linspace(0, 1200, 2000)
     fps = 25
 
-    def animate(i):
-        global lines
-        y = fyxt(x, ts[i])
-        lines[1].set_data(*[x, y])
-        return lines
-
-    ani = FuncAnimation(fig, animate, range(len(ts)))
-    ani.save('string_harmonic_excitation.gif', fps=fps)
+    # string shape of all frames
+    y = fyxt(x[None, :], ts[:, None])
+    animate(fig, [lines[1]], [(x, y)], filename='string_harmonic_excitation.gif', fps=fps)
 
 
 
@@ -1,3 +1,6 @@
+import sys
+sys.path.append('..')
+
 import numpy as np
 import sympy
 sympy.var('A, An, T, rho')
@@ -26,7 +29,8 @@ etan = eta0*sympy.cos(omegan*t)
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+
+from tudaesasII.utils import animate
 
 nmaxs = [1, 2, 3, 4, 5, 10, 20, 40]
 for nmax in nmaxs:
@@ -63,14 +67,9 @@ if True:
     ts = np.linspace(0, 160, 1000)
     fps = 25
 
-    def animate(i):
-        global lines
-        y = fyxt(x, ts[i])
-        lines[1].set_data(*[x, y])
-        return lines
-
-    ani = FuncAnimation(fig, animate, range(len(ts)))
-    ani.save('string_initial_conditions.gif', fps=fps)
+    # string shape of all frames
+    y = fyxt(x[None, :], ts[:, None])
+    animate(fig, [lines[1]], [(x, y)], filename='string_initial_conditions.gif', fps=fps)
 
 
 
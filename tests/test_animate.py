@@ -0,0 +1,92 @@
+import sys
+sys.path.append('..')
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.backend_bases import CloseEvent
+
+from tudaesasII.utils import animate
+
+
+def setup_figure():
+    fig, ax = plt.subplots(figsize=(3, 2), dpi=50)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(-1.2, 1.2)
+    # blitted artists are drawn above the spines
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.plot([0, 1], [0, 0], '--k')
+    x = np.linspace(0, 1, 50)
+    t = np.linspace(0, 1, 20)
+    y = np.sin(np.pi*x)[None, :]*np.cos(2*np.pi*t)[:, None]
+    line = ax.plot([], [], '-b')[0]
+    tip = ax.plot([], [], 'ro')[0]
+    title = ax.set_title('')
+    artists = [line, tip, title]
+    data = [(x, y), (x[-1:], y[:, -1:]), ['t = %1.3f' % ti for ti in t]]
+    return fig, artists, data
+
+
+def test_animate_blitted_frames():
+    fig, artists, data = setup_figure()
+    frames = []
+    animate(fig, artists, data, writer=frames.append)
+    assert len(frames) == 20
+    assert not np.array_equal(frames[0], frames[10])
+    # blitted frames identical to a full redraw
+    for i in (0, 7):
+        set_frame(artists, data, i)
+        fig.canvas.draw()
+        assert np.array_equal(frames[i], np.asarray(fig.canvas.buffer_rgba()))
+    plt.close(fig)
+
+
+def set_frame(artists, data, i):
+    line, tip, title = artists
+    x, y = data[0]
+    line.set_data(x, y[i])
+    tip.set_data(data[1][0], data[1][1][i])
+    title.set_text(data[2][i])
+
+
+def test_animate_interactive():
+    fig, artists, data = setup_figure()
+    ani = animate(fig, artists, data)
+    # a full draw caches the background, then each frame is blitted
+    fig.canvas.draw()
+    for i in range(6):
+        ani.draw_frame(i)
+    frame = np.asarray(fig.canvas.buffer_rgba()).copy()
+    # identical to a full redraw, including the title outside the axes
+    fig_ref, artists_ref, data_ref = setup_figure()
+    set_frame(artists_ref, data_ref, 5)
+    fig_ref.canvas.draw()
+    assert np.array_equal(frame, np.asarray(fig_ref.canvas.buffer_rgba()))
+    plt.close(fig_ref)
+    # the animated artists are drawn again by full draws after closing
+    fig.canvas.callbacks.process('close_event',
+            CloseEvent('close_event', fig.canvas))
+    assert not any(artist.get_animated() for artist in artists)
+    plt.close(fig)
+
+
+def test_animate_gif(tmp_path):
+    from PIL import Image
+    fig, artists, data = setup_figure()
+    filename = str(tmp_path / 'test.gif')
+    assert animate(fig, artists, data, filename=filename, fps=10) is None
+    with Image.open(filename) as im:
+        assert im.n_frames > 1
+    ani = animate(fig, artists, data)
+    assert callable(ani.draw_frame)
+    with pytest.raises(ValueError):
+        animate(fig, artists, [data[0], data[1], data[2][:5]])
+    plt.close(fig)
+
+
+if __name__ == '__main__':
+    test_animate_blitted_frames()
+    test_animate_interactive()
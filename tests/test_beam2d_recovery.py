@@ -0,0 +1,61 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from tudaesasII import beam2d
+
+
+def test_beam2d_batch_recovery():
+    rng = np.random.default_rng(0)
+    n = 8
+    x = np.linspace(0, 3, n)
+    y = x**2/10
+    ncoords = np.vstack((x, y)).T
+    nids = 1 + np.arange(n)
+    nid_pos = dict(zip(nids, np.arange(n)))
+    DOF = beam2d.DOF
+    K = np.zeros((DOF*n, DOF*n))
+    beams = []
+    for n1, n2 in zip(nids[:-1], nids[1:]):
+        beam = beam2d.Beam2D()
+        beam.n1 = n1
+        beam.n2 = n2
+        beam.A1 = beam.A2 = 0.05**2
+        beam.Izz1 = beam.Izz2 = 0.05**4/12
+        beam2d.update_K(beam, nid_pos, ncoords, K)
+        beams.append(beam)
+
+    nt = 5
+    u = rng.random((DOF*n, nt))
+    ue = beam2d.gather_displacements(beams, nid_pos, u)
+    assert ue.shape == (n-1, 6, nt)
+    uv = beam2d.uv_elements(beams, ue, n=11)
+    exx = beam2d.exx_elements(0.025, beams, ue, n=4)
+    assert uv.shape == (2, n-1, 11, nt)
+    assert exx.shape == (n-1, 4, nt)
+
+    for e, beam in enumerate(beams):
+        c1 = DOF*nid_pos[beam.n1]
+        c2 = DOF*nid_pos[beam.n2]
+        args = [u[c1], u[c1+1], u[c1+2], u[c2], u[c2+1], u[c2+2]]
+        uv_e = beam2d.uv(beam, *args, n=11)
+        assert uv_e.shape == (2, nt, 11)
+        assert np.allclose(uv_e, uv[:, e].transpose(0, 2, 1))
+        assert np.allclose(beam2d.exx(0.025, beam, *args, n=4), exx[e].T)
+
+    # displacements are continuous between elements and match the nodes
+    assert np.allclose(uv[:, :-1, -1], uv[:, 1:, 0])
+    assert np.allclose(uv[0, :, 0], u[0:-DOF:DOF])
+    assert np.allclose(uv[1, :, 0], u[1:-DOF:DOF])
+
+    # rigid body motion produces no strain
+    urigid = np.zeros(DOF*n)
+    urigid[0::DOF] = 0.1
+    urigid[1::DOF] = -0.3
+    ue = beam2d.gather_displacements(beams, nid_pos, urigid)
+    assert np.allclose(beam2d.exx_elements(0.025, beams, ue), 0)
+
+
+if __name__ == '__main__':
+    test_beam2d_batch_recovery()
@@ -0,0 +1,103 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from composites.laminate import read_isotropic
+
+from tudaesasII import quad4r, truss2d
+from tudaesasII.matrixfree import (ElementOperator, lumped_mass_diagonal,
+        critical_time_step)
+from tudaesasII.time_integration import central_difference, newmark
+
+
+def test_critical_time_step_truss():
+    ncoords = np.array([[0., 0.], [0.6, 0.8]])
+    nid_pos = {1: 0, 2: 1}
+    truss = truss2d.Truss2D()
+    truss.n1 = 1
+    truss.n2 = 2
+    truss.A = 1e-4
+    dtcrit = critical_time_step([truss], nid_pos, ncoords)
+    # bar with lumped mass, dtcrit = L/c
+    c = np.sqrt(truss.E/truss.rho)
+    assert np.isclose(dtcrit, 1./c)
+    mdiag = lumped_mass_diagonal([truss], nid_pos, ncoords, 4)
+    assert np.allclose(mdiag, truss.rho*truss.A/2)
+
+
+def test_central_difference_plate_impact():
+    nx = ny = 7
+    a, b, h = 0.3, 0.5, 0.01
+    plate = read_isotropic(thickness=h, E=70e9, nu=0.33, calc_scf=True)
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    n1s = nids_mesh[:-1, :-1].flatten()
+    n2s = nids_mesh[1:, :-1].flatten()
+    n3s = nids_mesh[1:, 1:].flatten()
+    n4s = nids_mesh[:-1, 1:].flatten()
+    DOF = quad4r.DOF
+    N = DOF*nx*ny
+    quads = []
+    for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
+        quad = quad4r.Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.scf13 = plate.scf_k13
+        quad.scf23 = plate.scf_k23
+        quad.h = h
+        quad.rho = 2.7e3
+        quad.ABDE = plate.ABDE
+        quads.append(quad)
+
+    # simply supported
+    bk = np.zeros(N, dtype=bool)
+    check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+    bk[2::DOF] = check
+    bk[0::DOF] = True
+    bk[1::DOF] = True
+    bu = ~bk
+
+    Kuu = ElementOperator(quads, nid_pos, ncoords, N, bu=bu)
+    mdiag = lumped_mass_diagonal(quads, nid_pos, ncoords, N)
+    assert np.isclose(mdiag[2::DOF].sum(), a*b*h*2.7e3)
+    dtcrit = critical_time_step(quads, nid_pos, ncoords)
+
+    # triangular impact pulse at the plate center
+    center = np.where(np.isclose(x, a/2) & np.isclose(y, b/2))[0][0]
+    fdir = np.zeros(N)
+    fdir[DOF*center + 2] = 1.
+    fdir = fdir[bu]
+    def fu(ti):
+        return fdir*1000*max(0., 1 - abs(ti - 2e-4)/2e-4)
+
+    nt = 2001
+    t = np.linspace(0, 0.002, nt)
+    assert t[1] < 0.9*dtcrit
+    u, v, acc = central_difference(Kuu, mdiag[bu], fu, t)
+    assert np.all(np.isfinite(u))
+
+    # same problem using the implicit integrator with the lumped mass
+    Kdense = Kuu @ np.eye(Kuu.shape[0])
+    uref, _, _ = newmark(Kdense, np.diag(mdiag[bu]), fu, t)
+    wc = np.flatnonzero(fdir)[0]
+    assert np.allclose(u[wc], uref[wc], atol=0.02*abs(uref[wc]).max())
+
+    # the solution is unstable above the critical time step
+    t = np.linspace(0, 300*2*dtcrit, 301)
+    with np.errstate(all='ignore'):
+        u, v, acc = central_difference(Kuu, mdiag[bu], fu, t, save_dofs=[wc])
+        assert not abs(u).max() < 1.
+
+
+if __name__ == '__main__':
+    test_critical_time_step_truss()
+    test_central_difference_plate_impact()
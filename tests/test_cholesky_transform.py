@@ -0,0 +1,68 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.linalg import eigh
+
+from tudaesasII.beam2d import Beam2D, update_K, update_M, DOF
+from tudaesasII.eigen import CholeskyTransform
+
+
+def test_cholesky_transform():
+    n = 30
+    L = 3
+    b = 0.05 # m
+    h = 0.05 # m
+    A = h*b
+    Izz = b*h**3/12
+
+    x = np.linspace(0, L, n)
+    y = np.zeros_like(x)
+    ncoords = np.vstack((x ,y)).T
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+
+    K = np.zeros((DOF*n, DOF*n))
+    M = np.zeros((DOF*n, DOF*n))
+    for n1, n2 in zip(nids[:-1], nids[1:]):
+        beam = Beam2D()
+        beam.n1 = n1
+        beam.n2 = n2
+        beam.A1 = beam.A2 = A
+        beam.Izz1 = beam.Izz2 = Izz
+        update_K(beam, nid_pos, ncoords, K)
+        update_M(beam, nid_pos, M)
+
+    bk = np.zeros(K.shape[0], dtype=bool)
+    check = np.isclose(x, 0.)
+    for i in range(DOF):
+        bk[i::DOF] = check
+    bu = ~bk
+    Kuu = K[bu, :][:, bu]
+    Muu = M[bu, :][:, bu]
+
+    eigvals_ref = eigh(Kuu, Muu, eigvals_only=True)
+
+    transf = CholeskyTransform(Kuu, Muu)
+    Ktilde = transf.Ktilde()
+    Linv = np.linalg.inv(transf.L)
+    Ktilde_ref = Linv @ Kuu @ Linv.T
+    assert np.allclose(Ktilde, Ktilde_ref, atol=1e-9*abs(Ktilde_ref).max())
+
+    x = np.random.default_rng(0).random((Kuu.shape[0], 3))
+    Kx = Ktilde @ x
+    assert np.allclose(transf.Ktilde_operator() @ x, Kx, atol=1e-9*abs(Kx).max())
+
+    gamma, V = transf.eigh()
+    assert np.allclose(gamma, eigvals_ref, rtol=1e-6)
+
+    # modes from the orthonormal base using one batched triangular solve
+    U = transf.to_physical(V)
+    assert np.allclose(U.T @ Muu @ U, np.eye(U.shape[1]), atol=1e-8)
+    assert np.allclose(transf.from_physical(U), V)
+    f = x[:, 0]
+    assert np.allclose(transf.force(f), Linv @ f)
+
+
+if __name__ == '__main__':
+    test_cholesky_transform()
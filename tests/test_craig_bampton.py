@@ -0,0 +1,60 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.linalg import eigh
+
+from tudaesasII.reduction import CraigBampton, assemble
+
+
+def chain(nelem, k, m, fixed_first):
+    # spring-mass chain with consistent-like mass coupling between neighbours
+    n = nelem + 1
+    K = np.zeros((n, n))
+    M = np.zeros((n, n))
+    for i in range(nelem):
+        K[i:i+2, i:i+2] += k*np.array([[1, -1], [-1, 1]])
+        M[i:i+2, i:i+2] += m/6*np.array([[2, 1], [1, 2]])
+    if fixed_first:
+        return K[1:, 1:], M[1:, 1:]
+    return K, M
+
+
+def test_craig_bampton_two_substructures():
+    k = 1000.
+    m = 1.
+    # full model with 40 elements, first node fixed
+    K, M = chain(40, k, m, fixed_first=True)
+    eigvals = eigh(K, M, eigvals_only=True)
+
+    # substructure A: elements 1-20, boundary is its last DOF
+    KA, MA = chain(20, k, m, fixed_first=True)
+    # substructure B: elements 21-40, boundary is its first DOF
+    KB, MB = chain(20, k, m, fixed_first=False)
+
+    # all interior modes, the reduction is exact
+    A = CraigBampton(KA, MA, [KA.shape[0]-1], num_modes=KA.shape[0]-1)
+    B = CraigBampton(KB, MB, [0], num_modes=KB.shape[0]-1)
+    Kr, Mr, dofs = assemble([A, B], [[0], [0]], nb=1)
+    eigvals_r = eigh(Kr, Mr, eigvals_only=True)
+    assert np.allclose(eigvals_r, eigvals)
+
+    # truncated fixed-interface modes, using the sparse eigensolver
+    A = CraigBampton(KA, MA, [KA.shape[0]-1], num_modes=8)
+    B = CraigBampton(KB, MB, [0], num_modes=8)
+    Kr, Mr, dofs = assemble([A, B], [[0], [0]], nb=1)
+    assert Kr.shape == (17, 17)
+    eigvals_r, Vr = eigh(Kr, Mr)
+    assert np.allclose(eigvals_r[:5], eigvals[:5], rtol=1e-3)
+    assert np.all(eigvals_r >= eigvals[:17]*(1 - 1e-10))
+
+    # recovery of the first mode in the physical DOFs
+    uA = A.recover(Vr[dofs[0], 0])
+    uB = B.recover(Vr[dofs[1], 0])
+    assert np.isclose(uA[-1], uB[0])
+    u = np.concatenate((uA, uB[1:]))
+    assert np.isclose(u @ K @ u/(u @ M @ u), eigvals_r[0])
+
+
+if __name__ == '__main__':
+    test_craig_bampton_two_substructures()
@@ -0,0 +1,66 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+
+from tudaesasII import beam2d
+from tudaesasII.envelope import Envelope
+from tudaesasII.time_integration import newmark
+
+
+def test_envelope_beam_newmark():
+    # cantilever tower under a harmonic tip load
+    n = 11
+    y = np.linspace(0, 30, n)
+    x = np.zeros_like(y)
+    ncoords = np.vstack((x, y)).T
+    nids = 1 + np.arange(n)
+    nid_pos = dict(zip(nids, np.arange(n)))
+    DOF = beam2d.DOF
+    K = np.zeros((DOF*n, DOF*n))
+    M = np.zeros((DOF*n, DOF*n))
+    beams = []
+    for n1, n2 in zip(nids[:-1], nids[1:]):
+        beam = beam2d.Beam2D()
+        beam.n1 = n1
+        beam.n2 = n2
+        beam.A1 = beam.A2 = 0.5**2
+        beam.Izz1 = beam.Izz2 = 0.5**4/12
+        beam2d.update_K(beam, nid_pos, ncoords, K)
+        beam2d.update_M(beam, nid_pos, M)
+        beams.append(beam)
+    bu = np.ones(DOF*n, dtype=bool)
+    bu[:DOF] = False
+    f = np.zeros(DOF*n)
+    f[-DOF] = 1000.
+    t = np.linspace(0, 5, 1001)
+    def fu(ti):
+        return f[bu]*np.sin(3*ti)
+
+    def recover(uu):
+        u = np.zeros((DOF*n, uu.shape[1]))
+        u[bu] = uu
+        ue = beam2d.gather_displacements(beams, nid_pos, u)
+        return beam2d.exx_elements(0.25, beams, ue)
+
+    env = Envelope(recover, chunksize=97)
+    with pytest.raises(ValueError):
+        env.rms
+    newmark(K[bu][:, bu], M[bu][:, bu], fu, t, output=env)
+    env.flush()
+    assert env.count == t.shape[0]
+    assert env.max.shape == (n-1, 3)
+
+    # reference keeping the whole history
+    uu, _, _ = newmark(K[bu][:, bu], M[bu][:, bu], fu, t)
+    exx = recover(uu)
+    assert np.allclose(env.max, exx.max(axis=-1))
+    assert np.allclose(env.min, exx.min(axis=-1))
+    assert np.allclose(env.tmax, t[exx.argmax(axis=-1)])
+    assert np.allclose(env.tmin, t[exx.argmin(axis=-1)])
+    assert np.allclose(env.rms, np.sqrt((exx**2).mean(axis=-1)))
+
+
+if __name__ == '__main__':
+    test_envelope_beam_newmark()
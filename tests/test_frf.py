@@ -0,0 +1,89 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+from scipy.linalg import eigh, solve
+
+from tudaesasII import frf
+from tudaesasII.frf import modal_frf, direct_frf
+
+
+def test_modal_frf():
+    n = 6
+    k = 1000.
+    K = np.zeros((n+1, n+1))
+    for i in range(n):
+        K[i:i+2, i:i+2] += k*np.array([[1, -1], [-1, 1]])
+    K = K[1:, 1:]
+    M = np.diag(np.linspace(1, 2, n))
+
+    eigvals, modes = eigh(K, M)
+    omegan = np.sqrt(eigvals)
+    zeta = np.linspace(0.01, 0.05, n)
+    # damping matrix corresponding to the modal damping
+    C = M @ modes @ np.diag(2*zeta*omegan) @ modes.T @ M
+
+    omega = np.linspace(0.1, 1.2*omegan.max(), 301)
+    out_dofs = [5, 2]
+    in_dofs = [0, 3, 5]
+    H = modal_frf(modes, omegan, zeta, omega, out_dofs=out_dofs,
+            in_dofs=in_dofs, chunksize=7)
+    assert H.shape == (omega.shape[0], 2, 3)
+    for j, w in enumerate(omega):
+        Hj = solve(K - w**2*M + 1j*w*C, np.eye(n))
+        assert np.allclose(H[j], Hj[np.ix_(out_dofs, in_dofs)])
+
+    A = modal_frf(modes, omegan, zeta, omega, kind='accelerance')
+    R = modal_frf(modes, omegan, zeta, omega)
+    assert np.allclose(A, -omega[:, None, None]**2*R)
+
+
+def direct_problem():
+    n = 30
+    rng = np.random.default_rng(3)
+    K = np.zeros((n+1, n+1))
+    for i in range(n):
+        K[i:i+2, i:i+2] += 1000*np.array([[1, -1], [-1, 1]])
+    K = K[1:, 1:]
+    M = np.diag(rng.uniform(1, 2, n))
+    # non-proportional damping, dashpots at a few DOFs
+    C = np.zeros((n, n))
+    C[3, 3] = 5.
+    C[17, 17] = 2.
+    f = np.zeros((n, 2), dtype=complex)
+    f[n-1, 0] = 1.
+    f[10, 1] = 1j
+    omega = np.linspace(0.1, 40, 37)
+    out_dofs = [0, 10, n-1]
+
+    Href = np.array([solve(K - w**2*M + 1j*w*C, f)[out_dofs] for w in omega])
+    return K, M, C, f, omega, out_dofs, Href
+
+
+def test_direct_frf():
+    K, M, C, f, omega, out_dofs, Href = direct_problem()
+    H1 = direct_frf(K, M, f, omega, Cuu=C, out_dofs=out_dofs, workers=1)
+    assert np.allclose(H1, Href)
+    if frf.shared_memory is None:
+        with pytest.raises(ImportError):
+            direct_frf(K, M, f, omega, Cuu=C, out_dofs=out_dofs, workers=2)
+    else:
+        H2 = direct_frf(K, M, f, omega, Cuu=C, out_dofs=out_dofs, workers=2,
+                batch_size=5)
+        assert np.allclose(H2, Href)
+
+
+def test_direct_frf_without_shared_memory(monkeypatch):
+    K, M, C, f, omega, out_dofs, Href = direct_problem()
+    # as in Python < 3.8, a single process is used by default
+    monkeypatch.setattr(frf, 'shared_memory', None)
+    H = direct_frf(K, M, f, omega, Cuu=C, out_dofs=out_dofs)
+    assert np.allclose(H, Href)
+    with pytest.raises(ImportError):
+        direct_frf(K, M, f, omega, Cuu=C, out_dofs=out_dofs, workers=2)
+
+
+if __name__ == '__main__':
+    test_modal_frf()
+    test_direct_frf()
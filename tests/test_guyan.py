@@ -0,0 +1,63 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.linalg import eigh, solve
+
+from tudaesasII import beam2d
+from tudaesasII.reduction import Guyan
+
+
+def test_guyan_beam_rotations():
+    # cantilever beam, rotations condensed out
+    n = 31
+    x = np.linspace(0, 3, n)
+    y = np.zeros_like(x)
+    ncoords = np.vstack((x, y)).T
+    nids = 1 + np.arange(n)
+    nid_pos = dict(zip(nids, np.arange(n)))
+    DOF = beam2d.DOF
+    K = np.zeros((DOF*n, DOF*n))
+    M = np.zeros((DOF*n, DOF*n))
+    for n1, n2 in zip(nids[:-1], nids[1:]):
+        beam = beam2d.Beam2D()
+        beam.n1 = n1
+        beam.n2 = n2
+        beam.E = 70e9
+        beam.rho = 2.6e3
+        beam.A1 = beam.A2 = 0.05**2
+        beam.Izz1 = beam.Izz2 = 0.05**4/12
+        beam2d.update_K(beam, nid_pos, ncoords, K)
+        beam2d.update_M(beam, nid_pos, M)
+    bk = np.zeros(K.shape[0], dtype=bool)
+    bk[:DOF] = True
+    bu = ~bk
+    slave = np.zeros(K.shape[0], dtype=bool)
+    slave[2::DOF] = True
+    slave = slave[bu]
+
+    Kuu = K[bu][:, bu]
+    Muu = M[bu][:, bu]
+    guyan = Guyan(Kuu, Muu, slave)
+    assert guyan.Kc.shape == (2*(n-1), 2*(n-1))
+
+    # exact static solution for a tip load
+    f = np.zeros(K.shape[0])
+    f[-2] = -1000.
+    uu = solve(Kuu, f[bu])
+    um = solve(guyan.Kc, f[bu][guyan.m])
+    assert np.allclose(guyan.recover(um), uu)
+    R = guyan.recovery_operator()
+    assert np.allclose(R @ um, uu)
+
+    # lowest bending frequencies, upper bounds close to the exact ones
+    eigvals = eigh(Kuu, Muu, eigvals_only=True)
+    eigvals_c, Vc = eigh(guyan.Kc, guyan.Mc)
+    nbend = 4
+    bending = np.sort(eigvals)[:nbend]
+    assert np.all(eigvals_c[:nbend] >= bending*(1 - 1e-10))
+    assert np.allclose(eigvals_c[:nbend], bending, rtol=1e-3)
+
+
+if __name__ == '__main__':
+    test_guyan_beam_rotations()
@@ -0,0 +1,143 @@
+import sys
+sys.path.append('..')
+
+import warnings
+
+import numpy as np
+from scipy.linalg import eigh
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import LinearOperator
+from composites.laminate import read_isotropic
+
+from tudaesasII.quad4r import Quad4R, update_K, update_M, DOF
+from tudaesasII.eigen import lobpcg_modes
+from tudaesasII.precond import block_jacobi, ichol, ilu
+
+
+def plate_matrices(h, nx=9, ny=9):
+    a = 0.3
+    b = 0.5
+
+    # Material Lastrobe Lescalloy
+    E = 203.e9 # Pa
+    nu = 0.33
+    rho = 7.83e3 # kg/m3
+
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    n1s = nids_mesh[:-1, :-1].flatten()
+    n2s = nids_mesh[1:, :-1].flatten()
+    n3s = nids_mesh[1:, 1:].flatten()
+    n4s = nids_mesh[:-1, 1:].flatten()
+
+    plate = read_isotropic(thickness=h, E=E, nu=nu, calc_scf=True)
+
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    M = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
+        quad = Quad4R()
+        quad.rho = rho
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.scf13 = plate.scf_k13
+        quad.scf23 = plate.scf_k23
+        quad.h = h
+        quad.ABDE = plate.ABDE
+        update_K(quad, nid_pos, ncoords, K)
+        update_M(quad, nid_pos, ncoords, M)
+
+    # clamped edges
+    bk = np.zeros(K.shape[0], dtype=bool)
+    check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+    bk[2::DOF] = check
+    bk[3::DOF] = check
+    bk[4::DOF] = check
+    bk[0::DOF] = True
+    bk[1::DOF] = True
+    bu = ~bk
+    Kuu = K[bu, :][:, bu]
+    Muu = M[bu, :][:, bu]
+    return Kuu, Muu, bu
+
+
+def counted(P):
+    # wraps a preconditioner counting its applications, one per iteration
+    count = [0]
+    def matmat(x):
+        count[0] += 1
+        return P.matmat(np.asarray(x).reshape(P.shape[0], -1)).reshape(np.shape(x))
+    return LinearOperator(P.shape, matvec=matmat, matmat=matmat,
+            dtype=P.dtype), count
+
+
+def test_lobpcg_thickness_sweep():
+    num_modes = 4
+    U = None
+    counts = []
+    for h in [0.010, 0.0105, 0.011]:
+        Kuu, Muu, bu = plate_matrices(h)
+        eigvals_ref = eigh(Kuu, Muu, eigvals_only=True)[:num_modes]
+        P, count = counted(ichol(Kuu))
+        # warm start from the modes of the previous sweep step
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UserWarning)
+            eigvals, U = lobpcg_modes(Kuu, Muu, num_modes, X0=U, precond=P)
+        counts.append(count[0])
+        assert np.allclose(eigvals, eigvals_ref, rtol=1e-8)
+        assert np.allclose(U.T @ Muu @ U, np.eye(num_modes), atol=1e-8)
+        res = np.linalg.norm(Kuu @ U - Muu @ U*eigvals, axis=0)
+        assert np.all(res <= 1e-6*eigvals*np.linalg.norm(Muu @ U, axis=0))
+    assert max(counts[1:]) < 0.6*counts[0]
+
+
+def test_lobpcg_ilu():
+    num_modes = 4
+    Kuu, Muu, bu = plate_matrices(0.010)
+    eigvals_ref = eigh(Kuu, Muu, eigvals_only=True)[:num_modes]
+    K0, M0, bu = plate_matrices(0.0105)
+    X0 = eigh(K0, M0)[1][:, :num_modes]
+    # the non-symmetric ILU is opt-in, here converging in a few iterations
+    P, count = counted(ilu(csr_matrix(Kuu)))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', UserWarning)
+        eigvals, U = lobpcg_modes(Kuu, Muu, num_modes, X0=X0, precond=P)
+    assert count[0] <= 6
+    assert np.allclose(eigvals, eigvals_ref, rtol=1e-8)
+
+
+def test_lobpcg_block_jacobi():
+    num_modes = 4
+    Kuu, Muu, bu = plate_matrices(0.010)
+    eigvals_ref = eigh(Kuu, Muu, eigvals_only=True)[:num_modes]
+    groups = (np.arange(bu.shape[0])//DOF)[bu]
+    # initial block from a nearby sweep step
+    K0, M0, bu = plate_matrices(0.0105)
+    X0 = eigh(K0, M0)[1][:, :num_modes]
+    counts = []
+    for X in [X0, None]:
+        P, count = counted(block_jacobi(Kuu, groups=groups))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UserWarning)
+            eigvals, U = lobpcg_modes(Kuu, Muu, num_modes, X0=X,
+                    precond=P, maxiter=300)
+        assert np.allclose(eigvals, eigvals_ref, rtol=1e-8)
+        counts.append(count[0])
+    # the block-Jacobi preconditioner is weak for plate bending, but the warm
+    # start still saves most of the iterations
+    assert counts[0] < counts[1]/4
+
+
+if __name__ == '__main__':
+    test_lobpcg_thickness_sweep()
+    test_lobpcg_ilu()
+    test_lobpcg_block_jacobi()
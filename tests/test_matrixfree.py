@@ -0,0 +1,177 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.spatial import Delaunay
+from scipy.sparse.linalg import spsolve
+from scipy.sparse import csc_matrix
+from composites.laminate import read_isotropic
+
+from tudaesasII import quad4r, tria3r, beam2d, truss2d
+from tudaesasII.matrixfree import ElementOperator
+from tudaesasII.static import solve_static_cg
+
+
+def check_operator(elems, nid_pos, ncoords, K, M, bu, lumped=False):
+    rng = np.random.default_rng(0)
+    N = K.shape[0]
+    Kop = ElementOperator(elems, nid_pos, ncoords, N)
+    x = rng.random(N)
+    assert np.allclose(Kop @ x, K @ x)
+    X = rng.random((N, 3))
+    assert np.allclose(Kop @ X, K @ X)
+    assert np.allclose(Kop.diagonal(), np.diag(K))
+
+    Kuu = K[bu, :][:, bu]
+    Kuuop = ElementOperator(elems, nid_pos, ncoords, N, bu=bu, store=False,
+            chunksize=7)
+    xu = x[bu]
+    assert np.allclose(Kuuop @ xu, Kuu @ xu)
+
+    Mop = ElementOperator(elems, nid_pos, ncoords, N, matrix='M', lumped=lumped)
+    assert np.allclose(Mop @ x, M @ x)
+    return Kuuop
+
+
+def test_matrixfree_quad4r():
+    nx = ny = 5
+    a, b, h = 0.3, 0.5, 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    n1s = nids_mesh[:-1, :-1].flatten()
+    n2s = nids_mesh[1:, :-1].flatten()
+    n3s = nids_mesh[1:, 1:].flatten()
+    n4s = nids_mesh[:-1, 1:].flatten()
+    DOF = quad4r.DOF
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    M = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    quads = []
+    for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
+        quad = quad4r.Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.h = h
+        quad.rho = 7.83e3
+        quad.ABDE = plate.ABDE
+        quad4r.update_K(quad, nid_pos, ncoords, K)
+        quad4r.update_M(quad, nid_pos, ncoords, M)
+        quads.append(quad)
+    bk = np.zeros(K.shape[0], dtype=bool)
+    check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+    bk[2::DOF] = check
+    bk[0::DOF] = True
+    bk[1::DOF] = True
+    bu = ~bk
+    Kuuop = check_operator(quads, nid_pos, ncoords, K, M, bu)
+
+    # matrix-free static solution
+    f = np.zeros(K.shape[0])
+    f[2::DOF][np.isclose(x, a/2) & np.isclose(y, b/2)] = 1.
+    uu_ref = spsolve(csc_matrix(K[bu, :][:, bu]), f[bu])
+    uu, history = solve_static_cg(Kuuop, f[bu], precond='jacobi', rtol=1e-10)
+    assert np.allclose(uu, uu_ref, rtol=1e-6)
+
+
+def test_matrixfree_tria3r():
+    nx = ny = 5
+    a, b, h = 0.3, 0.5, 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    nids = np.asarray(list(nid_pos.keys()))
+    d = Delaunay(ncoords)
+    DOF = tria3r.DOF
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    M = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    trias = []
+    for s in d.simplices:
+        n1, n2, n3 = nids[s]
+        r1, r2, r3 = ncoords[s]
+        if np.cross(np.append(r2 - r1, 0), np.append(r3 - r2, 0))[2] < 0:
+            n1, n2, n3 = n1, n3, n2
+        tria = tria3r.Tria3R()
+        tria.n1 = n1
+        tria.n2 = n2
+        tria.n3 = n3
+        tria.h = h
+        tria.rho = 7.83e3
+        tria.ABDE = plate.ABDE
+        tria3r.update_K(tria, nid_pos, ncoords, K)
+        tria3r.update_M(tria, nid_pos, ncoords, M)
+        trias.append(tria)
+    bu = np.ones(K.shape[0], dtype=bool)
+    bu[:DOF] = False
+    check_operator(trias, nid_pos, ncoords, K, M, bu)
+
+
+def test_matrixfree_beam2d():
+    n = 11
+    x = np.linspace(0, 3, n)
+    y = x**2/10
+    ncoords = np.vstack((x, y)).T
+    nids = 1 + np.arange(n)
+    nid_pos = dict(zip(nids, np.arange(n)))
+    DOF = beam2d.DOF
+    K = np.zeros((DOF*n, DOF*n))
+    M = np.zeros((DOF*n, DOF*n))
+    beams = []
+    for n1, n2 in zip(nids[:-1], nids[1:]):
+        beam = beam2d.Beam2D()
+        beam.n1 = n1
+        beam.n2 = n2
+        beam.A1 = beam.A2 = 0.05**2
+        beam.Izz1 = beam.Izz2 = 0.05**4/12
+        beam2d.update_K(beam, nid_pos, ncoords, K)
+        beam2d.update_M(beam, nid_pos, M, lumped=True)
+        beams.append(beam)
+    bu = np.ones(K.shape[0], dtype=bool)
+    bu[:DOF] = False
+    check_operator(beams, nid_pos, ncoords, K, M, bu, lumped=True)
+
+
+def test_matrixfree_truss2d():
+    nx, ny = 4, 3
+    xtmp = np.linspace(0, 3, nx)
+    ytmp = np.linspace(0, 1, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    d = Delaunay(ncoords)
+    edges = {}
+    for s in d.simplices:
+        for n1, n2 in [(s[0], s[1]), (s[1], s[2]), (s[2], s[0])]:
+            edges[tuple(sorted([n1, n2]))] = [n1, n2]
+    DOF = truss2d.DOF
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    M = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    trusses = []
+    for n1, n2 in edges.values():
+        truss = truss2d.Truss2D()
+        truss.n1 = n1
+        truss.n2 = n2
+        truss.A = 0.01**2
+        truss2d.update_K_M(truss, nid_pos, ncoords, K, M)
+        trusses.append(truss)
+    bu = np.ones(K.shape[0], dtype=bool)
+    bu[:2*DOF] = False
+    check_operator(trusses, nid_pos, ncoords, K, M, bu)
+
+
+if __name__ == '__main__':
+    test_matrixfree_quad4r()
+    test_matrixfree_tria3r()
+    test_matrixfree_beam2d()
+    test_matrixfree_truss2d()
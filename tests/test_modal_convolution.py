@@ -0,0 +1,46 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from tudaesasII.modal import modal_convolution
+
+
+def r_t(t, t1, t2, on, zeta, od, fmodaln):
+    tn = (t1 + t2)/2
+    dt = t2 - t1
+    # damped function
+    H = np.heaviside(t - tn, 1.)
+    h = np.zeros((fmodaln.shape[0], t.shape[0]))
+    check = t >= tn
+    h[:, check] = 1/od*np.exp(-zeta*on*(t[check] - tn))*np.sin(od*(t[check] - tn))*H[check]
+    return fmodaln*dt*h
+
+
+def test_modal_convolution():
+    t = np.linspace(0, 4, 301)
+    omegan = np.array([3., 10., 45.])
+    zeta = np.array([0.02, 0.05, 0.])
+    omegad = omegan*np.sqrt(1 - zeta**2)
+    tn = (t[:-1] + t[1:])/2
+    fmodal = np.array([np.sin(2*tn), tn**2, np.where(tn < 1, 1., 0.)])
+
+    # reference using the summation of impulse responses
+    rref = np.zeros((3, t.shape[0]))
+    for i, (t1, t2) in enumerate(zip(t[:-1], t[1:])):
+        rref += r_t(t, t1, t2, omegan[:, None], zeta[:, None],
+                omegad[:, None], fmodal[:, i:i+1])
+
+    r = modal_convolution(fmodal, t, omegan, zeta)
+    assert r.shape == rref.shape
+    assert np.allclose(r, rref, atol=1e-12*abs(rref).max())
+
+    # forces given at each time are averaged at the middle of the intervals
+    ft = np.array([np.sin(2*t), t**2, t])
+    r = modal_convolution(ft, t, omegan, 0.02)
+    fmid = (ft[:, :-1] + ft[:, 1:])/2
+    assert np.allclose(r, modal_convolution(fmid, t, omegan, 0.02))
+
+
+if __name__ == '__main__':
+    test_modal_convolution()
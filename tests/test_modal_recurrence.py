@@ -0,0 +1,31 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.signal import lsim
+
+from tudaesasII.modal import modal_recurrence
+
+
+def test_modal_recurrence():
+    omegan = np.array([2., 7.3, 15.])
+    zeta = np.array([0., 0.05, 0.3])
+    r0 = np.array([0.1, -0.2, 0.05])
+    rdot0 = np.array([0.5, 0., -1.])
+    t = np.linspace(0, 10, 2001)
+    fmodal = np.vstack((np.sin(1.3*t), 30*t*(t < 1), np.cos(5*t)**2))
+
+    r, rdot = modal_recurrence(fmodal, t, omegan, zeta, r0=r0, rdot0=rdot0)
+
+    # reference with linear interpolation of the input (exact for this case)
+    for i in range(omegan.shape[0]):
+        on = omegan[i]
+        A = [[0, 1], [-on**2, -2*zeta[i]*on]]
+        _, yout, xout = lsim((A, [[0], [1]], [[1, 0]], [[0]]), fmodal[i], t,
+                X0=[r0[i], rdot0[i]], interp=True)
+        assert np.allclose(r[i], yout, atol=1e-8*abs(yout).max())
+        assert np.allclose(rdot[i], xout[:, 1], atol=1e-8*abs(xout[:, 1]).max())
+
+
+if __name__ == '__main__':
+    test_modal_recurrence()
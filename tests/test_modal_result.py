@@ -0,0 +1,50 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from tudaesasII.modal import ModalResult
+
+
+def test_modal_result():
+    rng = np.random.default_rng(0)
+    DOF = 3
+    nnodes = 10
+    bu = np.ones(DOF*nnodes, dtype=bool)
+    bu[:DOF] = False
+    modes = rng.random((bu.sum(), 4))
+    t = np.linspace(0, 2, 201)
+    r = rng.random((4, t.shape[0]))
+    u = np.zeros((DOF*nnodes, t.shape[0]))
+    u[bu] = modes @ r
+
+    result = ModalResult(modes, r, t, bu=bu, cache_size=2)
+    assert np.allclose(result.u(), u)
+    assert np.allclose(result.u(slice(0, None, DOF), 7), u[0::DOF, 7])
+    assert np.allclose(result.u([5, 29], [0, 3]), u[[5, 29]][:, [0, 3]])
+    assert np.isclose(result.u(29, 100), u[29, 100])
+    steps = result.steps(0.5, 1.)
+    assert np.allclose(result.t[steps], t[(t >= 0.5) & (t <= 1.)])
+    assert np.allclose(result.nodal(4, DOF, steps), u[12:15, steps])
+    assert np.allclose(result.nodal(0, DOF), 0)
+
+    # cached slices are reused and read-only
+    a = result.nodal(4, DOF, steps)
+    assert a is result.nodal(4, DOF, steps)
+    assert not a.flags.writeable
+    result.u(1)
+    result.u(2)
+    assert a is not result.nodal(4, DOF, steps)
+
+    # a boolean mask and the equivalent 0/1 integer list are different DOFs
+    mask = np.zeros(DOF*nnodes, dtype=bool)
+    mask[1] = True
+    mask[3] = True
+    assert np.allclose(result.u(mask.tolist(), 5), u[mask, 5])
+    ints = mask.astype(int).tolist()
+    assert np.allclose(result.u(ints, 5), u[ints, 5])
+    assert np.allclose(result.u(mask, 5), u[mask, 5])
+
+
+if __name__ == '__main__':
+    test_modal_result()
@@ -0,0 +1,56 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+from scipy.linalg import eigh
+from scipy.sparse import csr_matrix
+
+from tudaesasII.eigen import mac, ModeTracker
+
+
+def test_mac():
+    rng = np.random.default_rng(0)
+    n = 20
+    A = rng.random((n, n))
+    M = csr_matrix(A @ A.T + n*np.eye(n))
+    K = np.diag(np.arange(1., n + 1))
+    eigvals, U = eigh(K, M.toarray())
+    MAC = mac(U, 3*U[:, ::-1], M)
+    assert np.allclose(MAC, np.eye(n)[:, ::-1])
+    assert np.allclose(mac(U, U), mac(U, U, np.eye(n)))
+
+
+def test_mode_tracking_crossing():
+    # two uncoupled subsystems whose frequencies cross during the sweep
+    M = np.diag([1., 1., 2., 2.])
+    tracker = ModeTracker()
+    k_values = np.linspace(110, 910, 9)
+    for k in k_values:
+        K = np.zeros((4, 4))
+        K[:2, :2] = 400*np.array([[2, -1], [-1, 2]])
+        K[2:, 2:] = k*np.array([[2, -1], [-1, 2]])
+        eigvals, U = eigh(K, M)
+        tracker.update(np.sqrt(eigvals), U, M)
+    omegan = tracker.omegan
+    assert omegan.shape == (9, 4)
+    # each family keeps the frequency of one subsystem, families numbered
+    # according to the ordering of the first step
+    assert np.allclose(omegan[:, 0]**2, k_values/2)
+    assert np.allclose(omegan[:, 1]**2, 3*k_values/2)
+    assert np.allclose(omegan[:, 2]**2, 400)
+    assert np.allclose(omegan[:, 3]**2, 1200)
+    assert np.allclose(tracker.mac, 1.)
+    # ordering of the eigensolver changed along the sweep
+    assert not np.all(tracker.order == np.arange(4))
+    # the number of modes cannot change along the sweep
+    with pytest.raises(ValueError):
+        tracker.update(np.sqrt(eigvals[:3]), U[:, :3], M)
+    with pytest.raises(ValueError):
+        tracker.update(np.sqrt(eigvals[:3]), U, M)
+    assert tracker.omegan.shape == (9, 4)
+
+
+if __name__ == '__main__':
+    test_mac()
+    test_mode_tracking_crossing()
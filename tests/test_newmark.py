@@ -0,0 +1,80 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.linalg import eigh
+
+from tudaesasII.modal import modal_recurrence
+from tudaesasII.time_integration import newmark
+
+
+def spring_mass_chain(n):
+    # masses connected by springs, first spring attached to a known DOF
+    k = 1000.
+    m = 2.
+    K = np.zeros((n+1, n+1))
+    for i in range(n):
+        K[i:i+2, i:i+2] += k*np.array([[1, -1], [-1, 1]])
+    M = np.diag([m]*(n+1))
+    M[0, 1] = M[1, 0] = m/10
+    return K, M
+
+
+def test_newmark_rayleigh():
+    n = 8
+    K, M = spring_mass_chain(n)
+    Kuu = K[1:, 1:]
+    Muu = M[1:, 1:]
+    a0, a1 = 0.5, 1e-4
+    t = np.linspace(0, 2, 8001)
+    fu = np.zeros((n, t.shape[0]))
+    fu[-1] = 100*np.sin(7*t)
+    u0 = np.linspace(0, 0.01, n)
+
+    # reference using exact modal integration
+    eigvals, P = eigh(Kuu, Muu)
+    omegan = np.sqrt(eigvals)
+    zeta = (a0/omegan + a1*omegan)/2
+    r, _ = modal_recurrence(P.T @ fu, t, omegan, zeta, r0=P.T @ Muu @ u0)
+    uref = P @ r
+
+    for alpha in [0., -0.05]:
+        u, v, a = newmark(Kuu, Muu, fu, t, rayleigh=(a0, a1), u0=u0,
+                alpha=alpha)
+        assert u.shape == (n, t.shape[0])
+        assert np.allclose(u, uref, atol=2e-3*abs(uref).max())
+
+    # callable load, subset of DOFs and streamed output
+    out = {}
+    def output(i, ti, ui, vi, ai):
+        out[i] = ui.copy()
+    def ffunc(ti):
+        f = np.zeros(n)
+        f[-1] = 100*np.sin(7*ti)
+        return f
+    res = newmark(Kuu, Muu, ffunc, t, rayleigh=(a0, a1), u0=u0,
+            save_dofs=[n-1], save_every=10, output=output)
+    assert res is None
+    assert sorted(out.keys()) == list(range(0, t.shape[0], 10))
+    assert np.allclose(out[4000], u[[n-1], 4000])
+
+
+def test_newmark_prescribed_acceleration():
+    n = 5
+    K, M = spring_mass_chain(n)
+    Kuu = K[1:, 1:]
+    Muu = M[1:, 1:]
+    Kuk = K[1:, :1]
+    Muk = M[1:, :1]
+    t = np.linspace(0, 1, 501)
+    ak = np.atleast_2d(np.sin(20*t))
+    uk = np.atleast_2d(-np.sin(20*t)/400)
+    u, v, a = newmark(Kuu, Muu, None, t, Kuk=Kuk, Muk=Muk, uk=uk, ak=ak)
+    fu = -Muk @ ak - Kuk @ uk
+    uref, _, _ = newmark(Kuu, Muu, fu, t)
+    assert np.allclose(u, uref)
+
+
+if __name__ == '__main__':
+    test_newmark_rayleigh()
+    test_newmark_prescribed_acceleration()
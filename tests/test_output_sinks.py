@@ -0,0 +1,65 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+
+from tudaesasII.output import NpySink, HDF5Sink, expand_modal
+from tudaesasII.time_integration import newmark
+
+
+def chain():
+    n = 6
+    K = np.zeros((n+1, n+1))
+    for i in range(n):
+        K[i:i+2, i:i+2] += 1000*np.array([[1, -1], [-1, 1]])
+    return K[1:, 1:], np.eye(n)
+
+
+def test_npy_sink_newmark(tmp_path):
+    Kuu, Muu = chain()
+    n = Kuu.shape[0]
+    t = np.linspace(0, 1, 1001)
+    def fu(ti):
+        f = np.zeros(n)
+        f[-1] = np.sin(10*ti)
+        return f
+    u, v, a = newmark(Kuu, Muu, fu, t, save_dofs=[2, 5], save_every=3)
+
+    nsteps = len(range(0, t.shape[0], 3))
+    prefix = str(tmp_path / 'chain')
+    with NpySink(prefix, 2, nsteps, fields='ua', chunksize=64) as sink:
+        newmark(Kuu, Muu, fu, t, save_dofs=[2, 5], save_every=3, output=sink)
+    assert np.allclose(np.load(prefix + '_u.npy', mmap_mode='r'), u.T)
+    assert np.allclose(np.load(prefix + '_a.npy', mmap_mode='r'), a.T)
+    assert np.allclose(np.load(prefix + '_t.npy'), t[::3])
+
+
+def test_expand_modal(tmp_path):
+    rng = np.random.default_rng(0)
+    modes = rng.random((4, 3))
+    t = np.linspace(0, 1, 250)
+    r = rng.random((3, 250))
+    prefix = str(tmp_path / 'modal')
+    sink = NpySink(prefix, 4, 250, chunksize=100)
+    expand_modal(modes, r, t, sink, chunksize=60)
+    sink.close()
+    assert np.allclose(np.load(prefix + '_u.npy'), (modes @ r).T)
+
+    # velocities requested but not available
+    sink = NpySink(prefix, 4, 250, fields='uv', chunksize=100)
+    with pytest.raises(ValueError, match='"v"'):
+        expand_modal(modes, r, t, sink, chunksize=60)
+    assert sink.count == 0
+
+
+def test_hdf5_sink(tmp_path):
+    h5py = pytest.importorskip('h5py')
+    filename = str(tmp_path / 'out.h5')
+    with HDF5Sink(filename, 3, 10, fields='uv', chunksize=4) as sink:
+        for i in range(10):
+            sink(i, 0.1*i, np.full(3, i), np.full(3, -i))
+    with h5py.File(filename, 'r') as h5:
+        assert np.allclose(h5['u'][:, 0], np.arange(10))
+        assert np.allclose(h5['v'][:, 2], -np.arange(10))
+        assert np.allclose(h5['t'][:], 0.1*np.arange(10))
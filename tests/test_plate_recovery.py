@@ -0,0 +1,128 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+from scipy.spatial import Delaunay
+from composites.laminate import read_isotropic
+
+from tudaesasII import quad4r, tria3r
+
+
+def linear_fields(ncoords, nvec=3):
+    """Linear displacement fields, represented exactly by both elements"""
+    rng = np.random.RandomState(3)
+    coef = rng.rand(5, 3, nvec) - 0.5
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+    # u[node, dof, vec] = c0 + c1*x + c2*y
+    u = (coef[None, :, 0] + coef[None, :, 1]*x[:, None, None]
+         + coef[None, :, 2]*y[:, None, None])
+    return coef, u.reshape(-1, nvec)
+
+
+def expected_strains(coef, xc, yc):
+    cx = coef[:, 1]
+    cy = coef[:, 2]
+    phix = coef[3, 0] + cx[3]*xc[:, None] + cy[3]*yc[:, None]
+    phiy = coef[4, 0] + cx[4]*xc[:, None] + cy[4]*yc[:, None]
+    one = np.ones_like(xc)[:, None]
+    return np.stack([
+        one*cx[0],
+        one*cy[1],
+        one*(cy[0] + cx[1]),
+        one*cx[3],
+        one*cy[4],
+        one*(cy[3] + cx[4]),
+        cy[2] + phiy,
+        cx[2] + phix,
+        ], axis=1)
+
+
+def check_recovery(module, elems, nodes, nid_pos, ncoords):
+    N = module.DOF*ncoords.shape[0]
+    with pytest.raises(ValueError):
+        module.strains(elems, nid_pos, np.zeros(N))
+    K = np.zeros((N, N))
+    for elem in elems:
+        module.update_K(elem, nid_pos, ncoords, K)
+    coef, u = linear_fields(ncoords)
+    eps = module.strains(elems, nid_pos, u)
+    assert eps.shape == (len(elems), 8, u.shape[1])
+    xyc = np.array([ncoords[[nid_pos[n] for n in nids]].mean(axis=0) for nids
+        in nodes])
+    assert np.allclose(eps, expected_strains(coef, xyc[:, 0], xyc[:, 1]))
+    # single displacement vector
+    assert np.allclose(module.strains(elems, nid_pos, u[:, 1]), eps[:, :, 1])
+
+    res = module.stress_resultants(elems, eps)
+    assert res.shape == eps.shape
+    for elem, epsi, resi in zip(elems, eps, res):
+        ABDE = elem.ABDE
+        assert np.allclose(resi[:6], ABDE[:6, :6] @ epsi[:6])
+        sf = getattr(elem, 'shear_factor', None) or 1.
+        assert np.allclose(resi[6], ABDE[6, 6]*elem.scf23*sf*epsi[6])
+        assert np.allclose(resi[7], ABDE[7, 7]*elem.scf13*sf*epsi[7])
+
+
+def mesh(nx, ny):
+    xmesh, ymesh = np.meshgrid(np.linspace(0, 0.3, nx), np.linspace(0, 0.5, ny))
+    # distorted interior nodes
+    rng = np.random.RandomState(0)
+    xmesh[1:-1, 1:-1] += 0.02*(rng.rand(ny-2, nx-2) - 0.5)
+    ymesh[1:-1, 1:-1] += 0.02*(rng.rand(ny-2, nx-2) - 0.5)
+    return np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+
+
+def test_recovery_quad4r():
+    nx, ny = 4, 5
+    h = 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    ncoords = mesh(nx, ny)
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    quads = []
+    nodes = []
+    for n1, n2, n3, n4 in zip(nids_mesh[:-1, :-1].flatten(),
+            nids_mesh[1:, :-1].flatten(), nids_mesh[1:, 1:].flatten(),
+            nids_mesh[:-1, 1:].flatten()):
+        quad = quad4r.Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.h = h
+        quad.rho = 7.83e3
+        quad.ABDE = plate.ABDE.copy()
+        quads.append(quad)
+        nodes.append([n1, n2, n3, n4])
+    check_recovery(quad4r, quads, nodes, nid_pos, ncoords)
+
+
+def test_recovery_tria3r():
+    nx, ny = 4, 5
+    h = 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    ncoords = mesh(nx, ny)
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    d = Delaunay(ncoords)
+    trias = []
+    nodes = []
+    for s in d.simplices:
+        r1, r2, r3 = ncoords[s]
+        if (r2[0] - r1[0])*(r3[1] - r1[1]) - (r2[1] - r1[1])*(r3[0] - r1[0]) < 0:
+            s = s[::-1]
+        tria = tria3r.Tria3R()
+        tria.n1, tria.n2, tria.n3 = s
+        tria.h = h
+        tria.rho = 7.83e3
+        tria.ABDE = plate.ABDE.copy()
+        trias.append(tria)
+        nodes.append(list(s))
+    check_recovery(tria3r, trias, nodes, nid_pos, ncoords)
+
+
+if __name__ == '__main__':
+    test_recovery_quad4r()
+    test_recovery_tria3r()
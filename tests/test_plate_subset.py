@@ -0,0 +1,94 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+from scipy.spatial import Delaunay
+from composites.laminate import read_isotropic
+
+from tudaesasII import quad4r, tria3r
+
+
+def check_subsets(module, elems, nid_pos, ncoords):
+    DOF = module.DOF
+    N = DOF*ncoords.shape[0]
+    K = np.zeros((N, N))
+    M = np.zeros((N, N))
+    for elem in elems:
+        module.update_K(elem, nid_pos, ncoords, K)
+        module.update_M(elem, nid_pos, ncoords, M)
+    for subset, dofs in module.SUBSET_DOFS.items():
+        ndof = len(dofs)
+        Ks = np.zeros((ndof*ncoords.shape[0], ndof*ncoords.shape[0]))
+        Ms = np.zeros_like(Ks)
+        for elem in elems:
+            module.update_K(elem, nid_pos, ncoords, Ks, subset=subset)
+            module.update_M(elem, nid_pos, ncoords, Ms, subset=subset)
+        sel = (DOF*np.arange(ncoords.shape[0])[:, None] + dofs).ravel()
+        assert np.allclose(Ks, K[np.ix_(sel, sel)])
+        assert np.allclose(Ms, M[np.ix_(sel, sel)])
+    # membrane and bending blocks are uncoupled
+    mem = (DOF*np.arange(ncoords.shape[0])[:, None] + [0, 1]).ravel()
+    ben = (DOF*np.arange(ncoords.shape[0])[:, None] + [2, 3, 4]).ravel()
+    assert np.allclose(K[np.ix_(mem, ben)], 0)
+
+    # coupled laminates cannot be split
+    ABDE = elems[0].ABDE.copy()
+    elems[0].ABDE[0:3, 3:6] = elems[0].ABDE[3:6, 0:3] = 0.01*ABDE[0, 0]*elems[0].h
+    assert not module.membrane_bending_uncoupled(elems[0].ABDE)
+    with pytest.raises(ValueError):
+        module.update_K(elems[0], nid_pos, ncoords, Ks, subset='bending')
+    elems[0].ABDE = ABDE
+
+
+def test_subset_quad4r():
+    nx, ny = 4, 5
+    h = 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    assert quad4r.membrane_bending_uncoupled(plate.ABDE)
+    xmesh, ymesh = np.meshgrid(np.linspace(0, 0.3, nx), np.linspace(0, 0.5, ny))
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    quads = []
+    for n1, n2, n3, n4 in zip(nids_mesh[:-1, :-1].flatten(),
+            nids_mesh[1:, :-1].flatten(), nids_mesh[1:, 1:].flatten(),
+            nids_mesh[:-1, 1:].flatten()):
+        quad = quad4r.Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.h = h
+        quad.rho = 7.83e3
+        quad.ABDE = plate.ABDE.copy()
+        quads.append(quad)
+    check_subsets(quad4r, quads, nid_pos, ncoords)
+
+
+def test_subset_tria3r():
+    nx, ny = 4, 5
+    h = 0.01
+    plate = read_isotropic(thickness=h, E=200e9, nu=0.3, calc_scf=True)
+    xmesh, ymesh = np.meshgrid(np.linspace(0, 0.3, nx), np.linspace(0, 0.5, ny))
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    d = Delaunay(ncoords)
+    trias = []
+    for s in d.simplices:
+        r1, r2, r3 = ncoords[s]
+        if (r2[0] - r1[0])*(r3[1] - r1[1]) - (r2[1] - r1[1])*(r3[0] - r1[0]) < 0:
+            s = s[::-1]
+        tria = tria3r.Tria3R()
+        tria.n1, tria.n2, tria.n3 = s
+        tria.h = h
+        tria.rho = 7.83e3
+        tria.ABDE = plate.ABDE.copy()
+        trias.append(tria)
+    check_subsets(tria3r, trias, nid_pos, ncoords)
+
+
+if __name__ == '__main__':
+    test_subset_quad4r()
+    test_subset_tria3r()
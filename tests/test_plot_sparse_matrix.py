@@ -0,0 +1,38 @@
+import sys
+sys.path.append('..')
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from scipy.sparse import random as sprandom
+
+from tudaesasII.utils import plot_sparse_matrix, sparse_matrix_density
+
+
+def test_sparse_matrix_density():
+    m = sprandom(1000, 700, density=0.01, format='csr', random_state=1)
+    density = sparse_matrix_density(m, resolution=64)
+    assert density.shape == (64, 64)
+    assert density.sum() == m.nnz
+    # reference binning from COO indices
+    coo = m.tocoo()
+    ref = np.zeros((64, 64), dtype=int)
+    np.add.at(ref, (coo.row*64//1000, coo.col*64//700), 1)
+    assert np.array_equal(density, ref)
+    # matrices smaller than the resolution are not upsampled
+    assert sparse_matrix_density(np.eye(10), resolution=64).shape == (10, 10)
+    assert np.array_equal(sparse_matrix_density(np.eye(10)), np.eye(10))
+
+
+def test_plot_sparse_matrix():
+    m = sprandom(200, 200, density=0.05, format='csr', random_state=2)
+    ax = plot_sparse_matrix(m)
+    assert len(ax.lines) == 1
+    ax = plot_sparse_matrix(m, resolution=50)
+    assert len(ax.images) == 1
+    assert len(ax.lines) == 0
+
+
+if __name__ == '__main__':
+    test_sparse_matrix_density()
+    test_plot_sparse_matrix()
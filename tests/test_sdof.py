@@ -0,0 +1,127 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+
+from tudaesasII import sdof
+from tudaesasII.modal import modal_recurrence
+
+
+def residual(t, u, m, k, zeta, f=0.):
+    """Finite-difference residual of the equation of motion"""
+    dt = t[1] - t[0]
+    c = 2*zeta*np.sqrt(k*m)
+    ud = (u[..., 2:] - u[..., :-2])/(2*dt)
+    udd = (u[..., 2:] - 2*u[..., 1:-1] + u[..., :-2])/dt**2
+    f = np.broadcast_to(f, u.shape)[..., 1:-1]
+    return m*udd + c*ud + k*u[..., 1:-1] - f
+
+
+def test_free():
+    t = np.linspace(0, 3, 30001)
+    m = 2.
+    k = 150.
+    zeta = np.array([0., 0.05, 0.5, 1., 2.])
+    u = sdof.free(t, m, k, zeta, u0=0.4, v0=2.)
+    assert u.shape == (5, t.shape[0])
+    assert np.allclose(u[:, 0], 0.4)
+    assert np.allclose((u[:, 1] - u[:, 0])/(t[1] - t[0]), 2., rtol=1e-2)
+    scale = np.abs(u).max()*k
+    assert np.abs(residual(t, u, m, k, zeta[:, None])).max() < 1e-3*scale
+    # critically damped closed form
+    wn = np.sqrt(k/m)
+    ref = (0.4 + (2. + wn*0.4)*t)*np.exp(-wn*t)
+    assert np.allclose(u[3], ref)
+    # broadcasting of the parameters
+    u = sdof.free(t, m, np.array([100., 150., 200.]), zeta[:2, None], u0=1.)
+    assert u.shape == (2, 3, t.shape[0])
+    assert sdof.free(t, m, k).shape == (1, t.shape[0])
+    # long overdamped record
+    t = np.linspace(0, 100, 5)
+    u = sdof.free(t, 1., 100., zeta=np.array([0.5, 2.]), u0=1., v0=1.)
+    assert np.all(np.isfinite(u))
+    s1 = -10/(2 + np.sqrt(3))
+    s2 = -10*(2 + np.sqrt(3))
+    ref = ((1 - s2)*np.exp(s1*t) + (s1 - 1)*np.exp(s2*t))/(s1 - s2)
+    assert np.allclose(u[1], ref)
+
+
+def test_harmonic():
+    t = np.linspace(0, 10, 100001)
+    m = 1.
+    k = 25.
+    zeta = 0.2
+    ratio = np.linspace(0.1, 2, 7)
+    omegaf = ratio*5.
+    u = sdof.harmonic(t, m, k, zeta, 10., omegaf, u0=1., v0=0.)
+    assert u.shape == (7, t.shape[0])
+    assert np.allclose(u[:, 0], 1.)
+    assert np.allclose((u[:, 1] - u[:, 0])/(t[1] - t[0]), 0., atol=1e-2)
+    f = 10.*np.cos(omegaf[:, None]*t)
+    assert np.abs(residual(t, u, m, k, zeta, f)).max() < 1e-4*10
+    # sine force and exact integration of the sampled force
+    u = sdof.harmonic(t, m, k, zeta, 10., omegaf, phase=np.pi/2)
+    ref = sdof.general(t, 10.*np.sin(omegaf[:, None]*t), m, k, zeta)
+    assert np.allclose(u, ref, atol=1e-6*np.abs(u).max())
+
+
+def test_impulse():
+    t = np.linspace(0, 5, 5001)
+    dt = t[1] - t[0]
+    m = 3.
+    k = 300.
+    zeta = np.array([0., 0.1])
+    u = sdof.impulse(t, m, k, zeta, P0=1., tn=1.5)
+    assert np.all(u[:, t < 1.5] == 0)
+    # narrow triangular pulse with unit area
+    f = np.zeros_like(t)
+    f[1500] = 1/dt
+    ref = sdof.general(t, f, m, k, zeta)
+    after = t > 1.5 + dt
+    assert np.allclose(u[:, after], ref[:, after], atol=1e-3*np.abs(u).max())
+
+
+def test_general():
+    t = np.linspace(0, 10, 2001)
+    rng = np.random.RandomState(0)
+    f = rng.rand(3, t.shape[0]) - 0.5
+    m = np.array([1., 2., 3.])
+    k = np.array([100., 400., 50.])
+    zeta = np.array([0.01, 0.05, 0.2])
+    u0 = np.array([0.1, 0., -0.2])
+    v0 = np.array([0., 1., 0.5])
+    u = sdof.general(t, f, m, k, zeta, u0, v0)
+    # same recurrence evaluated step by step
+    omegan = np.sqrt(k/m)
+    ref, _ = modal_recurrence(f/m[:, None], t, omegan, zeta, u0, v0)
+    assert np.allclose(u, ref, atol=1e-10*np.abs(ref).max())
+    # force shared by all systems
+    u = sdof.general(t, f[0], m, k, zeta)
+    ref, _ = modal_recurrence(f[0]/m[:, None], t, omegan, zeta)
+    assert np.allclose(u, ref, atol=1e-10*np.abs(ref).max())
+    # repeated systems sharing the force
+    u = sdof.general(t, f[0], np.tile(m, 2), np.tile(k, 2), np.tile(zeta, 2))
+    assert np.allclose(u[3:], ref, atol=1e-10*np.abs(ref).max())
+    with pytest.raises(ValueError):
+        sdof.general(t, f[:, :-1], m, k, zeta)
+
+
+def test_response_spectrum():
+    t = np.linspace(0, 20, 4001)
+    rng = np.random.RandomState(1)
+    ag = np.convolve(rng.randn(t.shape[0]), np.ones(20)/20, mode='same')
+    omegan = 2*np.pi/np.linspace(0.1, 3, 30)
+    Sd, Sv, Sa = sdof.response_spectrum(t, ag, omegan, zeta=0.05)
+    ref, _ = modal_recurrence(-ag, t, omegan, 0.05)
+    assert np.allclose(Sd, np.abs(ref).max(axis=1))
+    assert np.allclose(Sa, omegan**2*Sd)
+    assert np.allclose(Sv, omegan*Sd)
+
+
+if __name__ == '__main__':
+    test_free()
+    test_harmonic()
+    test_impulse()
+    test_general()
+    test_response_spectrum()
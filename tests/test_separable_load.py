@@ -0,0 +1,39 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+
+from tudaesasII.modal import SeparableLoad
+
+
+def test_separable_load():
+    rng = np.random.default_rng(0)
+    n = 12
+    t = np.linspace(0, 3, 301)
+    f1 = rng.random(n)
+    f2 = rng.random(n)
+    load = SeparableLoad()
+    load.add(f1)
+    load.add(f2, lambda t: np.sin(2*t)**2)
+    f = f1[:, None] + f2[:, None]*np.sin(2*t)**2
+    assert np.allclose(load(t), f)
+    assert np.allclose(load(t[5]), f[:, 5])
+    # shapes stacked once and restacked only when a component is added
+    S = load.shape_matrix()
+    assert S.shape == (n, 2)
+    load(t[7])
+    assert load.shape_matrix() is S
+    load.add(np.zeros(n))
+    assert load.shape_matrix().shape == (n, 3)
+    assert np.allclose(load(t), f)
+
+    P = rng.random((n, 4))
+    bu = np.ones(n, dtype=bool)
+    bu[:2] = False
+    fmodal = P[bu].T @ f[bu]
+    assert np.allclose(load.project(lambda S: P[bu].T @ S[bu])(t), fmodal)
+    assert np.allclose(load.project(P.T)(t), P.T @ f)
+
+
+if __name__ == '__main__':
+    test_separable_load()
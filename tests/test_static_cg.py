@@ -0,0 +1,95 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import spsolve
+from composites.laminate import read_isotropic
+
+from tudaesasII.quad4r import Quad4R, update_K, DOF
+from tudaesasII.static import solve_static_cg
+from tudaesasII.matrixfree import ElementOperator
+
+
+def test_static_cg_point_load():
+    nx = 9
+    ny = 9
+
+    # geometry
+    a = 3
+    b = 7
+    h = 0.005 # m
+
+    # material
+    E = 200e9
+    nu = 0.3
+
+    plate = read_isotropic(thickness=h, E=E, nu=nu, calc_scf=True)
+
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    n1s = nids_mesh[:-1, :-1].flatten()
+    n2s = nids_mesh[1:, :-1].flatten()
+    n3s = nids_mesh[1:, 1:].flatten()
+    n4s = nids_mesh[:-1, 1:].flatten()
+
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    quads = []
+    for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
+        quad = Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.scf13 = plate.scf_k13
+        quad.scf23 = plate.scf_k23
+        quad.h = h
+        quad.ABDE = plate.ABDE
+        update_K(quad, nid_pos, ncoords, K)
+        quads.append(quad)
+
+    # simply supported
+    bk = np.zeros(K.shape[0], dtype=bool)
+    check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+    bk[2::DOF] = check
+    bk[0::DOF] = True
+    bk[1::DOF] = True
+    bu = ~bk
+
+    f = np.zeros(K.shape[0])
+    check = np.isclose(x, a/2) & np.isclose(y, b/2)
+    f[2::DOF][check] = 1.
+
+    Kuu = csr_matrix(K[bu, :][:, bu])
+    fu = f[bu]
+    uu_ref = spsolve(Kuu.tocsc(), fu)
+
+    groups = (np.arange(K.shape[0])//DOF)[bu]
+    for precond, kwargs in [('jacobi', {}),
+                            ('block_jacobi', dict(groups=groups)),
+                            ('ichol', {})]:
+        uu, history = solve_static_cg(Kuu, fu, precond=precond, rtol=1e-10,
+                **kwargs)
+        assert history[0] == 1.
+        assert history[-1] <= 1e-10
+        assert np.allclose(uu, uu_ref, rtol=1e-6)
+
+    # matrix-free path, element-by-element products and the diagonal of
+    # Kuu for the Jacobi preconditioner, without assembling Kuu
+    Kop = ElementOperator(quads, nid_pos, ncoords, K.shape[0], bu=bu)
+    assert np.allclose(Kop.diagonal(), Kuu.diagonal())
+    uu, history = solve_static_cg(Kop, fu, precond='jacobi', rtol=1e-10)
+    assert history[-1] <= 1e-10
+    assert np.allclose(uu, uu_ref, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    test_static_cg_point_load()
@@ -0,0 +1,90 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.linalg import solve
+from scipy.sparse import csr_matrix
+from composites.laminate import read_isotropic
+
+from tudaesasII.quad4r import Quad4R, update_K, DOF
+from tudaesasII.static import factorize, solve_static, clear_cache
+
+
+def test_static_many_load_cases():
+    nx = 7
+    ny = 7
+
+    # geometry
+    a = 3
+    b = 7
+    h = 0.005 # m
+
+    # material
+    E = 200e9
+    nu = 0.3
+
+    plate = read_isotropic(thickness=h, E=E, nu=nu, calc_scf=True)
+
+    xtmp = np.linspace(0, a, nx)
+    ytmp = np.linspace(0, b, ny)
+    xmesh, ymesh = np.meshgrid(xtmp, ytmp)
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+
+    nids = 1 + np.arange(ncoords.shape[0])
+    nid_pos = dict(zip(nids, np.arange(len(nids))))
+    nids_mesh = nids.reshape(nx, ny)
+    n1s = nids_mesh[:-1, :-1].flatten()
+    n2s = nids_mesh[1:, :-1].flatten()
+    n3s = nids_mesh[1:, 1:].flatten()
+    n4s = nids_mesh[:-1, 1:].flatten()
+
+    K = np.zeros((DOF*nx*ny, DOF*nx*ny))
+    for n1, n2, n3, n4 in zip(n1s, n2s, n3s, n4s):
+        quad = Quad4R()
+        quad.n1 = n1
+        quad.n2 = n2
+        quad.n3 = n3
+        quad.n4 = n4
+        quad.scf13 = plate.scf_k13
+        quad.scf23 = plate.scf_k23
+        quad.h = h
+        quad.ABDE = plate.ABDE
+        update_K(quad, nid_pos, ncoords, K)
+
+    # simply supported
+    bk = np.zeros(K.shape[0], dtype=bool)
+    check = np.isclose(x, 0.) | np.isclose(x, a) | np.isclose(y, 0) | np.isclose(y, b)
+    bk[2::DOF] = check
+    bk[0::DOF] = True
+    bk[1::DOF] = True
+    bu = ~bk
+
+    Kuu = csr_matrix(K[bu, :][:, bu])
+
+    # one load case per internal node, unit point load
+    internal = np.where(~check)[0]
+    f = np.zeros((K.shape[0], internal.shape[0]))
+    f[DOF*internal + 2, np.arange(internal.shape[0])] = 1.
+    fu = f[bu]
+
+    uu = solve_static(Kuu, fu)
+    assert uu.shape == fu.shape
+    uu_ref = solve(Kuu.toarray(), fu)
+    assert np.allclose(uu, uu_ref, rtol=1e-8, atol=1e-14)
+
+    # load case at the plate center
+    u = np.zeros(K.shape[0])
+    u[bu] = solve_static(Kuu, fu[:, internal.shape[0]//2])
+    wmax_ref = 6.594931610258557e-05
+    assert np.isclose(wmax_ref, u[2::DOF].max(), rtol=0.02)
+
+    # the factorization is reused for the same model
+    assert factorize(Kuu) is factorize(Kuu)
+    assert factorize(Kuu, key='plate') is factorize(Kuu, key='plate')
+    clear_cache('plate')
+
+
+if __name__ == '__main__':
+    test_static_many_load_cases()
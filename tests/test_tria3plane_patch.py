@@ -0,0 +1,66 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+from scipy.spatial import Delaunay
+
+from tudaesasII import tria3planestress, tria3planestrain
+
+
+def check_pure_shear(module, cls):
+    a = 2.
+    b = 1.
+    E = 70e9
+    nu = 0.33
+    h = 0.01
+    gamma = 1e-3
+    xmesh, ymesh = np.meshgrid(np.linspace(0, a, 7), np.linspace(0, b, 5))
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    N = module.DOF*ncoords.shape[0]
+    K = np.zeros((N, N))
+    M = np.zeros((N, N))
+    # both node orderings are present in the Delaunay simplices
+    for s in Delaunay(ncoords).simplices:
+        tria = cls()
+        tria.n1, tria.n2, tria.n3 = s
+        tria.E = E
+        tria.nu = nu
+        tria.h = h
+        tria.rho = 2.7e3
+        module.update_K_M(tria, nid_pos, ncoords, K, M)
+
+    # simple shear u = gamma*y prescribed at the boundary
+    bk = np.zeros(N, dtype=bool)
+    check = (np.isclose(x, 0) | np.isclose(x, a) | np.isclose(y, 0)
+             | np.isclose(y, b))
+    bk[0::2] = check
+    bk[1::2] = check
+    bu = ~bk
+    u = np.zeros(N)
+    u[0::2] = gamma*y
+    uk = u[bk]
+    u[bu] = np.linalg.solve(K[bu, :][:, bu], -K[bu, :][:, bk] @ uk)
+    assert np.allclose(u[0::2], gamma*y)
+    assert np.allclose(u[1::2], 0)
+
+    # the shear force transmitted through the top edge is tau*a*h
+    f = K @ u
+    top = np.isclose(y, b)
+    G = E/(2*(1 + nu))
+    assert np.isclose(f[0::2][top].sum(), G*gamma*a*h)
+
+
+def test_tria3planestress_pure_shear():
+    check_pure_shear(tria3planestress, tria3planestress.Tria3PlaneStressIso)
+
+
+def test_tria3planestrain_pure_shear():
+    check_pure_shear(tria3planestrain, tria3planestrain.Tria3PlaneStrainIso)
+
+
+if __name__ == '__main__':
+    test_tria3planestress_pure_shear()
+    test_tria3planestrain_pure_shear()
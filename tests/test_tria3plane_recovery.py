@@ -0,0 +1,88 @@
+import sys
+sys.path.append('..')
+
+import numpy as np
+import pytest
+from scipy.spatial import Delaunay
+
+from tudaesasII import tria3planestress, tria3planestrain
+
+
+def check_recovery(module, cls):
+    xmesh, ymesh = np.meshgrid(np.linspace(0, 2, 5), np.linspace(0, 1, 4))
+    ncoords = np.vstack((xmesh.T.flatten(), ymesh.T.flatten())).T
+    nid_pos = dict(zip(np.arange(len(ncoords)), np.arange(len(ncoords))))
+    N = module.DOF*ncoords.shape[0]
+    trias = []
+    # both node orderings are present in the Delaunay simplices
+    for s in Delaunay(ncoords).simplices:
+        tria = cls()
+        tria.n1, tria.n2, tria.n3 = s
+        tria.E = 70e9
+        tria.nu = 0.33
+        tria.h = 0.01
+        tria.rho = 2.7e3
+        trias.append(tria)
+    with pytest.raises(ValueError):
+        module.strains(trias, nid_pos, np.zeros(N))
+    K = np.zeros((N, N))
+    M = np.zeros((N, N))
+    for tria in trias:
+        module.update_K_M(tria, nid_pos, ncoords, K, M)
+
+    # patch test with linear displacement fields
+    x = ncoords[:, 0]
+    y = ncoords[:, 1]
+    u = np.zeros((N, 2))
+    u[0::2, 0] = 1e-3*x + 2e-3*y
+    u[1::2, 0] = -5e-4*x + 3e-4*y
+    u[0::2, 1] = -1e-3*x
+    u[1::2, 1] = 4e-4*y
+    B = module.B_operator(trias, nid_pos, N)
+    eps = module.strains(trias, nid_pos, u, B=B)
+    assert eps.shape == (len(trias), 3, 2)
+    assert np.allclose(eps[:, :, 0], [1e-3, 3e-4, 1.5e-3])
+    assert np.allclose(eps[:, :, 1], [-1e-3, 4e-4, 0])
+    assert np.allclose(module.strains(trias, nid_pos, u[:, 1]), eps[:, :, 1])
+
+    # strain energy consistent with K for arbitrary displacements
+    rng = np.random.RandomState(0)
+    u = rng.rand(N, 4) - 0.5
+    eps = module.strains(trias, nid_pos, u, B=B)
+    sigma = module.stresses(trias, eps)
+    Ah = np.array([tria.A*tria.h for tria in trias])
+    energy = np.einsum('e,eit,eit->t', Ah, eps, sigma)
+    assert np.allclose(energy, np.einsum('it,ij,jt->t', u, K, u))
+
+    svm = module.von_mises(trias, sigma)
+    assert svm.shape == (len(trias), 4)
+    return sigma, svm
+
+
+def test_recovery_plane_stress():
+    sigma, svm = check_recovery(tria3planestress,
+            tria3planestress.Tria3PlaneStressIso)
+    s = sigma
+    ref = np.sqrt(s[:, 0]**2 - s[:, 0]*s[:, 1] + s[:, 1]**2 + 3*s[:, 2]**2)
+    assert np.allclose(svm, ref)
+
+
+def test_recovery_plane_strain():
+    sigma, svm = check_recovery(tria3planestrain,
+            tria3planestrain.Tria3PlaneStrainIso)
+    # von Mises from the deviatoric part of the 3D stress tensor
+    sxx, syy, txy = sigma[:, 0], sigma[:, 1], sigma[:, 2]
+    szz = 0.33*(sxx + syy)
+    S = np.zeros(sxx.shape + (3, 3))
+    S[..., 0, 0] = sxx
+    S[..., 1, 1] = syy
+    S[..., 2, 2] = szz
+    S[..., 0, 1] = S[..., 1, 0] = txy
+    dev = S - np.trace(S, axis1=-2, axis2=-1)[..., None, None]/3*np.eye(3)
+    ref = np.sqrt(1.5*np.einsum('...ij,...ij->...', dev, dev))
+    assert np.allclose(svm, ref)
+
+
+if __name__ == '__main__':
+    test_recovery_plane_stress()
+    test_recovery_plane_strain()
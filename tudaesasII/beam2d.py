@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 
 DOF = 3
@@ -256,6 +258,154 @@ def update_M(beam, nid_pos, M, lumped=False):
     else:
         raise NotImplementedError('beam interpolation "%s" not implemented' % beam.interpolation)
 
+@lru_cache(maxsize=32)
+def _shape_functions(n):
+    """Shape functions at `n` points, cached per `n`
+
+    The returned matrices multiply the element DOFs in local coordinates
+    ``[u1e, v1e, le*beta1, u2e, v2e, le*beta2]``, such that they do not
+    depend on the element
+
+    Returns
+    -------
+    N : (2, n, 6) array-like
+        Interpolation of ``ue`` and ``ve``
+    Nx : (n, 6) array-like
+        Derivative of ``ue`` with respect to ``xi``
+    Nxx : (n, 6) array-like
+        Second derivative of ``ve`` with respect to ``xi``
+
+    """
+    xi = np.linspace(-1, +1, n)
+    zero = np.zeros_like(xi)
+    one = np.ones_like(xi)
+    N = np.zeros((2, n, 6))
+    N[0] = np.array([(1-xi)/2, zero, zero, (1+xi)/2, zero, zero]).T
+    N[1] = np.array([zero, 1/2 - 3*xi/4 + 1*xi**3/4,
+                     1/8 - 1*xi/8 - 1*xi**2/8 + 1*xi**3/8,
+                     zero, 1/2 + 3*xi/4 - 1*xi**3/4,
+                     -1/8 - 1*xi/8 + 1*xi**2/8 + 1*xi**3/8]).T
+    Nx = np.array([-one/2, zero, zero, +one/2, zero, zero]).T
+    Nxx = np.array([zero, 6*xi/4, -2/8 + 6*xi/8, zero, -6*xi/4, +2/8 + 6*xi/8]).T
+    for A in (N, Nx, Nxx):
+        A.setflags(write=False)
+    return N, Nx, Nxx
+
+
+def _local_dofs(le, thetarad, ue):
+    """Element DOFs in local coordinates with rotations multiplied by `le`
+
+    `le` and `thetarad` have shape ``(nelem,)`` and `ue` has shape ``(nelem,
+    6, nt)``
+
+    """
+    cosr = np.cos(thetarad)[:, None]
+    sinr = np.sin(thetarad)[:, None]
+    le = le[:, None]
+    ql = np.empty_like(ue, dtype=float)
+    ql[:, 0] = cosr*ue[:, 0] + sinr*ue[:, 1]
+    ql[:, 1] = -sinr*ue[:, 0] + cosr*ue[:, 1]
+    ql[:, 2] = le*ue[:, 2]
+    ql[:, 3] = cosr*ue[:, 3] + sinr*ue[:, 4]
+    ql[:, 4] = -sinr*ue[:, 3] + cosr*ue[:, 4]
+    ql[:, 5] = le*ue[:, 5]
+    return ql
+
+
+def gather_displacements(beams, nid_pos, u):
+    """Gather the nodal displacements of each element
+
+    Parameters
+    ----------
+    beams : list
+        `.Beam2D` elements
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    u : (N,) or (N, nt) array-like
+        Displacements of the whole model, for one or many time steps
+
+    Returns
+    -------
+    ue : (nelem, 6, nt) array-like
+        Displacements ``[u1, v1, beta1, u2, v2, beta2]`` of each element
+
+    """
+    u = np.asarray(u)
+    if u.ndim == 1:
+        u = u[:, None]
+    pos = np.array([[nid_pos[beam.n1], nid_pos[beam.n2]] for beam in beams])
+    dofs = (DOF*pos[:, :, None] + np.arange(DOF)).reshape(len(beams), 2*DOF)
+    return u[dofs]
+
+
+def uv_elements(beams, ue, n=100):
+    """Calculate u and v for many Beam2D elements at once
+
+    Parameters
+    ----------
+    beams : list
+        `.Beam2D` elements, with `le` and `thetarad` already calculated by
+        :func:`update_K`
+    ue : (nelem, 6, nt) array-like
+        Nodal displacements and rotations of each element, see
+        :func:`gather_displacements`
+    n : int
+        Number of points where the displacements are calculated within each
+        element
+
+    Returns
+    -------
+    uv : (2, nelem, n, nt) array-like
+        Displacements `u` and `v` in global coordinates
+
+    """
+    le = np.array([beam.le for beam in beams], dtype=float)
+    thetarad = np.array([beam.thetarad for beam in beams], dtype=float)
+    N, _, _ = _shape_functions(n)
+    ql = _local_dofs(le, thetarad, np.asarray(ue))
+    uel, vel = np.einsum('kij,ejt->keit', N, ql)
+    cosr = np.cos(thetarad)[:, None, None]
+    sinr = np.sin(thetarad)[:, None, None]
+    return np.array([cosr*uel - sinr*vel, sinr*uel + cosr*vel])
+
+
+def exx_elements(y, beams, ue, n=3):
+    """Calculate axial strains for many Beam2D elements at once
+
+    Parameters
+    ----------
+    y : float
+        Distance from the neutral axis
+    beams : list
+        `.Beam2D` elements, with `le` and `thetarad` already calculated by
+        :func:`update_K`
+    ue : (nelem, 6, nt) array-like
+        Nodal displacements and rotations of each element, see
+        :func:`gather_displacements`
+    n : int
+        Number of points where the axial strain is calculated within each
+        element
+
+    Returns
+    -------
+    exx : (nelem, n, nt) array-like
+        The strains at all `n` points of each element
+
+    """
+    le = np.array([beam.le for beam in beams], dtype=float)
+    thetarad = np.array([beam.thetarad for beam in beams], dtype=float)
+    _, Nx, Nxx = _shape_functions(n)
+    ql = _local_dofs(le, thetarad, np.asarray(ue))
+    le = le[:, None, None]
+    return ((2/le)*np.einsum('ij,ejt->eit', Nx, ql)
+            - y*(2/le)**2*np.einsum('ij,ejt->eit', Nxx, ql))
+
+
+def _single_element(u1, v1, beta1, u2, v2, beta2):
+    inputs = np.broadcast_arrays(*map(np.atleast_1d, [u1, v1, beta1, u2, v2, beta2]))
+    return np.array(inputs, dtype=float)[None, :, :]
+
+
 def uv(beam, u1, v1, beta1, u2, v2, beta2, n=100):
     """Calculate u and v for a Beam2D
 
@@ -276,40 +426,9 @@ def uv(beam, u1, v1, beta1, u2, v2, beta2, n=100):
         dimension depends on the dimension of the nodal displacements and
         rotations
     """
-    inputs = [u1, v1, beta1, u2, v2, beta2]
-    inputs = list(map(np.atleast_1d, inputs))
-    maxshape = max([np.shape(i)[0] for i in inputs])
-    for i in range(len(inputs)):
-        if inputs[i].shape[0] == 1:
-            inputs[i] = np.ones(maxshape)*inputs[i][0]
-        else:
-            assert inputs[i].shape[0] == maxshape
-    u1, v1, beta1, u2, v2, beta2 = inputs
-    # transforming displacements to element's coordinates
-    cosr = np.cos(beam.thetarad)
-    sinr = np.sin(beam.thetarad)
-    u1e = cosr*u1 + sinr*v1
-    v1e = -sinr*u1 + cosr*v1
-    beta1e = beta1
-    u2e = cosr*u2 + sinr*v2
-    v2e = -sinr*u2 + cosr*v2
-    beta2e = beta2
-    # calculating u, v
-    le = beam.le
-    xi = np.linspace(-1, +1, n)
-    Nu1 = u1e[:, None]*(1-xi)/2
-    Nu2 = u2e[:, None]*(1+xi)/2
-    Nv1 = v1e[:, None]*(1/2 - 3*xi/4 + 1*xi**3/4)
-    Nv2 = beta1e[:, None]*(le*(1/8 - 1*xi/8 - 1*xi**2/8 + 1*xi**3/8))
-    Nv3 = v2e[:, None]*(1/2 + 3*xi/4 - 1*xi**3/4)
-    Nv4 = beta2e[:, None]*(le*(-1/8 - 1*xi/8 + 1*xi**2/8 + 1*xi**3/8))
-    ue = Nu1+Nu2
-    ve = Nv1+Nv2+Nv3+Nv4
-    # transforming displacements to global coordinates
-    u = cosr*ue - sinr*ve
-    v = sinr*ue + cosr*ve
-    # final shape will be (uv, n, maxshape)
-    return np.array([u, v])
+    ue = _single_element(u1, v1, beta1, u2, v2, beta2)
+    # final shape will be (uv, maxshape, n)
+    return uv_elements([beam], ue, n=n)[:, 0].transpose(0, 2, 1)
 
 def exx(y, beam, u1, v1, beta1, u2, v2, beta2, n=3):
     """Calculate axial stresses for a Beam2D
@@ -332,32 +451,5 @@ def exx(y, beam, u1, v1, beta1, u2, v2, beta2, n=3):
         The strains at all `n` points. The first array dimension depends on the
         dimension of the nodal displacements and rotations
     """
-    inputs = [u1, v1, beta1, u2, v2, beta2]
-    inputs = list(map(np.atleast_1d, inputs))
-    maxshape = max([np.shape(i)[0] for i in inputs])
-    for i in range(len(inputs)):
-        if inputs[i].shape[0] == 1:
-            inputs[i] = np.ones(maxshape)*inputs[i][0]
-        else:
-            assert inputs[i].shape[0] == maxshape
-    u1, v1, beta1, u2, v2, beta2 = inputs
-    # transforming displacements to element's coordinates
-    cosr = np.cos(beam.thetarad)
-    sinr = np.sin(beam.thetarad)
-    u1e = cosr*u1 + sinr*v1
-    v1e = -sinr*u1 + cosr*v1
-    beta1e = beta1
-    u2e = cosr*u2 + sinr*v2
-    v2e = -sinr*u2 + cosr*v2
-    beta2e = beta2
-    # calculating at n positions along the beam element
-    le = beam.le
-    xi = np.linspace(-1, +1, n)
-    Nu1x = u1e[:, None]*(-1)/2
-    Nu2x = u2e[:, None]*(+1)/2
-    Nv1xx = v1e[:, None]*(6*xi/4)
-    Nv2xx = beta1e[:, None]*(le*(-2/8 + 6*xi/8))
-    Nv3xx = v2e[:, None]*(-6*xi/4)
-    Nv4xx = beta2e[:, None]*(le*(+2/8 + 6*xi/8))
-    return (2/le)*(Nu1x + Nu2x) - y*(2/le)**2*(Nv1xx + Nv2xx + Nv3xx + Nv4xx)
-
+    ue = _single_element(u1, v1, beta1, u2, v2, beta2)
+    return exx_elements(y, [beam], ue, n=n)[0].T
@@ -0,0 +1,335 @@
+import numpy as np
+from scipy.linalg import cholesky, solve_triangular, eigh
+from scipy.sparse import csr_matrix, issparse
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse.linalg import LinearOperator, lobpcg
+
+from .precond import get_preconditioner
+
+
+def _residuals(K, M, X):
+    """Rayleigh quotients, residual norms and their scale ``lambda*||M x||``"""
+    KX = K @ X
+    MX = M @ X
+    eigvals = np.einsum('ij,ij->j', X, KX)/np.einsum('ij,ij->j', X, MX)
+    res = np.linalg.norm(KX - MX*eigvals, axis=0)
+    scale = eigvals*np.linalg.norm(MX, axis=0)
+    return eigvals, res, scale
+
+
+def lobpcg_modes(K, M, num_modes, X0=None, precond='ichol', tol=1e-6,
+        maxiter=100, **kwargs):
+    """Lowest natural frequencies and modes using LOBPCG
+
+    Intended for parameter sweeps, where the modes of the previous sweep step
+    are passed as the initial block `X0` and LOBPCG converges in a few
+    iterations.
+
+    Parameters
+    ----------
+    K : array-like or sparse matrix
+        Stiffness matrix, typically `Kuu`
+    M : array-like or sparse matrix
+        Mass matrix, typically `Muu`
+    num_modes : int
+        Number of modes to be computed
+    X0 : array-like or None, optional
+        Initial block of shape ``(K.shape[0], num_modes)``, e.g. the modes of
+        the previous sweep step. Missing columns are filled with random
+        vectors
+    precond : str, `LinearOperator` or None, optional
+        Preconditioner approximating `K^{-1}`, see
+        :func:`.precond.get_preconditioner`. LOBPCG assumes a symmetric
+        positive definite preconditioner, such as ``'ichol'``,
+        ``'block_jacobi'`` or ``'jacobi'``. ``'ilu'`` is not symmetric,
+        it often needs fewer iterations but convergence is not guaranteed
+    tol : float, optional
+        Relative residual tolerance, the iterations stop when ``||K x -
+        lambda M x|| <= tol*lambda*||M x||`` for all modes. The absolute
+        tolerance of `scipy.sparse.linalg.lobpcg` is obtained from the
+        Rayleigh quotients of the current block, when they are poor
+        estimates, e.g. for a random initial block, LOBPCG is restarted
+        with the improved estimates. An initial block already satisfying
+        the tolerance is returned without iterations
+    maxiter : int, optional
+        Maximum total number of iterations
+    kwargs : dict
+        Extra arguments passed to the preconditioner function
+
+    Returns
+    -------
+    eigvals : (num_modes,) array-like
+        Eigenvalues ``omegan**2`` in ascending order
+    U : (K.shape[0], num_modes) array-like
+        Mass-normalized modes
+
+    """
+    K = csr_matrix(K)
+    M = csr_matrix(M)
+    n = K.shape[0]
+    X = np.zeros((n, num_modes))
+    ncols = 0
+    if X0 is not None:
+        X0 = np.asarray(X0).reshape(n, -1)[:, :num_modes]
+        ncols = X0.shape[1]
+        X[:, :ncols] = X0
+    if ncols < num_modes:
+        rng = np.random.default_rng(1)
+        X[:, ncols:] = rng.random((n, num_modes - ncols))
+    P = get_preconditioner(K, precond, **kwargs)
+    niter = 0
+    while True:
+        eigvals, res, scale = _residuals(K, M, X)
+        if np.all(res <= tol*scale) or niter >= maxiter:
+            break
+        # LOBPCG checks the residuals of M-normalized vectors
+        xMx = np.einsum('ij,ij->j', X, M @ X)
+        atol = tol*(scale/np.sqrt(xMx)).min()
+        _, X, history = lobpcg(K, X, B=M, M=P, tol=atol,
+                maxiter=maxiter - niter, largest=False,
+                retResidualNormsHistory=True)
+        niter += max(len(history), 1)
+    asort = np.argsort(eigvals)
+    eigvals = eigvals[asort]
+    U = X[:, asort]
+    # mass normalization
+    U = U/np.sqrt(np.einsum('ij,ij->j', U, M @ U))
+    return eigvals, U
+
+
+class CholeskyTransform(object):
+    """Transformation from the generalized to the standard eigenvalue problem
+
+    With ``M = L L^T`` the problem ``K u = omegan**2 M u`` becomes
+    ``Ktilde v = omegan**2 v``, with ``Ktilde = L^{-1} K L^{-T}`` and
+    ``u = L^{-T} v``. Only the Cholesky factor `L` is stored and every
+    product with ``L^{-1}`` is performed with triangular solves, such that
+    ``L^{-1}`` is never computed explicitly.
+
+    Parameters
+    ----------
+    K : array-like or sparse matrix
+        Stiffness matrix, typically `Kuu`
+    M : array-like or sparse matrix
+        Mass matrix, typically `Muu`
+
+    """
+    __slots__ = ['K', 'L']
+    def __init__(self, K, M):
+        if issparse(M):
+            M = M.toarray()
+        self.K = K
+        self.L = cholesky(M, lower=True)
+
+    def Ktilde_operator(self):
+        """Return ``Ktilde`` as a `LinearOperator`
+
+        Returns
+        -------
+        Ktilde : `LinearOperator`
+            Each product costs two triangular solves and one product with `K`
+
+        """
+        def matmat(x):
+            y = self.K @ solve_triangular(self.L, x, lower=True, trans='T')
+            return solve_triangular(self.L, y, lower=True)
+        n = self.L.shape[0]
+        return LinearOperator((n, n), matvec=matmat, matmat=matmat,
+                rmatvec=matmat, rmatmat=matmat, dtype=self.L.dtype)
+
+    def Ktilde(self):
+        """Return ``Ktilde`` as a dense matrix
+
+        Returns
+        -------
+        Ktilde : (n, n) array-like
+            Symmetric matrix obtained with two triangular solves
+
+        """
+        K = self.K.toarray() if issparse(self.K) else np.asarray(self.K)
+        # L^{-1} K
+        tmp = solve_triangular(self.L, K, lower=True)
+        # L^{-1} (L^{-1} K)^T = L^{-1} K L^{-T}
+        Ktilde = solve_triangular(self.L, tmp.T, lower=True)
+        return (Ktilde + Ktilde.T)/2
+
+    def eigh(self, **kwargs):
+        """Solve the standard eigenvalue problem
+
+        Parameters
+        ----------
+        kwargs : dict
+            Extra arguments passed to `scipy.linalg.eigh`
+
+        Returns
+        -------
+        eigvals : array-like
+            Eigenvalues ``omegan**2``
+        V : array-like
+            Orthonormal eigenvectors of ``Ktilde``
+
+        """
+        return eigh(self.Ktilde(), **kwargs)
+
+    def to_physical(self, V):
+        """Map vectors from the standard to the physical space
+
+        Parameters
+        ----------
+        V : (n,) or (n, m) array-like
+            Vectors in the standard space, e.g. all eigenvectors at once
+
+        Returns
+        -------
+        U : array-like
+            ``L^{-T} V``, computed with one batched triangular solve
+
+        """
+        return solve_triangular(self.L, V, lower=True, trans='T')
+
+    def from_physical(self, u):
+        """Map vectors from the physical to the standard space
+
+        Parameters
+        ----------
+        u : (n,) or (n, m) array-like
+            Physical displacements or velocities
+
+        Returns
+        -------
+        v : array-like
+            ``L^T u``
+
+        """
+        return self.L.T @ u
+
+    def force(self, f):
+        """Map forces from the physical to the standard space
+
+        Parameters
+        ----------
+        f : (n,) or (n, m) array-like
+            Physical forces, typically `fu`
+
+        Returns
+        -------
+        ftilde : array-like
+            ``L^{-1} f``, computed with one batched triangular solve
+
+        """
+        return solve_triangular(self.L, f, lower=True)
+
+
+def mac(U1, U2, M=None):
+    """Modal assurance criterion between two sets of modes
+
+    ``MAC[i, j] = (U1[:, i] @ M @ U2[:, j])**2/((U1[:, i] @ M @ U1[:, i])*(U2[:, j] @ M @ U2[:, j]))``
+
+    The mass matrix is applied once to each set of modes and all pairs are
+    obtained with a single dense product, at a cost of ``O(k1*k2*n)``.
+
+    Parameters
+    ----------
+    U1 : (n, k1) array-like
+        First set of modes
+    U2 : (n, k2) array-like
+        Second set of modes
+    M : array-like, sparse matrix or None, optional
+        Mass matrix used as weight, the identity is used when ``None``
+
+    Returns
+    -------
+    MAC : (k1, k2) array-like
+        Values between 0 and 1, 1 for parallel modes
+
+    """
+    U1 = np.asarray(U1)
+    U2 = np.asarray(U2)
+    MU1 = U1 if M is None else M @ U1
+    MU2 = U2 if M is None else M @ U2
+    n1 = np.einsum('ij,ij->j', U1, MU1)
+    n2 = np.einsum('ij,ij->j', U2, MU2)
+    return (U1.T @ MU2)**2/np.outer(n1, n2)
+
+
+class ModeTracker(object):
+    """Track mode families across a parameter sweep
+
+    At each step the mass-weighted MAC between the tracked modes of the
+    previous step and the new modes is computed and the modes are matched
+    with a linear assignment maximizing the total MAC, such that mode
+    families are kept even when the frequency ordering changes. The mass
+    matrix is applied only once per step, the tracked modes are stored
+    mass-normalized.
+
+    Properties
+    ----------
+    omegan : (nsteps, k) array-like
+        Tracked natural frequencies, one column per mode family
+    order : (nsteps, k) array-like
+        For each step, the index of the input mode assigned to each family
+    mac : (nsteps - 1, k) array-like
+        MAC value of each assignment, low values indicate that a family
+        could not be tracked reliably
+
+    """
+    __slots__ = ['_U', '_omegan', '_order', '_mac']
+    def __init__(self):
+        self._U = None
+        self._omegan = []
+        self._order = []
+        self._mac = []
+
+    def update(self, omegan, U, M=None):
+        """Add the modes of a new parameter value
+
+        Parameters
+        ----------
+        omegan : (k,) array-like
+            Natural frequencies of the new step
+        U : (n, k) array-like
+            Modes of the new step, the same number of modes must be given at
+        every step
+        M : array-like, sparse matrix or None, optional
+            Mass matrix of the new step, used as MAC weight
+
+        Returns
+        -------
+        order : (k,) array-like
+            Index of the input mode assigned to each family
+
+        """
+        omegan = np.asarray(omegan)
+        U = np.asarray(U)
+        k = omegan.shape[0]
+        if U.ndim != 2 or U.shape[1] != k:
+            raise ValueError('U must have one column per natural frequency')
+        if self._U is not None and k != self._U.shape[1]:
+            raise ValueError('%d modes given, but %d modes are tracked'
+                    % (k, self._U.shape[1]))
+        MU = U if M is None else M @ U
+        norms = np.sqrt(np.einsum('ij,ij->j', U, MU))
+        if self._U is None:
+            order = np.arange(k)
+        else:
+            MAC = (self._U.T @ MU)**2/norms**2
+            rows, cols = linear_sum_assignment(-MAC)
+            order = np.empty(k, dtype=int)
+            order[rows] = cols
+            self._mac.append(MAC[rows, cols])
+        self._U = U[:, order]/norms[order]
+        self._omegan.append(omegan[order])
+        self._order.append(order)
+        return order
+
+    @property
+    def omegan(self):
+        return np.asarray(self._omegan)
+
+    @property
+    def order(self):
+        return np.asarray(self._order)
+
+    @property
+    def mac(self):
+        return np.asarray(self._mac)
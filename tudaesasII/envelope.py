@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class Envelope(object):
+    """Running envelope, time of peak and RMS of a recovered quantity
+
+    The displacements are consumed in chunks of time steps, the quantity of
+    interest (e.g. strains) is recovered for the whole chunk at once and only
+    the running statistics are kept, such that the memory depends on the
+    number of elements and not on the length of the time history.
+
+    Instances can be passed as the `output` argument of
+    :func:`.time_integration.newmark` or
+    :func:`.time_integration.central_difference`, in which case the time
+    steps are buffered and processed every `chunksize` steps. Call
+    :meth:`flush` after the integration. Chunks can also be passed directly
+    with :meth:`update`.
+
+    Parameters
+    ----------
+    recover : callable
+        Function mapping displacements ``(n, nchunk)`` to the quantity of
+        interest with shape ``(..., nchunk)``. The integrators give the
+        unknown DOFs only, which must be expanded to the whole model before
+        gathering the element displacements, for instance::
+
+            def recover(uu):
+                u = np.zeros((N, uu.shape[1]))
+                u[bu] = uu
+                ue = beam2d.gather_displacements(beams, nid_pos, u)
+                return beam2d.exx_elements(y, beams, ue)
+
+    chunksize : int, optional
+        Number of buffered time steps when used as `output` callback
+
+    Properties
+    ----------
+    max, min : array-like
+        Maximum and minimum of the quantity over time
+    tmax, tmin : array-like
+        Times at which the maximum and minimum occur
+    rms : array-like
+        Root mean square over time
+    count : int
+        Number of time steps processed
+
+    """
+    __slots__ = ['recover', 'chunksize', 'max', 'min', 'tmax', 'tmin',
+            'sumsq', 'count', '_ubuf', '_tbuf', '_nbuf']
+    def __init__(self, recover, chunksize=256):
+        self.recover = recover
+        self.chunksize = chunksize
+        self.max = None
+        self.min = None
+        self.tmax = None
+        self.tmin = None
+        self.sumsq = None
+        self.count = 0
+        self._ubuf = None
+        self._tbuf = np.zeros(chunksize)
+        self._nbuf = 0
+
+    def update(self, u, t):
+        """Update the statistics with a chunk of time steps
+
+        Parameters
+        ----------
+        u : (n, nchunk) array-like
+            Displacements at each time step of the chunk
+        t : (nchunk,) array-like
+            Times of the chunk
+
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        q = np.asarray(self.recover(u))
+        if self.max is None:
+            shape = q.shape[:-1]
+            self.max = np.full(shape, -np.inf)
+            self.min = np.full(shape, np.inf)
+            self.tmax = np.zeros(shape)
+            self.tmin = np.zeros(shape)
+            self.sumsq = np.zeros(shape)
+
+        imax = q.argmax(axis=-1)
+        qmax = np.take_along_axis(q, imax[..., None], axis=-1)[..., 0]
+        check = qmax > self.max
+        self.max[check] = qmax[check]
+        self.tmax[check] = t[imax[check]]
+
+        imin = q.argmin(axis=-1)
+        qmin = np.take_along_axis(q, imin[..., None], axis=-1)[..., 0]
+        check = qmin < self.min
+        self.min[check] = qmin[check]
+        self.tmin[check] = t[imin[check]]
+
+        self.sumsq += np.einsum('...t,...t->...', q, q)
+        self.count += t.shape[0]
+
+    def __call__(self, i, ti, u, v=None, a=None):
+        u = np.asarray(u)
+        if self._ubuf is None:
+            self._ubuf = np.zeros(u.shape + (self.chunksize,))
+        self._ubuf[..., self._nbuf] = u
+        self._tbuf[self._nbuf] = ti
+        self._nbuf += 1
+        if self._nbuf == self.chunksize:
+            self.flush()
+
+    def flush(self):
+        """Process the buffered time steps"""
+        if self._nbuf > 0:
+            self.update(self._ubuf[..., :self._nbuf], self._tbuf[:self._nbuf])
+            self._nbuf = 0
+
+    @property
+    def rms(self):
+        if self.count == 0:
+            raise ValueError('no time steps processed, call update or flush first')
+        return np.sqrt(self.sumsq/self.count)
@@ -0,0 +1,233 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+try:
+    # Python >= 3.8
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+import numpy as np
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+from scipy.sparse.linalg import splu
+
+
+_kinds = {'receptance': 0, 'mobility': 1, 'accelerance': 2}
+
+
+def modal_frf(modes, omegan, zeta, omega, out_dofs=None, in_dofs=None,
+        kind='receptance', chunksize=None, max_memory=2**26):
+    r"""Frequency response functions using modal superposition
+
+    For each excitation frequency ``omega`` the FRF matrix is::
+
+        H(omega) = Phi_out @ diag(1/(omegan**2 - omega**2 + 2j*zeta*omegan*omega)) @ Phi_in.T
+
+    evaluated for all frequencies and all DOF pairs as one broadcasted
+    operation, in chunks of frequencies to limit the memory usage.
+
+    Parameters
+    ----------
+    modes : (N, nmodes) array-like
+        Mass-normalized mode shapes, i.e. ``modes.T @ M @ modes = I``
+    omegan : (nmodes,) array-like
+        Natural frequencies in rad/s
+    zeta : float or (nmodes,) array-like
+        Modal damping ratios
+    omega : (nfreq,) array-like
+        Excitation frequencies in rad/s
+    out_dofs, in_dofs : array-like or None, optional
+        Indices of the response and excitation DOFs, by default all
+    kind : str, optional
+        ``'receptance'`` (displacement), ``'mobility'`` (velocity) or
+        ``'accelerance'`` (acceleration) per unit force
+    chunksize : int or None, optional
+        Number of frequencies evaluated at once. By default it is calculated
+        from `max_memory`
+    max_memory : int, optional
+        Approximate memory in bytes of the temporary arrays of each chunk
+
+    Returns
+    -------
+    H : (nfreq, nout, nin) array-like
+        Complex frequency response functions
+
+    """
+    modes = np.asarray(modes)
+    omegan = np.asarray(omegan, dtype=float).ravel()
+    nmodes = omegan.shape[0]
+    zeta = np.broadcast_to(np.asarray(zeta, dtype=float).ravel(), (nmodes,))
+    omega = np.atleast_1d(np.asarray(omega, dtype=float))
+    if kind not in _kinds:
+        raise ValueError('kind must be one of %s' % list(_kinds.keys()))
+    power = _kinds[kind]
+
+    Phi_out = modes[:, :nmodes] if out_dofs is None else modes[out_dofs, :nmodes]
+    Phi_in = modes[:, :nmodes] if in_dofs is None else modes[in_dofs, :nmodes]
+    nout = Phi_out.shape[0]
+    nin = Phi_in.shape[0]
+    nfreq = omega.shape[0]
+
+    if chunksize is None:
+        bytes_per_freq = 16*(nmodes + nout*nmodes + nout*nin)
+        chunksize = max(1, int(max_memory//bytes_per_freq))
+
+    H = np.empty((nfreq, nout, nin), dtype=complex)
+    for i in range(0, nfreq, chunksize):
+        w = omega[i:i+chunksize, None]
+        d = 1/(omegan**2 - w**2 + 2j*zeta*omegan*w)
+        if power > 0:
+            d *= (1j*w)**power
+        H[i:i+chunksize] = (Phi_out[None, :, :]*d[:, None, :]) @ Phi_in.T
+    return H
+
+
+def _union_pattern(mats, n):
+    """CSR structure shared by all matrices and their data on this structure"""
+    coos = [coo_matrix(A) for A in mats]
+    rows = np.concatenate([A.row for A in coos]).astype(np.int64)
+    cols = np.concatenate([A.col for A in coos]).astype(np.int64)
+    keys, inv = np.unique(rows*n + cols, return_inverse=True)
+    datas = []
+    start = 0
+    for A in coos:
+        end = start + A.nnz
+        datas.append(np.bincount(inv[start:end], weights=A.data,
+            minlength=keys.shape[0]))
+        start = end
+    indices = keys % n
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys//n, minlength=n), out=indptr[1:])
+    return indices, indptr, datas
+
+
+def _to_shared(arrays):
+    """Copy arrays to shared memory blocks"""
+    shms = []
+    specs = []
+    for a in arrays:
+        shm = shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1))
+        np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[...] = a
+        shms.append(shm)
+        specs.append((shm.name, a.shape, a.dtype.str))
+    return shms, specs
+
+
+_worker = {}
+
+
+def _attach(specs):
+    _worker.clear()
+    shms = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    _worker['shms'] = shms
+    _worker['arrays'] = [np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            for shm, (_, shape, dtype) in zip(shms, specs)]
+
+
+def _solve_batch(ifreqs):
+    indices, indptr, Kd, Md, Cd, f, omega, out_dofs, H = _worker['arrays']
+    n = indptr.shape[0] - 1
+    for i in ifreqs:
+        w = omega[i]
+        data = Kd - w**2*Md + 1j*w*Cd
+        # the CSR arrays of A interpreted as CSC represent A.T
+        lu = splu(csc_matrix((data, indices, indptr), shape=(n, n)),
+                permc_spec='NATURAL')
+        H[i] = lu.solve(f, trans='T')[out_dofs]
+
+
+def direct_frf(Kuu, Muu, fu, omega, Cuu=None, out_dofs=None, workers=None,
+        batch_size=None):
+    r"""Frequency response solving the complex linear system at each frequency
+
+    Solves ``(Kuu - omega**2*Muu + 1j*omega*Cuu) u = fu`` for all `omega`,
+    without modal truncation and for any damping matrix. The three matrices
+    are aligned on their common sparsity pattern and the fill-reducing
+    ordering is computed once, such that assembling the system at each
+    frequency is a vectorized combination of the three data arrays. SuperLU
+    has no API to reuse a symbolic factorization, hence each frequency
+    still performs a complete sparse LU factorization, only without
+    recomputing the ordering. The frequencies are distributed in batches
+    over a pool of processes, which read the matrices from shared memory
+    and write the responses directly into a shared output array.
+
+    Parameters
+    ----------
+    Kuu, Muu : array-like or sparse matrix
+        Stiffness and mass matrices corresponding to the unknown DOFs
+    fu : (n,) or (n, nloads) array-like
+        Force amplitudes at the unknown DOFs, real or complex
+    omega : (nfreq,) array-like
+        Excitation frequencies in rad/s
+    Cuu : array-like, sparse matrix or None, optional
+        Viscous damping matrix, not necessarily proportional
+    out_dofs : array-like or None, optional
+        Indices of the unknown DOFs kept in the output, by default all
+    workers : int or None, optional
+        Number of processes. With ``1`` the solution runs in the current
+        process, with ``None`` the number of CPUs is used. More than one
+        process requires `multiprocessing.shared_memory`, available from
+        Python 3.8, with ``None`` a single process is used otherwise
+    batch_size : int or None, optional
+        Number of frequencies per task
+
+    Returns
+    -------
+    H : (nfreq, nout) or (nfreq, nout, nloads) array-like
+        Complex response amplitudes at `out_dofs`
+
+    """
+    Kuu = csr_matrix(Kuu)
+    n = Kuu.shape[0]
+    Muu = csr_matrix(Muu)
+    Cuu = csr_matrix((n, n)) if Cuu is None else csr_matrix(Cuu)
+    omega = np.atleast_1d(np.asarray(omega, dtype=float))
+    nfreq = omega.shape[0]
+    f = np.asarray(fu).astype(complex)
+    out_dofs = np.arange(n) if out_dofs is None else np.asarray(out_dofs).ravel()
+
+    # fill-reducing ordering computed once for all frequencies
+    indices, indptr, datas = _union_pattern([Kuu, Muu, Cuu], n)
+    pattern = csr_matrix((np.ones(indices.shape[0]), indices, indptr),
+            shape=(n, n))
+    perm = reverse_cuthill_mckee(pattern + pattern.T, symmetric_mode=True)
+    iperm = np.empty_like(perm)
+    iperm[perm] = np.arange(n)
+    mats = [csr_matrix((d, indices, indptr), shape=(n, n))[perm][:, perm]
+            for d in datas]
+    indices, indptr, datas = _union_pattern(mats, n)
+
+    H = np.zeros((nfreq, out_dofs.shape[0]) + f.shape[1:], dtype=complex)
+    arrays = [indices, indptr, datas[0], datas[1], datas[2], f[perm], omega,
+              iperm[out_dofs], H]
+
+    if workers is None:
+        workers = os.cpu_count() if shared_memory is not None else 1
+    elif workers > 1 and shared_memory is None:
+        raise ImportError('multiprocessing.shared_memory (Python >= 3.8) is required for workers > 1')
+    workers = max(1, min(workers, nfreq))
+    if batch_size is None:
+        batch_size = max(1, nfreq//(4*workers))
+    batches = [range(i, min(i + batch_size, nfreq)) for i in range(0, nfreq,
+        batch_size)]
+
+    if workers == 1:
+        _worker['arrays'] = arrays
+        try:
+            for batch in batches:
+                _solve_batch(batch)
+        finally:
+            _worker.clear()
+        return H
+
+    shms, specs = _to_shared(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                initargs=(specs,)) as pool:
+            list(pool.map(_solve_batch, batches))
+        H[...] = np.ndarray(H.shape, dtype=H.dtype, buffer=shms[-1].buf)
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+    return H
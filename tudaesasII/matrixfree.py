@@ -0,0 +1,294 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+from . import beam2d, quad4r, tria3r, truss2d
+
+
+def _element_info(elem):
+    if isinstance(elem, quad4r.Quad4R):
+        return [elem.n1, elem.n2, elem.n3, elem.n4], quad4r.DOF
+    elif isinstance(elem, tria3r.Tria3R):
+        return [elem.n1, elem.n2, elem.n3], tria3r.DOF
+    elif isinstance(elem, beam2d.Beam2D):
+        return [elem.n1, elem.n2], beam2d.DOF
+    elif isinstance(elem, truss2d.Truss2D):
+        return [elem.n1, elem.n2], truss2d.DOF
+    else:
+        raise NotImplementedError('element "%s" not supported' % type(elem).__name__)
+
+
+def _update_local(elem, nid_pos, ncoords, Ke, matrix, lumped):
+    if isinstance(elem, (quad4r.Quad4R, tria3r.Tria3R)):
+        module = quad4r if isinstance(elem, quad4r.Quad4R) else tria3r
+        if matrix == 'K':
+            module.update_K(elem, nid_pos, ncoords, Ke)
+        else:
+            module.update_M(elem, nid_pos, ncoords, Ke)
+    elif isinstance(elem, beam2d.Beam2D):
+        if matrix == 'K':
+            beam2d.update_K(elem, nid_pos, ncoords, Ke)
+        else:
+            # update_K calculates beam.le and beam.thetarad
+            beam2d.update_K(elem, nid_pos, ncoords, np.zeros_like(Ke))
+            beam2d.update_M(elem, nid_pos, Ke, lumped=lumped)
+    elif isinstance(elem, truss2d.Truss2D):
+        dummy = np.zeros_like(Ke)
+        if matrix == 'K':
+            truss2d.update_K_M(elem, nid_pos, ncoords, Ke, dummy, lumped=lumped)
+        else:
+            truss2d.update_K_M(elem, nid_pos, ncoords, dummy, Ke, lumped=lumped)
+
+
+def element_dofs(elems, nid_pos):
+    """Global DOF indices of each element
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type, e.g. a list of `.Quad4R` objects
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+
+    Returns
+    -------
+    dofs : (nelem, ndof_e) array-like
+        Global DOF indices in the same order as the element matrices
+
+    """
+    DOF = _element_info(elems[0])[1]
+    pos = np.array([[nid_pos[nid] for nid in _element_info(elem)[0]] for elem
+        in elems], dtype=np.int64)
+    return (DOF*pos[:, :, None] + np.arange(DOF)[None, None, :]).reshape(len(elems), -1)
+
+
+def element_matrices(elems, nid_pos, ncoords, matrix='K', lumped=False):
+    """Element matrices computed with the update functions of each element
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type: `.Quad4R`, `.Tria3R`, `.Beam2D` or
+        `.Truss2D`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+    matrix : str, optional
+        ``'K'`` for stiffness or ``'M'`` for mass matrices
+    lumped : bool, optional
+        If lumped mass should be used, for elements supporting it
+
+    Returns
+    -------
+    Ke : (nelem, ndof_e, ndof_e) array-like
+        Element matrices in global coordinates
+
+    """
+    ncoords = np.asarray(ncoords)
+    nodes, DOF = _element_info(elems[0])
+    nnodes = len(nodes)
+    Ke = np.zeros((len(elems), DOF*nnodes, DOF*nnodes))
+    for i, elem in enumerate(elems):
+        nodes = _element_info(elem)[0]
+        local_pos = dict(zip(nodes, range(nnodes)))
+        local_coords = ncoords[[nid_pos[nid] for nid in nodes]]
+        _update_local(elem, local_pos, local_coords, Ke[i], matrix, lumped)
+    return Ke
+
+
+class ElementOperator(LinearOperator):
+    """Matrix-free element-by-element operator
+
+    The product ``K @ u`` is computed by gathering the nodal vectors into an
+    ``(nelem, ndof_e)`` array, applying the element matrices with
+    `np.einsum` and scatter-adding the result with `np.bincount`. The global
+    matrix is never assembled.
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type: `.Quad4R`, `.Tria3R`, `.Beam2D` or
+        `.Truss2D`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+    N : int
+        Number of DOFs of the whole model
+    bu : array-like or None, optional
+        Boolean array defining the unknown DOFs. When given, the operator
+        represents `Kuu` instead of `K`
+    matrix : str, optional
+        ``'K'`` for stiffness or ``'M'`` for mass
+    lumped : bool, optional
+        If lumped mass should be used, for elements supporting it
+    store : bool, optional
+        If ``True`` the element matrices are computed once and stored,
+        otherwise they are recomputed on the fly in chunks of `chunksize`
+        elements at every product, keeping the memory independent of the
+        number of elements
+    chunksize : int, optional
+        Number of elements per chunk when ``store=False``
+
+    """
+    def __init__(self, elems, nid_pos, ncoords, N, bu=None, matrix='K',
+            lumped=False, store=True, chunksize=1000):
+        self.elems = elems
+        self.nid_pos = nid_pos
+        self.ncoords = np.asarray(ncoords)
+        self.N = N
+        self.bu = None if bu is None else np.asarray(bu, dtype=bool)
+        self.matrix = matrix
+        self.lumped = lumped
+        self.chunksize = chunksize
+        self.dofs = element_dofs(elems, nid_pos)
+        self.Ke = None
+        if store:
+            self.Ke = element_matrices(elems, nid_pos, self.ncoords,
+                    matrix=matrix, lumped=lumped)
+        n = N if self.bu is None else int(self.bu.sum())
+        super(ElementOperator, self).__init__(dtype=np.float64, shape=(n, n))
+
+    def _chunks(self):
+        if self.Ke is not None:
+            yield self.dofs, self.Ke
+        else:
+            for i in range(0, len(self.elems), self.chunksize):
+                elems = self.elems[i:i+self.chunksize]
+                yield (self.dofs[i:i+self.chunksize],
+                       element_matrices(elems, self.nid_pos, self.ncoords,
+                           matrix=self.matrix, lumped=self.lumped))
+
+    def _matmat(self, x):
+        x = np.asarray(x, dtype=np.float64).reshape(self.shape[1], -1)
+        if self.bu is None:
+            xfull = x
+        else:
+            xfull = np.zeros((self.N, x.shape[1]))
+            xfull[self.bu] = x
+        yfull = np.zeros((self.N, x.shape[1]))
+        for dofs, Ke in self._chunks():
+            # gather, element products and scatter-add
+            ye = np.einsum('eij,ejk->eik', Ke, xfull[dofs])
+            for k in range(x.shape[1]):
+                yfull[:, k] += np.bincount(dofs.ravel(), weights=ye[:, :, k].ravel(),
+                        minlength=self.N)
+        if self.bu is None:
+            return yfull
+        return yfull[self.bu]
+
+    def _matvec(self, x):
+        return self._matmat(x)[:, 0]
+
+    def _adjoint(self):
+        # element matrices are symmetric
+        return self
+
+    def diagonal(self):
+        """Diagonal of the operator
+
+        Returns
+        -------
+        diag : array-like
+            Diagonal terms, used for instance by the Jacobi preconditioner
+
+        """
+        diag = np.zeros(self.N)
+        for dofs, Ke in self._chunks():
+            diag += np.bincount(dofs.ravel(),
+                    weights=np.einsum('eii->ei', Ke).ravel(), minlength=self.N)
+        if self.bu is None:
+            return diag
+        return diag[self.bu]
+
+
+def lumped_masses(elems, nid_pos, ncoords):
+    """Diagonal lumped mass of each element
+
+    `.Beam2D` and `.Truss2D` use their own lumped mass matrices, whereas for
+    `.Quad4R` and `.Tria3R` the rows of the consistent mass matrix are summed,
+    which preserves the total translational mass and rotary inertia.
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type: `.Quad4R`, `.Tria3R`, `.Beam2D` or
+        `.Truss2D`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+
+    Returns
+    -------
+    me : (nelem, ndof_e) array-like
+        Lumped masses in the same DOF order as :func:`element_dofs`
+
+    """
+    if isinstance(elems[0], (beam2d.Beam2D, truss2d.Truss2D)):
+        Me = element_matrices(elems, nid_pos, ncoords, matrix='M', lumped=True)
+        return np.einsum('eii->ei', Me).copy()
+    Me = element_matrices(elems, nid_pos, ncoords, matrix='M')
+    return Me.sum(axis=2)
+
+
+def lumped_mass_diagonal(elems, nid_pos, ncoords, N):
+    """Assembled diagonal lumped mass matrix
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type, see :func:`lumped_masses`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+    N : int
+        Number of DOFs of the whole model
+
+    Returns
+    -------
+    mdiag : (N,) array-like
+        Diagonal of the lumped mass matrix
+
+    """
+    dofs = element_dofs(elems, nid_pos)
+    me = lumped_masses(elems, nid_pos, ncoords)
+    return np.bincount(dofs.ravel(), weights=me.ravel(), minlength=N)
+
+
+def critical_time_step(elems, nid_pos, ncoords, chunksize=1000):
+    """Critical time step of the central difference method
+
+    The highest natural frequency of the assembled model with lumped mass is
+    bounded by the highest natural frequency of the unconstrained elements,
+    such that ``dtcrit = 2/max(omega_e)`` is a conservative estimate. The
+    element eigenvalue problems are solved in batches.
+
+    Parameters
+    ----------
+    elems : list
+        Elements of the same type, see :func:`lumped_masses`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+    chunksize : int, optional
+        Number of elements solved at once
+
+    Returns
+    -------
+    dtcrit : float
+        Critical time step
+
+    """
+    omega2max = 0.
+    for i in range(0, len(elems), chunksize):
+        chunk = elems[i:i+chunksize]
+        Ke = element_matrices(chunk, nid_pos, ncoords, matrix='K')
+        me = lumped_masses(chunk, nid_pos, ncoords)
+        s = np.zeros_like(me)
+        s[me > 0] = 1/np.sqrt(me[me > 0])
+        Ktilde = Ke*s[:, :, None]*s[:, None, :]
+        omega2max = max(omega2max, np.linalg.eigvalsh(Ktilde)[:, -1].max())
+    return 2/np.sqrt(omega2max)
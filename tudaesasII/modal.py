@@ -0,0 +1,423 @@
+from collections import OrderedDict
+
+import numpy as np
+from scipy.fft import rfft, irfft, next_fast_len
+from scipy.signal import lfilter, lfiltic
+
+
+def time_step(t):
+    """Time step of a uniformly spaced time vector
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Time vector
+
+    Returns
+    -------
+    dt : float
+        Time step
+
+    """
+    t = np.asarray(t)
+    dt = t[1] - t[0]
+    if not np.allclose(np.diff(t), dt, rtol=1e-6, atol=0):
+        raise ValueError('time vector "t" must be uniformly spaced')
+    return dt
+
+
+def modal_convolution(fmodal, t, omegan, zeta):
+    """Convolution integral for all mass-normalized modal coordinates
+
+    The modal forces are taken as a sequence of impulses ``fmodal*dt``
+    applied at the middle of each time interval, and convolved with the
+    damped impulse response function::
+
+        h(t) = 1/omegad*exp(-zeta*omegan*t)*sin(omegad*t)
+
+    using a zero-padded FFT, at a cost of ``O(nmodes*nt*log(nt))``. The
+    result is identical to the summation of the piecewise constant impulse
+    responses over all time intervals.
+
+    Parameters
+    ----------
+    fmodal : (nmodes, nt-1) or (nmodes, nt) array-like
+        Modal forces. With ``nt-1`` columns they are the forces at the middle
+        of each time interval, with ``nt`` columns they are the forces at each
+        time in `t` and the mean of the two ends of each interval is used
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    omegan : (nmodes,) array-like
+        Natural frequencies in rad/s
+    zeta : float or (nmodes,) array-like
+        Modal damping ratios
+
+    Returns
+    -------
+    r : (nmodes, nt) array-like
+        Forced response of the modal coordinates at all times in `t`, for
+        zero initial conditions
+
+    """
+    t = np.asarray(t)
+    dt = time_step(t)
+    nt = t.shape[0]
+    fmodal = np.atleast_2d(np.asarray(fmodal, dtype=float))
+    if fmodal.shape[1] == nt:
+        fmodal = (fmodal[:, :-1] + fmodal[:, 1:])/2
+    assert fmodal.shape[1] == nt - 1
+    omegan = np.atleast_1d(np.asarray(omegan, dtype=float)).ravel()[:, None]
+    zeta = np.broadcast_to(np.asarray(zeta, dtype=float).ravel(),
+            (omegan.shape[0],))[:, None]
+    omegad = omegan*np.sqrt(1 - zeta**2)
+
+    # impulse response sampled at the delays between the middle of each
+    # interval and each time in t, it is zero at the first position
+    tau = (np.arange(1, nt) - 0.5)*dt
+    g = np.zeros((omegan.shape[0], nt))
+    g[:, 1:] = np.exp(-zeta*omegan*tau)*np.sin(omegad*tau)/omegad
+
+    nfft = next_fast_len(2*nt - 2, real=True)
+    r = irfft(rfft(fmodal, nfft, axis=1)*rfft(g, nfft, axis=1), nfft, axis=1)
+    return dt*r[:, :nt]
+
+
+def _nigam_jennings(omegan, zeta, dt):
+    """Exact recurrence matrices for piecewise-linear forcing, unit mass
+
+    Returns ``A, C, D`` of shape ``(nmodes, 2, 2)`` and ``(nmodes, 2)`` such
+    that ``s[i+1] = A @ s[i] + C*f[i] + D*f[i+1]``, with ``s = [r, rdot]``
+
+    """
+    on = omegan
+    if np.any(zeta >= 1):
+        raise ValueError('only underdamped modes (zeta < 1) are supported')
+    sq = np.sqrt(1 - zeta**2)
+    od = on*sq
+    e = np.exp(-zeta*on*dt)
+    s = np.sin(od*dt)
+    c = np.cos(od*dt)
+    k = on**2
+
+    A = np.empty((on.shape[0], 2, 2))
+    A[:, 0, 0] = e*(zeta/sq*s + c)
+    A[:, 0, 1] = e*s/od
+    A[:, 1, 0] = -e*on/sq*s
+    A[:, 1, 1] = e*(c - zeta/sq*s)
+
+    C = np.empty((on.shape[0], 2))
+    D = np.empty((on.shape[0], 2))
+    C[:, 0] = (2*zeta/(on*dt) + e*(((1 - 2*zeta**2)/(od*dt) - zeta/sq)*s
+               - (1 + 2*zeta/(on*dt))*c))/k
+    D[:, 0] = (1 - 2*zeta/(on*dt) + e*((2*zeta**2 - 1)/(od*dt)*s
+               + 2*zeta/(on*dt)*c))/k
+    C[:, 1] = (-1/dt + e*((on/sq + zeta/(dt*sq))*s + c/dt))/k
+    D[:, 1] = (1 - e*(zeta/sq*s + c))/(k*dt)
+    return A, C, D
+
+
+def modal_recurrence(fmodal, t, omegan, zeta, r0=None, rdot0=None):
+    """Exact time integration of mass-normalized modal equations
+
+    Uses the Nigam-Jennings recurrence, which is exact for forces varying
+    linearly within each time step::
+
+        s[i+1] = A @ s[i] + C*fmodal[i] + D*fmodal[i+1],  s = [r, rdot]
+
+    The coefficients are computed once per mode. The recurrence is evaluated
+    as a second-order recursive filter with `scipy.signal.lfilter`, so that
+    records with millions of time steps are integrated in compiled code.
+
+    Parameters
+    ----------
+    fmodal : (nmodes, nt) array-like
+        Modal forces at each time in `t`
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    omegan : (nmodes,) array-like
+        Natural frequencies in rad/s
+    zeta : float or (nmodes,) array-like
+        Modal damping ratios, must be smaller than 1
+    r0, rdot0 : (nmodes,) array-like or None, optional
+        Initial modal displacements and velocities, zero by default
+
+    Returns
+    -------
+    r, rdot : (nmodes, nt) array-like
+        Modal displacements and velocities at all times in `t`
+
+    """
+    t = np.asarray(t)
+    dt = time_step(t)
+    nt = t.shape[0]
+    fmodal = np.atleast_2d(np.asarray(fmodal, dtype=float))
+    assert fmodal.shape[1] == nt
+    omegan = np.atleast_1d(np.asarray(omegan, dtype=float)).ravel()
+    nmodes = omegan.shape[0]
+    zeta = np.broadcast_to(np.asarray(zeta, dtype=float).ravel(), (nmodes,))
+    fmodal = np.broadcast_to(fmodal, (nmodes, nt))
+    A, C, D = _nigam_jennings(omegan, zeta, dt)
+
+    s = np.zeros((nmodes, 2, nt))
+    if r0 is not None:
+        s[:, 0, 0] = r0
+    if rdot0 is not None:
+        s[:, 1, 0] = rdot0
+    # w[i] = C*f[i] + D*f[i+1] is the forcing term of step i
+    w = C[:, :, None]*fmodal[:, None, :-1] + D[:, :, None]*fmodal[:, None, 1:]
+    s[:, :, 1] = np.einsum('mij,mj->mi', A, s[:, :, 0]) + w[:, :, 0]
+    if nt < 3:
+        return s[:, 0, :nt], s[:, 1, :nt]
+
+    # Cayley-Hamilton: s[i+2] - tr(A)*s[i+1] + det(A)*s[i] = w[i+1] + (A - tr(A))*w[i]
+    trA = A[:, 0, 0] + A[:, 1, 1]
+    detA = A[:, 0, 0]*A[:, 1, 1] - A[:, 0, 1]*A[:, 1, 0]
+    for m in range(nmodes):
+        Am = A[m] - trA[m]*np.eye(2)
+        x = w[m, :, 1:] + Am @ w[m, :, :-1]
+        a = [1., -trA[m], detA[m]]
+        zi = np.array([lfiltic([1.], a, [s[m, i, 1], s[m, i, 0]]) for i in range(2)])
+        s[m, :, 2:] = lfilter([1.], a, x, axis=1, zi=zi)[0]
+    return s[:, 0], s[:, 1]
+
+
+def _key(index):
+    """Hashable representation of an index used in the cache of ModalResult"""
+    if index is None:
+        return None
+    if isinstance(index, slice):
+        return ('slice', index.start, index.stop, index.step)
+    if np.isscalar(index) and not isinstance(index, (bool, np.bool_)):
+        return ('scalar', int(index))
+    # the kind and shape distinguish boolean masks from integer indices
+    index = np.asarray(index)
+    return ('array', index.dtype.kind, index.shape,
+            tuple(index.ravel().tolist()))
+
+
+class ModalResult(object):
+    """Result of a modal transient analysis with lazy reconstruction
+
+    Only the modal coordinates ``r(t)`` and the mode shapes are stored,
+    requiring ``O(nmodes*nt)`` memory. Physical displacements are computed
+    on demand for the requested DOFs and time steps as ``modes[dofs] @
+    r[:, steps]``, and the most recently requested slices are cached.
+
+    Parameters
+    ----------
+    modes : (n, nmodes) array-like
+        Mode shapes in physical coordinates, for instance
+        ``CholeskyTransform.to_physical(P)``
+    r : (nmodes, nt) array-like
+        Modal coordinates at each time
+    t : (nt,) array-like
+        Time vector
+    bu : array-like or None, optional
+        Boolean array defining the unknown DOFs. When given, `modes`
+        correspond to the unknown DOFs and the DOFs are requested using the
+        numbering of the whole model, the known DOFs having zero displacement
+    cache_size : int, optional
+        Number of reconstructed slices kept in memory
+
+    """
+    __slots__ = ['modes', 'r', 't', 'cache_size', '_cache']
+    def __init__(self, modes, r, t, bu=None, cache_size=16):
+        modes = np.asarray(modes)
+        if bu is not None:
+            bu = np.asarray(bu, dtype=bool)
+            full = np.zeros((bu.shape[0], modes.shape[1]), dtype=modes.dtype)
+            full[bu] = modes
+            modes = full
+        self.modes = modes
+        self.r = np.asarray(r)
+        self.t = np.asarray(t)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def steps(self, tmin=None, tmax=None):
+        """Time steps within a time window
+
+        Parameters
+        ----------
+        tmin, tmax : float or None, optional
+            Limits of the time window, inclusive
+
+        Returns
+        -------
+        steps : slice
+            To be used as the `steps` argument of :meth:`u`
+
+        """
+        start = 0 if tmin is None else int(np.searchsorted(self.t, tmin, side='left'))
+        stop = self.t.shape[0] if tmax is None else int(np.searchsorted(self.t,
+            tmax, side='right'))
+        return slice(start, stop)
+
+    def u(self, dofs=None, steps=None):
+        """Physical displacements
+
+        Parameters
+        ----------
+        dofs : int, slice, array-like or None, optional
+            DOFs to be reconstructed, by default all
+        steps : int, slice, array-like or None, optional
+            Time steps to be reconstructed, by default all, see :meth:`steps`
+
+        Returns
+        -------
+        u : array-like
+            Read-only displacements of shape ``(ndofs, nsteps)``, dimensions
+            are dropped for scalar `dofs` or `steps`
+
+        """
+        key = (_key(dofs), _key(steps))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        modes = self.modes if dofs is None else self.modes[dofs]
+        r = self.r if steps is None else self.r[:, steps]
+        u = modes @ r
+        u.setflags(write=False)
+        if self.cache_size > 0:
+            self._cache[key] = u
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return u
+
+    def nodal(self, pos, DOF, steps=None):
+        """Displacements of all DOFs of a node
+
+        Parameters
+        ----------
+        pos : int
+            Position of the node in the global assembly, i.e. ``nid_pos[nid]``
+        DOF : int
+            Number of DOFs per node
+        steps : int, slice, array-like or None, optional
+            Time steps to be reconstructed, by default all
+
+        Returns
+        -------
+        u : (DOF, nsteps) array-like
+            Displacements of the node
+
+        """
+        return self.u(slice(DOF*pos, DOF*(pos + 1)), steps)
+
+
+class SeparableLoad(object):
+    """Load defined as a sum of spatial shapes times time functions
+
+    ``f(t) = sum_k shapes[k]*functions[k](t)``
+
+    Projections to modal coordinates are then computed once per spatial
+    shape, see :meth:`project`, and the load history is obtained combining
+    the projected shapes with the time functions. The object is callable
+    and can be used wherever a load ``fu(t)`` is accepted, e.g. in
+    :func:`.time_integration.newmark`.
+
+    Properties
+    ----------
+    shapes : list
+        Spatial shapes, arrays of the same size
+    functions : list
+        Time functions, callables ``g(t)`` accepting arrays, or ``None``
+        for constant loads
+
+    """
+    __slots__ = ['shapes', 'functions', '_S']
+    def __init__(self):
+        self.shapes = []
+        self.functions = []
+        self._S = None
+
+    def add(self, shape, function=None):
+        """Add a load component
+
+        Parameters
+        ----------
+        shape : (n,) array-like
+            Spatial distribution of the load
+        function : callable or None, optional
+            Time function ``g(t)``, the load is constant when ``None``
+
+        """
+        self.shapes.append(np.asarray(shape))
+        self.functions.append(function)
+        self._S = None
+
+    def shape_matrix(self):
+        """Spatial shapes as columns of a matrix
+
+        The matrix is stacked once and reused until a component is added.
+
+        Returns
+        -------
+        S : (n, ncomp) array-like
+            One column per load component
+
+        """
+        if self._S is None:
+            self._S = np.column_stack(self.shapes)
+        return self._S
+
+    def time_functions(self, t):
+        """Values of all time functions
+
+        Parameters
+        ----------
+        t : float or (nt,) array-like
+            Times
+
+        Returns
+        -------
+        G : (ncomp,) or (ncomp, nt) array-like
+            One row per load component
+
+        """
+        t = np.asarray(t, dtype=float)
+        G = np.ones((len(self.functions),) + t.shape)
+        for k, g in enumerate(self.functions):
+            if g is not None:
+                G[k] = g(t)
+        return G
+
+    def project(self, T):
+        """Project all spatial shapes at once
+
+        Parameters
+        ----------
+        T : array-like or callable
+            Projection matrix, e.g. the transposed mass-normalized modes, or
+            a function applied to the ``(n, ncomp)`` matrix of shapes, e.g.
+            ``lambda f: P.T @ transf.force(f[bu])``
+
+        Returns
+        -------
+        load : :class:`SeparableLoad`
+            Load with projected shapes and the same time functions
+
+        """
+        S = self.shape_matrix()
+        S = T(S) if callable(T) else T @ S
+        load = SeparableLoad()
+        for k, g in enumerate(self.functions):
+            load.add(S[:, k], g)
+        load._S = S
+        return load
+
+    def __call__(self, t):
+        """Load at given times
+
+        Parameters
+        ----------
+        t : float or (nt,) array-like
+            Times
+
+        Returns
+        -------
+        f : (n,) or (n, nt) array-like
+            Load at each time
+
+        """
+        return self.shape_matrix() @ self.time_functions(t)
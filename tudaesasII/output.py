@@ -0,0 +1,185 @@
+import numpy as np
+from numpy.lib.format import open_memmap
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+
+class _ChunkedSink(object):
+    """Buffer time steps in memory and flush them in chunks"""
+    def __init__(self, nsave, nsteps, fields, chunksize):
+        for field in fields:
+            if field not in ('u', 'v', 'a'):
+                raise ValueError('fields must be a combination of "u", "v" and "a"')
+        self.nsave = nsave
+        self.nsteps = nsteps
+        self.fields = tuple(fields)
+        self.chunksize = chunksize
+        self.count = 0
+        self._start = 0
+        self._t = np.zeros(chunksize)
+        self._buffers = {field: np.zeros((chunksize, nsave)) for field in
+                self.fields}
+
+    def __call__(self, i, ti, u, v=None, a=None):
+        if self.count >= self.nsteps:
+            raise ValueError('more than %d time steps written' % self.nsteps)
+        values = {'u': u, 'v': v, 'a': a}
+        for field in self.fields:
+            if values[field] is None:
+                raise ValueError('field "%s" requested but not given' % field)
+        j = self.count - self._start
+        self._t[j] = ti
+        for field in self.fields:
+            self._buffers[field][j] = values[field]
+        self.count += 1
+        if self.count - self._start == self.chunksize:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered time steps"""
+        n = self.count - self._start
+        if n > 0:
+            self._write(self._start, n)
+            self._start = self.count
+
+    def close(self):
+        """Flush the buffer and close the file"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class NpySink(_ChunkedSink):
+    """Stream time histories to memory-mapped ``.npy`` files
+
+    One file is created per field, ``prefix + '_u.npy'``, ``prefix +
+    '_v.npy'``, ``prefix + '_a.npy'``, and the times are stored in ``prefix +
+    '_t.npy'``. Each array has shape ``(nsteps, nsave)``, such that every
+    chunk of time steps is a contiguous block of the file. The files can be
+    read back with ``np.load(..., mmap_mode='r')``.
+
+    The sink is called as ``sink(i, ti, u, v, a)`` and can be passed as the
+    `output` argument of :func:`.time_integration.newmark` and
+    :func:`.time_integration.central_difference`.
+
+    Parameters
+    ----------
+    prefix : str
+        Path and prefix of the output files
+    nsave : int
+        Number of saved DOFs
+    nsteps : int
+        Number of saved time steps
+    fields : str, optional
+        Any combination of ``'u'``, ``'v'`` and ``'a'``
+    chunksize : int, optional
+        Number of time steps kept in memory before writing
+
+    """
+    def __init__(self, prefix, nsave, nsteps, fields='u', chunksize=256):
+        super(NpySink, self).__init__(nsave, nsteps, fields, chunksize)
+        self.prefix = prefix
+        self._t_file = open_memmap(prefix + '_t.npy', mode='w+',
+                dtype=np.float64, shape=(nsteps,))
+        self._files = {field: open_memmap('%s_%s.npy' % (prefix, field),
+            mode='w+', dtype=np.float64, shape=(nsteps, nsave)) for field in
+            self.fields}
+
+    def _write(self, start, n):
+        self._t_file[start:start+n] = self._t[:n]
+        for field in self.fields:
+            self._files[field][start:start+n] = self._buffers[field][:n]
+
+    def close(self):
+        super(NpySink, self).close()
+        self._t_file.flush()
+        for f in self._files.values():
+            f.flush()
+
+
+class HDF5Sink(_ChunkedSink):
+    """Stream time histories to an HDF5 file
+
+    Datasets ``'t'`` and one per field (``'u'``, ``'v'``, ``'a'``) are
+    created with shape ``(nsteps, nsave)``, chunked along time. Requires
+    ``h5py``.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the HDF5 file
+    nsave : int
+        Number of saved DOFs
+    nsteps : int
+        Number of saved time steps
+    fields : str, optional
+        Any combination of ``'u'``, ``'v'`` and ``'a'``
+    chunksize : int, optional
+        Number of time steps kept in memory before writing
+    compression : str or None, optional
+        HDF5 compression filter, e.g. ``'gzip'``
+
+    """
+    def __init__(self, filename, nsave, nsteps, fields='u', chunksize=256,
+            compression=None):
+        if h5py is None:
+            raise ImportError('h5py is required to use HDF5Sink')
+        super(HDF5Sink, self).__init__(nsave, nsteps, fields, chunksize)
+        self.h5 = h5py.File(filename, 'w')
+        chunks = (min(chunksize, nsteps), nsave)
+        self.h5.create_dataset('t', shape=(nsteps,), dtype=np.float64)
+        for field in self.fields:
+            self.h5.create_dataset(field, shape=(nsteps, nsave),
+                    dtype=np.float64, chunks=chunks, compression=compression)
+
+    def _write(self, start, n):
+        self.h5['t'][start:start+n] = self._t[:n]
+        for field in self.fields:
+            self.h5[field][start:start+n] = self._buffers[field][:n]
+
+    def close(self):
+        super(HDF5Sink, self).close()
+        self.h5.close()
+
+
+def expand_modal(modes, r, t, sink, rdot=None, rddot=None, chunksize=1000):
+    """Write physical time histories from modal coordinates in chunks
+
+    Only ``modes @ r[:, chunk]`` is evaluated at once, such that the peak
+    memory does not depend on the number of time steps.
+
+    Parameters
+    ----------
+    modes : (nsave, nmodes) array-like
+        Mode shapes at the saved DOFs, e.g. ``L^{-T} P`` restricted to the
+        DOFs of interest
+    r : (nmodes, nt) array-like
+        Modal displacements
+    t : (nt,) array-like
+        Time vector
+    sink : callable
+        Called as ``sink(i, ti, u, v, a)`` at each time step, e.g.
+        :class:`NpySink`
+    rdot, rddot : (nmodes, nt) array-like or None, optional
+        Modal velocities and accelerations
+    chunksize : int, optional
+        Number of time steps expanded at once
+
+    """
+    nt = len(t)
+    for start in range(0, nt, chunksize):
+        end = min(start + chunksize, nt)
+        u = modes @ r[:, start:end]
+        v = None if rdot is None else modes @ rdot[:, start:end]
+        a = None if rddot is None else modes @ rddot[:, start:end]
+        for j in range(end - start):
+            sink(start + j, t[start + j], u[:, j],
+                 None if v is None else v[:, j],
+                 None if a is None else a[:, j])
@@ -2,6 +2,9 @@ import numpy as np
 
 DOF = 5
 
+#: nodal DOFs of the uncoupled membrane (u, v) and bending (w, phix, phiy) problems
+SUBSET_DOFS = {'membrane': [0, 1], 'bending': [2, 3, 4]}
+
 class Quad4R(object):
     """Reissner-Mindlin plate element with reduced integration
 
@@ -14,9 +17,12 @@ class Quad4R(object):
 
     https://onlinelibrary.wiley.com/doi/pdf/10.1002/nme.1620241208
 
+    The derivatives of the shape functions at the integration point are
+    cached in `dNdx` by :func:`update_K`, to be reused by :func:`strains`.
+
     """
     __slots__ = ['n1', 'n2', 'n3', 'n4', 'ABDE', 'h', 'rho',
-            'scf13', 'scf23']
+            'scf13', 'scf23', 'dNdx']
     def __init__(self):
         self.n1 = None
         self.n2 = None
@@ -26,8 +32,75 @@ class Quad4R(object):
         self.rho = None
         self.scf13 = 5/6. # transverse shear correction factor XZ
         self.scf23 = 5/6. # transverse shear correction factor YZ
+        self.dNdx = None
+
+
+def membrane_bending_uncoupled(ABDE, rtol=1e-10):
+    """Check if the membrane and bending problems are uncoupled
+
+    This is the case when the B matrix vanishes, e.g. for symmetric laminates
+
+    Parameters
+    ----------
+    ABDE : (8, 8) array-like
+        Constitutive matrix of the plate
+    rtol : float, optional
+        Tolerance for each ``Bij`` relative to ``sqrt(Aii*Djj)``
+
+    Returns
+    -------
+    uncoupled : bool
+        ``True`` if membrane and bending can be assembled separately
 
-def update_K(quad, nid_pos, ncoords, K):
+    """
+    ABDE = np.asarray(ABDE)
+    A = np.abs(np.diag(ABDE)[:3])
+    D = np.abs(np.diag(ABDE)[3:6])
+    B = np.abs(ABDE[:3, 3:6])
+    return bool(np.all(B <= rtol*np.sqrt(np.outer(A, D))))
+
+
+def update_subset(update, elem, nodes, nid_pos, ncoords, KM, subset):
+    """Assemble only the membrane or bending DOFs of an element matrix
+
+    The element matrix is computed with all DOFs and only the DOFs in
+    ``SUBSET_DOFS[subset]`` are added to `KM`. Shared by the plate elements
+    with ``DOF = 5``.
+
+    Parameters
+    ----------
+    update : callable
+        Element routine such as :func:`update_K`, called as ``update(elem,
+        nid_pos, ncoords, KM)``
+    elem : object
+        The element being added to `KM`
+    nodes : list
+        Node ids of the element
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    ncoords : list
+        Nodal coordinates of the whole model
+    KM : np.array
+        Global matrix with ``len(SUBSET_DOFS[subset])`` DOFs per node
+    subset : str
+        ``'membrane'`` or ``'bending'``
+
+    """
+    if subset not in SUBSET_DOFS:
+        raise ValueError('subset must be one of %s' % list(SUBSET_DOFS.keys()))
+    dofs = SUBSET_DOFS[subset]
+    nnodes = len(nodes)
+    pos = [nid_pos[nid] for nid in nodes]
+    Me = np.zeros((DOF*nnodes, DOF*nnodes))
+    update(elem, dict(zip(nodes, range(nnodes))), np.asarray(ncoords)[pos],
+            Me)
+    local = (DOF*np.arange(nnodes)[:, None] + dofs).ravel()
+    ndof = len(dofs)
+    glob = (ndof*np.asarray(pos)[:, None] + np.arange(ndof)).ravel()
+    KM[np.ix_(glob, glob)] += Me[np.ix_(local, local)]
+
+
+def update_K(quad, nid_pos, ncoords, K, subset=None):
     """Update global K with Ke from a quad element
 
     Properties
@@ -40,8 +113,18 @@ def update_K(quad, nid_pos, ncoords, K):
         Nodal coordinates of the whole model
     K : np.array
         Global stiffness matrix
+    subset : str or None, optional
+        ``'membrane'`` or ``'bending'`` to assemble only the corresponding
+        DOFs, in which case `K` has ``len(SUBSET_DOFS[subset])`` DOFs per
+        node. Only allowed when :func:`membrane_bending_uncoupled` is ``True``
 
     """
+    if subset is not None:
+        if not membrane_bending_uncoupled(quad.ABDE):
+            raise ValueError('membrane and bending are coupled, B matrix is not zero')
+        update_subset(update_K, quad, [quad.n1, quad.n2, quad.n3, quad.n4],
+                nid_pos, ncoords, K, subset)
+        return
     pos1 = nid_pos[quad.n1]
     pos2 = nid_pos[quad.n2]
     pos3 = nid_pos[quad.n3]
@@ -116,6 +199,7 @@ def update_K(quad, nid_pos, ncoords, K):
     N2y = -eta*j21/4 + j21/4 - j22*xi/4 - j22/4
     N3y = j21*(eta + 1)/4 + j22*(xi + 1)/4
     N4y = -eta*j21/4 - j21/4 - j22*xi/4 + j22/4
+    quad.dNdx = np.array([[N1x, N2x, N3x, N4x], [N1y, N2y, N3y, N4y]])
     N1xy = j11*j22/4 + j12*j21/4
     N2xy = -j11*j22/4 - j12*j21/4
     N3xy = j11*j22/4 + j12*j21/4
@@ -469,7 +553,7 @@ def update_K(quad, nid_pos, ncoords, K):
 
 
 
-def update_M(quad, nid_pos, ncoords, M):
+def update_M(quad, nid_pos, ncoords, M, subset=None):
     """Update global M with Me from a quad element
 
     Properties
@@ -482,8 +566,15 @@ def update_M(quad, nid_pos, ncoords, M):
         Nodal coordinates of the whole model
     M : np.array
         Global mass matrix
+    subset : str or None, optional
+        ``'membrane'`` or ``'bending'`` to assemble only the corresponding
+        DOFs, see :func:`update_K`
 
     """
+    if subset is not None:
+        update_subset(update_M, quad, [quad.n1, quad.n2, quad.n3, quad.n4],
+                nid_pos, ncoords, M, subset)
+        return
     pos1 = nid_pos[quad.n1]
     pos2 = nid_pos[quad.n2]
     pos3 = nid_pos[quad.n3]
@@ -600,3 +691,131 @@ def update_M(quad, nid_pos, ncoords, M):
             M[4+c4, 4+c3] += N3*N4*detJ*h**3*rho*wij/12
             M[4+c4, 4+c4] += N4**2*detJ*h**3*rho*wij/12
 
+
+
+def element_strains(elems, nodes, nid_pos, u, N):
+    """Generalized strains at one point of all plate elements
+
+    Shared by the plate elements with ``DOF = 5``, see :func:`strains`.
+
+    Parameters
+    ----------
+    elems : list
+        Plate elements with the derivatives of the shape functions cached in
+        ``elem.dNdx`` by their ``update_K``
+    nodes : list
+        Node ids of each element
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    u : (N,) or (N, nvec) array-like
+        Displacements of the whole model
+    N : (nnodes,) array-like
+        Shape functions at the recovery point
+
+    Returns
+    -------
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``exx, eyy, gxy, kxx, kyy, kxy, gyz, gxz``
+
+    """
+    dNdx = [elem.dNdx for elem in elems]
+    if any(d is None for d in dNdx):
+        raise ValueError('derivatives not cached, call update_K first')
+    dNdx = np.asarray(dNdx)
+    Nx = dNdx[:, 0]
+    Ny = dNdx[:, 1]
+    u = np.asarray(u)
+    pos = np.array([[nid_pos[nid] for nid in n] for n in nodes])
+    ue = u.reshape((-1, DOF) + u.shape[1:])[pos]
+    def d(Ni, i):
+        return np.einsum('en,en...->e...', Ni, ue[:, :, i])
+    phix = np.einsum('n,en...->e...', N, ue[:, :, 3])
+    phiy = np.einsum('n,en...->e...', N, ue[:, :, 4])
+    return np.stack([
+        d(Nx, 0),
+        d(Ny, 1),
+        d(Ny, 0) + d(Nx, 1),
+        d(Nx, 3),
+        d(Ny, 4),
+        d(Ny, 3) + d(Nx, 4),
+        d(Ny, 2) + phiy,
+        d(Nx, 2) + phix,
+        ], axis=1)
+
+
+def element_stress_resultants(elems, eps, shear_factor=1.):
+    """Stress resultants ``ABDE @ eps`` with the shear corrections of K
+
+    Shared by the plate elements with ``DOF = 5``, see
+    :func:`stress_resultants`.
+
+    Parameters
+    ----------
+    elems : list
+        Plate elements with ``ABDE``, ``scf13`` and ``scf23``
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        Generalized strains
+    shear_factor : float or (nelem,) array-like, optional
+        Additional factor on the transverse shear stiffness
+
+    Returns
+    -------
+    res : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``Nxx, Nyy, Nxy, Mxx, Myy, Mxy, Qy, Qx``
+
+    """
+    ABDE = np.array([elem.ABDE for elem in elems], dtype=float)
+    scf13 = np.array([elem.scf13 for elem in elems], dtype=float)
+    scf23 = np.array([elem.scf23 for elem in elems], dtype=float)
+    ABDE[:, 6, 6] *= scf23*shear_factor
+    ABDE[:, 7, 7] *= scf13*shear_factor
+    ABDE[:, 6, 7] *= np.minimum(scf13, scf23)
+    ABDE[:, 7, 6] = ABDE[:, 6, 7]
+    return np.einsum('eij,ej...->ei...', ABDE, eps)
+
+
+def strains(quads, nid_pos, u):
+    """Generalized strains of all quad elements at once
+
+    Evaluated at the integration point (centroid) using the derivatives
+    cached by :func:`update_K`, such that the strains of many modes or time
+    steps are obtained with a few array operations
+
+    Parameters
+    ----------
+    quads : list
+        `.Quad4R` objects, already used in :func:`update_K`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    u : (N,) or (N, nvec) array-like
+        Displacements of the whole model, e.g. mode shapes or time steps
+
+    Returns
+    -------
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``exx, eyy, gxy, kxx, kyy, kxy, gyz, gxz``, in the order of the rows
+        of ``ABDE``
+
+    """
+    nodes = [[quad.n1, quad.n2, quad.n3, quad.n4] for quad in quads]
+    return element_strains(quads, nodes, nid_pos, u, np.full(4, 1/4))
+
+
+def stress_resultants(quads, eps):
+    """Stress resultants of all quad elements at once
+
+    Parameters
+    ----------
+    quads : list
+        `.Quad4R` objects
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        Generalized strains, see :func:`strains`
+
+    Returns
+    -------
+    res : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``Nxx, Nyy, Nxy, Mxx, Myy, Mxy, Qy, Qx``, with the transverse shear
+        correction factors applied as in :func:`update_K`
+
+    """
+    return element_stress_resultants(quads, eps)
@@ -0,0 +1,276 @@
+import numpy as np
+from scipy.linalg import eigh
+from scipy.sparse import csr_matrix, issparse
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from .static import factorize
+
+
+def _dense(A):
+    return A.toarray() if issparse(A) else np.asarray(A)
+
+
+class CraigBampton(object):
+    """Craig-Bampton reduction of a substructure
+
+    The physical DOFs are partitioned into boundary DOFs `b`, kept in the
+    reduced model, and interior DOFs `i`, represented by static constraint
+    modes and by `num_modes` fixed-interface normal modes::
+
+        u_b = q_b
+        u_i = Psi q_b + Phi q_m,   Psi = -Kii^{-1} Kib
+
+    The reduced DOFs are ``q = [q_b, q_m]``. The factorization of `Kii` is
+    computed once and reused for the constraint modes and as the
+    shift-invert operator of the eigensolver.
+
+    Parameters
+    ----------
+    K, M : array-like or sparse matrix
+        Stiffness and mass matrices of the substructure, boundary conditions
+        of the substructure already applied
+    boundary : array-like
+        Indices or boolean mask of the boundary DOFs
+    num_modes : int
+        Number of fixed-interface modes
+    method : str or None, optional
+        Factorization method, see :func:`.static.factorize`
+
+    Properties
+    ----------
+    b, i : array-like
+        Indices of the boundary and interior DOFs
+    Psi : (ni, nb) array-like
+        Constraint modes
+    Phi : (ni, num_modes) array-like
+        Mass-normalized fixed-interface modes
+    omegan : (num_modes,) array-like
+        Natural frequencies of the fixed-interface modes in rad/s
+    Kr, Mr : (nb + num_modes, nb + num_modes) array-like
+        Reduced stiffness and mass matrices
+
+    """
+    __slots__ = ['b', 'i', 'Psi', 'Phi', 'omegan', 'Kr', 'Mr']
+    def __init__(self, K, M, boundary, num_modes, method=None):
+        K = csr_matrix(K)
+        M = csr_matrix(M)
+        n = K.shape[0]
+        boundary = np.asarray(boundary)
+        if boundary.dtype == bool:
+            bb = boundary
+        else:
+            bb = np.zeros(n, dtype=bool)
+            bb[boundary] = True
+        self.b = np.flatnonzero(bb)
+        self.i = np.flatnonzero(~bb)
+        b = self.b
+        i = self.i
+
+        Kii = K[i][:, i].tocsc()
+        Kib = K[i][:, b]
+        Mii = M[i][:, i]
+        ni = i.shape[0]
+        factor = factorize(Kii, method=method)
+
+        self.Psi = -factor.solve(_dense(Kib))
+
+        if num_modes >= ni - 1:
+            eigvals, Phi = eigh(_dense(Kii), _dense(Mii))
+            eigvals = eigvals[:num_modes]
+            Phi = Phi[:, :num_modes]
+        else:
+            OPinv = LinearOperator((ni, ni), matvec=factor.solve,
+                    dtype=np.float64)
+            eigvals, Phi = eigsh(Kii, k=num_modes, M=Mii, sigma=0.,
+                    OPinv=OPinv, which='LM')
+            asort = np.argsort(eigvals)
+            eigvals = eigvals[asort]
+            Phi = Phi[:, asort]
+            # mass normalization
+            Phi /= np.sqrt(np.einsum('ij,ij->j', Phi, Mii @ Phi))
+        self.Phi = Phi
+        self.omegan = np.sqrt(np.abs(eigvals))
+
+        T = self.transformation()
+        self.Kr = T.T @ (K @ T)
+        self.Mr = T.T @ (M @ T)
+        self.Kr = (self.Kr + self.Kr.T)/2
+        self.Mr = (self.Mr + self.Mr.T)/2
+
+    def transformation(self):
+        """Transformation matrix from reduced to physical DOFs
+
+        Returns
+        -------
+        T : (n, nb + num_modes) array-like
+            Such that ``u = T @ q``
+
+        """
+        nb = self.b.shape[0]
+        nm = self.Phi.shape[1]
+        T = np.zeros((nb + self.i.shape[0], nb + nm))
+        T[self.b, np.arange(nb)] = 1.
+        T[self.i, :nb] = self.Psi
+        T[self.i, nb:] = self.Phi
+        return T
+
+    def recover(self, q):
+        """Physical displacements from reduced DOFs
+
+        Parameters
+        ----------
+        q : (nb + num_modes,) or (nb + num_modes, nt) array-like
+            Reduced DOFs
+
+        Returns
+        -------
+        u : (n,) or (n, nt) array-like
+            Physical DOFs of the substructure
+
+        """
+        q = np.asarray(q)
+        nb = self.b.shape[0]
+        u = np.zeros((nb + self.i.shape[0],) + q.shape[1:], dtype=q.dtype)
+        u[self.b] = q[:nb]
+        u[self.i] = self.Psi @ q[:nb] + self.Phi @ q[nb:]
+        return u
+
+
+def assemble(superelements, boundary_pos, nb):
+    """Assemble Craig-Bampton superelements into a reduced global model
+
+    The global reduced DOFs are the `nb` interface DOFs followed by the
+    fixed-interface modal DOFs of each superelement, in the given order.
+
+    Parameters
+    ----------
+    superelements : list
+        :class:`CraigBampton` objects
+    boundary_pos : list
+        For each superelement, the position of each of its boundary DOFs
+        within the `nb` global interface DOFs
+    nb : int
+        Number of global interface DOFs
+
+    Returns
+    -------
+    K, M : array-like
+        Global reduced stiffness and mass matrices
+    dofs : list
+        For each superelement, the global reduced DOFs corresponding to its
+        reduced DOFs ``q``, to be used with :meth:`CraigBampton.recover`
+
+    """
+    nm = sum(se.Phi.shape[1] for se in superelements)
+    K = np.zeros((nb + nm, nb + nm))
+    M = np.zeros((nb + nm, nb + nm))
+    dofs = []
+    start = nb
+    for se, pos in zip(superelements, boundary_pos):
+        nmi = se.Phi.shape[1]
+        d = np.concatenate((np.asarray(pos, dtype=int),
+            np.arange(start, start + nmi)))
+        K[np.ix_(d, d)] += se.Kr
+        M[np.ix_(d, d)] += se.Mr
+        dofs.append(d)
+        start += nmi
+    return K, M, dofs
+
+
+class Guyan(object):
+    """Guyan static condensation
+
+    The slave DOFs `s` are eliminated assuming that no inertia or external
+    forces act on them::
+
+        u_s = Psi u_m,   Psi = -Kss^{-1} Ksm
+
+    such that the static solution is exact for forces applied at the master
+    DOFs and the eigenvalues of the condensed model are upper bounds of the
+    exact ones. A single sparse factorization of `Kss` is computed.
+
+    Parameters
+    ----------
+    K, M : array-like or sparse matrix
+        Stiffness and mass matrices, typically `Kuu` and `Muu`
+    slave : array-like
+        Indices or boolean mask of the DOFs to be eliminated, for instance
+        the rotations of all `.Beam2D` nodes with ``slave[2::DOF] = True``
+        on the full model followed by ``slave = slave[bu]``
+    method : str or None, optional
+        Factorization method, see :func:`.static.factorize`
+
+    Properties
+    ----------
+    m, s : array-like
+        Indices of the master and slave DOFs
+    Psi : (ns, nm) array-like
+        Static displacements at the slave DOFs due to unit master
+        displacements
+    Kc, Mc : (nm, nm) array-like
+        Condensed stiffness and mass matrices
+
+    """
+    __slots__ = ['m', 's', 'Psi', 'Kc', 'Mc']
+    def __init__(self, K, M, slave, method=None):
+        K = csr_matrix(K)
+        M = csr_matrix(M)
+        n = K.shape[0]
+        slave = np.asarray(slave)
+        if slave.dtype == bool:
+            bs = slave
+        else:
+            bs = np.zeros(n, dtype=bool)
+            bs[slave] = True
+        self.s = np.flatnonzero(bs)
+        self.m = np.flatnonzero(~bs)
+        s = self.s
+        m = self.m
+
+        Kss = K[s][:, s].tocsc()
+        factor = factorize(Kss, method=method)
+        self.Psi = -factor.solve(_dense(K[s][:, m]))
+
+        Psi = self.Psi
+        Kc = _dense(K[m][:, m]) + K[m][:, s] @ Psi
+        Msm = M[s][:, m]
+        MssPsi = M[s][:, s] @ Psi
+        Mc = (_dense(M[m][:, m]) + Psi.T @ Msm + (Psi.T @ Msm).T
+              + Psi.T @ MssPsi)
+        self.Kc = (Kc + Kc.T)/2
+        self.Mc = (Mc + Mc.T)/2
+
+    def recovery_operator(self):
+        """Expansion from master DOFs to all DOFs as a `LinearOperator`
+
+        Returns
+        -------
+        R : `LinearOperator`
+            Shape ``(n, nm)``, such that ``u = R @ um``
+
+        """
+        n = self.m.shape[0] + self.s.shape[0]
+        nm = self.m.shape[0]
+        return LinearOperator((n, nm), matvec=self.recover,
+                matmat=self.recover, dtype=np.float64)
+
+    def recover(self, um):
+        """Expand master displacements to all DOFs
+
+        Parameters
+        ----------
+        um : (nm,) or (nm, nvec) array-like
+            Displacements at the master DOFs, e.g. condensed eigenvectors
+
+        Returns
+        -------
+        u : (n,) or (n, nvec) array-like
+            Displacements at all DOFs
+
+        """
+        um = np.asarray(um)
+        u = np.zeros((self.m.shape[0] + self.s.shape[0],) + um.shape[1:],
+                dtype=um.dtype)
+        u[self.m] = um
+        u[self.s] = self.Psi @ um
+        return u
@@ -0,0 +1,227 @@
+import numpy as np
+
+from .modal import modal_recurrence
+
+
+def _broadcast(*args, shape=()):
+    """Broadcast oscillator parameters and append a time axis"""
+    args = [np.asarray(a, dtype=float) for a in args]
+    shape = np.broadcast(np.empty(shape), *args).shape
+    if len(shape) == 0:
+        shape = (1,)
+    return [np.broadcast_to(a, shape)[..., None] for a in args]
+
+
+def _free(t, omegan, zeta, u0, v0):
+    """Free response for any damping, ``t`` along the last axis
+
+    Up to critical damping ``sin(omegad*t)/omegad`` is evaluated with
+    ``sinc`` to remain finite for ``omegad = 0``. Overdamped systems are the
+    sum of two decaying exponentials with the real roots ``-zeta*omegan +-
+    omegan*sqrt(zeta**2 - 1)``, which stay finite for long records
+
+    """
+    over = zeta > 1
+    # underdamped and critically damped
+    omegad = omegan*np.sqrt(np.maximum(1 - zeta**2, 0))
+    c = np.cos(omegad*t)
+    s = t*np.sinc(omegad*t/np.pi)
+    u = np.exp(-zeta*omegan*t)*(u0*c + (v0 + zeta*omegan*u0)*s)
+    if not np.any(over):
+        return u
+    # overdamped, s1 written to avoid cancellation for large zeta
+    zo = np.where(over, zeta, 2.)
+    sq = np.sqrt(zo**2 - 1)
+    s1 = -omegan/(zo + sq)
+    s2 = -omegan*(zo + sq)
+    uo = ((v0 - s2*u0)*np.exp(s1*t) + (s1*u0 - v0)*np.exp(s2*t))/(s1 - s2)
+    return np.where(over, uo, u)
+
+
+def free(t, m, k, zeta=0., u0=0., v0=0.):
+    r"""Free response of many single degree-of-freedom systems
+
+    Closed-form solution of ``m u'' + c u' + k u = 0``, with ``c =
+    2*zeta*sqrt(k*m)``, for undamped, underdamped, critically damped and
+    overdamped systems.
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Time vector
+    m, k : float or array-like
+        Masses and stiffnesses
+    zeta : float or array-like, optional
+        Damping ratios
+    u0, v0 : float or array-like, optional
+        Initial displacements and velocities
+
+    Returns
+    -------
+    u : (..., nt) array-like
+        Displacements, the leading dimensions are given by broadcasting all
+        parameters together, at least ``(1, nt)``
+
+    """
+    t = np.asarray(t, dtype=float)
+    m, k, zeta, u0, v0 = _broadcast(m, k, zeta, u0, v0)
+    return _free(t, np.sqrt(k/m), zeta, u0, v0)
+
+
+def harmonic(t, m, k, zeta, f0, omegaf, phase=0., u0=0., v0=0.):
+    r"""Response of many single degree-of-freedom systems to harmonic forces
+
+    Closed-form solution of ``m u'' + c u' + k u = f0*cos(omegaf*t -
+    phase)``, as the sum of the steady-state response and the free response
+    satisfying the initial conditions. A sine force is obtained with ``phase
+    = pi/2``. Undamped systems at resonance are not defined.
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Time vector
+    m, k, zeta : float or array-like
+        Masses, stiffnesses and damping ratios
+    f0, omegaf : float or array-like
+        Force amplitudes and excitation frequencies in rad/s
+    phase : float or array-like, optional
+        Phase angles of the forces
+    u0, v0 : float or array-like, optional
+        Initial displacements and velocities
+
+    Returns
+    -------
+    u : (..., nt) array-like
+        Displacements, the leading dimensions are given by broadcasting all
+        parameters together, at least ``(1, nt)``
+
+    """
+    t = np.asarray(t, dtype=float)
+    m, k, zeta, f0, omegaf, phase, u0, v0 = _broadcast(m, k, zeta, f0,
+            omegaf, phase, u0, v0)
+    omegan = np.sqrt(k/m)
+    r = omegaf/omegan
+    X = f0/k/np.sqrt((1 - r**2)**2 + (2*zeta*r)**2)
+    phi = phase + np.arctan2(2*zeta*r, 1 - r**2)
+    up = X*np.cos(omegaf*t - phi)
+    up0 = X*np.cos(phi)
+    vp0 = X*omegaf*np.sin(phi)
+    return up + _free(t, omegan, zeta, u0 - up0, v0 - vp0)
+
+
+def impulse(t, m, k, zeta, P0, tn, u0=0., v0=0.):
+    r"""Response of many single degree-of-freedom systems to an impulse
+
+    Closed-form solution for a force ``P0*delta(t - tn)``, i.e. the free
+    response plus the impulse response function ``P0*h(t - tn)``.
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Time vector
+    m, k, zeta : float or array-like
+        Masses, stiffnesses and damping ratios
+    P0, tn : float or array-like
+        Magnitudes and times of the impulses
+    u0, v0 : float or array-like, optional
+        Initial displacements and velocities
+
+    Returns
+    -------
+    u : (..., nt) array-like
+        Displacements, the leading dimensions are given by broadcasting all
+        parameters together, at least ``(1, nt)``
+
+    """
+    t = np.asarray(t, dtype=float)
+    m, k, zeta, P0, tn, u0, v0 = _broadcast(m, k, zeta, P0, tn, u0, v0)
+    omegan = np.sqrt(k/m)
+    tau = t - tn
+    h = _free(np.maximum(tau, 0), omegan, zeta, 0., P0/m)
+    return _free(t, omegan, zeta, u0, v0) + np.where(tau >= 0, h, 0.)
+
+
+def general(t, f, m, k, zeta=0., u0=0., v0=0.):
+    r"""Response of many single degree-of-freedom systems to general forces
+
+    The forces are taken as piecewise linear between the times in `t`, for
+    which the Nigam-Jennings recurrence is exact::
+
+        s[i+1] = A @ s[i] + C*f[i] + D*f[i+1],  s = [u, u']
+
+    The recurrence of each system is evaluated as a recursive filter with
+    :func:`.modal.modal_recurrence`, such that the time steps are integrated
+    in compiled code. When the force is shared by all systems, systems with
+    the same parameters are integrated only once.
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    f : (nt,) or (..., nt) array-like
+        Forces at each time in `t`, either shared by all systems or one
+        history per system
+    m, k : float or array-like
+        Masses and stiffnesses
+    zeta : float or array-like, optional
+        Damping ratios, must be smaller than 1
+    u0, v0 : float or array-like, optional
+        Initial displacements and velocities
+
+    Returns
+    -------
+    u : (..., nt) array-like
+        Displacements, the leading dimensions are given by broadcasting all
+        parameters and the leading dimensions of `f` together, at least
+        ``(1, nt)``
+
+    """
+    t = np.asarray(t, dtype=float)
+    nt = t.shape[0]
+    f = np.asarray(f, dtype=float)
+    if f.shape[-1:] != (nt,):
+        raise ValueError('f must have %d time steps along its last axis' % nt)
+    m, k, zeta, u0, v0 = _broadcast(m, k, zeta, u0, v0, shape=f.shape[:-1])
+    shape = m.shape[:-1]
+    params = np.column_stack([a.ravel() for a in (m, k, zeta, u0, v0)])
+    if f.ndim == 1:
+        params, inverse = np.unique(params, axis=0, return_inverse=True)
+        fm = f/params[:, 0:1]
+    else:
+        inverse = np.arange(params.shape[0])
+        fm = np.broadcast_to(f/m, shape + (nt,)).reshape(-1, nt)
+    m, k, zeta, u0, v0 = params.T
+    u, _ = modal_recurrence(fm, t, np.sqrt(k/m), zeta, u0, v0)
+    return u[inverse.ravel()].reshape(shape + (nt,))
+
+
+def response_spectrum(t, ag, omegan, zeta=0.05):
+    r"""Response spectra of a ground acceleration record
+
+    The relative displacements of oscillators with natural frequencies
+    `omegan` are computed at once with :func:`general`, for the force
+    ``-ag`` per unit mass.
+
+    Parameters
+    ----------
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    ag : (nt,) array-like
+        Ground acceleration
+    omegan : float or array-like
+        Natural frequencies in rad/s
+    zeta : float or array-like, optional
+        Damping ratios
+
+    Returns
+    -------
+    Sd, Sv, Sa : array-like
+        Spectral displacement ``max|u|``, pseudo-velocity ``omegan*Sd`` and
+        pseudo-acceleration ``omegan**2*Sd``
+
+    """
+    omegan = np.asarray(omegan, dtype=float)
+    u = general(t, -np.asarray(ag, dtype=float), 1., omegan**2, zeta)
+    Sd = np.abs(u).max(axis=-1)
+    omegan = np.broadcast_to(omegan, Sd.shape)
+    return Sd, omegan*Sd, omegan**2*Sd
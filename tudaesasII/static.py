@@ -0,0 +1,215 @@
+import weakref
+import warnings
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+from scipy.sparse.linalg import LinearOperator, splu
+
+from .precond import get_preconditioner
+
+try:
+    from sksparse.cholmod import cholesky as cholmod_cholesky
+except ImportError:
+    cholmod_cholesky = None
+
+
+_factor_cache = {}
+
+
+class _SPLUFactor(object):
+    __slots__ = ['lu']
+    def __init__(self, K):
+        self.lu = splu(K)
+
+    def solve(self, b):
+        return self.lu.solve(b)
+
+
+class _CholmodFactor(object):
+    __slots__ = ['factor']
+    def __init__(self, K):
+        self.factor = cholmod_cholesky(K)
+
+    def solve(self, b):
+        return self.factor(b)
+
+
+def sparse_factor(K, method=None):
+    """Factorize a sparse matrix, without caching
+
+    Parameters
+    ----------
+    K : array-like or sparse matrix
+        Matrix to be factorized
+    method : str or None, optional
+        Factorization method, see :func:`factorize`
+
+    Returns
+    -------
+    factor : object
+        Factorization, with a ``solve(b)`` method
+
+    """
+    K = csc_matrix(K)
+    if method is None:
+        method = 'cholmod' if cholmod_cholesky is not None else 'splu'
+    if method == 'cholmod':
+        if cholmod_cholesky is None:
+            raise ImportError('scikit-sparse is required for method "cholmod"')
+        return _CholmodFactor(K)
+    elif method == 'splu':
+        return _SPLUFactor(K)
+    else:
+        raise NotImplementedError('method "%s" not implemented' % method)
+
+
+def factorize(Kuu, key=None, method=None):
+    """Factorize a stiffness matrix, reusing a cached factorization
+
+    Parameters
+    ----------
+    Kuu : array-like or sparse matrix
+        Stiffness matrix corresponding to the unknown DOFs
+    key : hashable or None, optional
+        Identity of the model in the cache. When ``None`` the identity of the
+        `Kuu` object is used and the cached factor is released when `Kuu` is
+        garbage collected. Note that changing `Kuu` in-place does not
+        invalidate the cache, call :func:`clear_cache` in this case
+    method : str or None, optional
+        ``'cholmod'`` (sparse Cholesky from scikit-sparse) or ``'splu'``.
+        When ``None`` CHOLMOD is used if available
+
+    Returns
+    -------
+    factor : object
+        Factorization with a ``solve(b)`` method accepting 1-D or 2-D `b`
+
+    """
+    if key is None:
+        key = ('id', id(Kuu))
+        if key not in _factor_cache:
+            _factor_cache[key] = sparse_factor(Kuu, method)
+            weakref.finalize(Kuu, _factor_cache.pop, key, None)
+    elif key not in _factor_cache:
+        _factor_cache[key] = sparse_factor(Kuu, method)
+    return _factor_cache[key]
+
+
+def clear_cache(key=None):
+    """Remove factorizations from the cache
+
+    Parameters
+    ----------
+    key : hashable or None, optional
+        Key passed to :func:`factorize`. When ``None`` the whole cache is
+        cleared
+
+    """
+    if key is None:
+        _factor_cache.clear()
+    else:
+        _factor_cache.pop(key, None)
+
+
+def solve_static(Kuu, fu, key=None, method=None):
+    """Solve the static problem for one or many load cases
+
+    Parameters
+    ----------
+    Kuu : array-like or sparse matrix
+        Stiffness matrix corresponding to the unknown DOFs
+    fu : (n,) or (n, nloads) array-like
+        External forces at the unknown DOFs, one column per load case
+    key : hashable or None, optional
+        Identity of the model in the factorization cache, see
+        :func:`factorize`
+    method : str or None, optional
+        Factorization method, see :func:`factorize`
+
+    Returns
+    -------
+    uu : (n,) or (n, nloads) array-like
+        Displacements at the unknown DOFs
+
+    """
+    factor = factorize(Kuu, key=key, method=method)
+    return factor.solve(np.asarray(fu, dtype=float))
+
+
+def solve_static_cg(Kuu, fu, precond='jacobi', x0=None, rtol=1e-8,
+        maxiter=None, **kwargs):
+    """Solve the static problem with the preconditioned conjugate gradient
+
+    Only a few vectors of the size of `fu` are allocated, such that the memory
+    is bounded by the storage of `Kuu` and of the preconditioner. With a
+    matrix-free `Kuu` even the assembled stiffness matrix is not needed.
+
+    Parameters
+    ----------
+    Kuu : array-like, sparse matrix or `LinearOperator`
+        Stiffness matrix corresponding to the unknown DOFs. A matrix-free
+        `LinearOperator` computing element-by-element products can be used
+    fu : (n,) array-like
+        External forces at the unknown DOFs
+    precond : str, `LinearOperator` or None, optional
+        ``'jacobi'``, ``'block_jacobi'``, ``'ichol'``, ``'ilu'``, an
+        existing `LinearOperator` or ``None``, see
+        :func:`.precond.get_preconditioner`. The setup of ``'ichol'`` has a
+        Python loop over the DOFs, see :func:`.precond.ichol`
+    x0 : (n,) array-like or None, optional
+        Initial guess
+    rtol : float, optional
+        Tolerance for the residual norm relative to the norm of `fu`
+    maxiter : int or None, optional
+        Maximum number of iterations, by default ``10*n``
+    kwargs : dict
+        Extra arguments passed to the preconditioner function
+
+    Returns
+    -------
+    uu : (n,) array-like
+        Displacements at the unknown DOFs
+    history : array-like
+        Relative residual norm at each iteration, the first entry
+        corresponding to the initial guess
+
+    """
+    if not isinstance(Kuu, LinearOperator):
+        Kuu = csr_matrix(Kuu)
+    fu = np.asarray(fu, dtype=float)
+    n = fu.shape[0]
+    if maxiter is None:
+        maxiter = 10*n
+    P = get_preconditioner(Kuu, precond, **kwargs)
+
+    fnorm = np.linalg.norm(fu)
+    if fnorm == 0:
+        return np.zeros_like(fu), np.zeros(1)
+    if x0 is None:
+        x = np.zeros_like(fu)
+        r = fu.copy()
+    else:
+        x = np.array(x0, dtype=float)
+        r = fu - Kuu @ x
+    history = [np.linalg.norm(r)/fnorm]
+    z = r if P is None else P @ r
+    p = z.copy()
+    rz = r @ z
+    for i in range(maxiter):
+        if history[-1] <= rtol:
+            break
+        Kp = Kuu @ p
+        alpha = rz/(p @ Kp)
+        x += alpha*p
+        r -= alpha*Kp
+        history.append(np.linalg.norm(r)/fnorm)
+        z = r if P is None else P @ r
+        rz_new = r @ z
+        p *= rz_new/rz
+        p += z
+        rz = rz_new
+    else:
+        if history[-1] > rtol:
+            warnings.warn('CG did not converge after %d iterations, relative residual %1.3e'
+                    % (maxiter, history[-1]))
+    return x, np.asarray(history)
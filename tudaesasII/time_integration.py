@@ -0,0 +1,274 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .modal import time_step
+from .static import sparse_factor
+
+
+def _at(x, i, ti):
+    """Value of a time-dependent quantity at step `i` and time `ti`"""
+    if x is None:
+        return None
+    if callable(x):
+        return np.asarray(x(ti), dtype=float)
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 2:
+        return x[:, i]
+    return x
+
+
+def _prescribed_force(Kuk, Cuk, Muk, uk, vk, ak, i, ti):
+    """Forces at the unknown DOFs due to the motion of the known DOFs"""
+    f = 0.
+    for A, x in ((Kuk, uk), (Cuk, vk), (Muk, ak)):
+        if A is not None and x is not None:
+            f = f - A @ _at(x, i, ti)
+    return f
+
+
+def newmark(Kuu, Muu, fu, t, Cuu=None, rayleigh=None, u0=None, v0=None,
+        alpha=0., beta=None, gamma=None, Kuk=None, Cuk=None, Muk=None,
+        uk=None, vk=None, ak=None, save_dofs=None, save_every=1, output=None,
+        method=None):
+    r"""Implicit direct time integration with Newmark-beta or HHT-alpha
+
+    Solves ``Muu a + Cuu v + Kuu u = fu - Muk ak - Cuk vk - Kuk uk`` stepping
+    in time. The effective stiffness is factorized once for the constant time
+    step and reused at every step, such that the cost per step is one sparse
+    forward/backward substitution and a few sparse matrix-vector products.
+
+    With the default parameters (``alpha=0``) the unconditionally stable
+    average acceleration method (``beta=1/4``, ``gamma=1/2``) is used. With
+    ``-1/3 <= alpha < 0`` the HHT-alpha method is used, with ``gamma =
+    (1 - 2*alpha)/2`` and ``beta = (1 - alpha)**2/4``, adding numerical
+    damping to the high-frequency modes.
+
+    Parameters
+    ----------
+    Kuu, Muu : array-like or sparse matrix
+        Stiffness and mass matrices corresponding to the unknown DOFs
+    fu : (n, nt) array-like, (n,) array-like or callable
+        External forces at the unknown DOFs. A callable ``fu(t)`` returning a
+        ``(n,)`` array avoids storing the whole load history
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    Cuu : array-like, sparse matrix or None, optional
+        Damping matrix
+    rayleigh : tuple or None, optional
+        Rayleigh damping coefficients ``(a0, a1)``, such that ``Cuu = a0*Muu +
+        a1*Kuu``. Only used if `Cuu` is ``None``
+    u0, v0 : (n,) array-like or None, optional
+        Initial displacements and velocities, zero by default
+    alpha : float, optional
+        HHT-alpha parameter, ``-1/3 <= alpha <= 0``
+    beta, gamma : float or None, optional
+        Newmark parameters, by default calculated from `alpha`
+    Kuk, Cuk, Muk : array-like, sparse matrix or None, optional
+        Coupling matrices between unknown and known DOFs
+    uk, vk, ak : (nk, nt) array-like, (nk,) array-like, callable or None, optional
+        Prescribed displacements, velocities and accelerations at the known
+        DOFs, for instance a base acceleration ``ak`` used with `Muk`
+    save_dofs : array-like or None, optional
+        Indices of the unknown DOFs to be saved, by default all
+    save_every : int, optional
+        Save every `save_every` time steps
+    output : callable or None, optional
+        Function ``output(i, ti, u, v, a)`` called at each saved step with
+        the saved DOFs, for instance to stream the results to disk. When
+        given, nothing is kept in memory
+    method : str or None, optional
+        Factorization method, see :func:`.static.factorize`
+
+    Returns
+    -------
+    u, v, a : (nsave, nsaved_steps) array-like or None
+        Displacements, velocities and accelerations at the saved DOFs and
+        time steps, ``None`` when `output` is given
+
+    """
+    t = np.asarray(t)
+    dt = time_step(t)
+    nt = t.shape[0]
+    if not -1/3 - 1e-12 <= alpha <= 0:
+        raise ValueError('HHT parameter "alpha" must be in the interval [-1/3, 0]')
+    if gamma is None:
+        gamma = (1 - 2*alpha)/2
+    if beta is None:
+        beta = (1 - alpha)**2/4
+
+    Kuu = csr_matrix(Kuu)
+    Muu = csr_matrix(Muu)
+    if Cuu is None and rayleigh is not None:
+        Cuu = rayleigh[0]*Muu + rayleigh[1]*Kuu
+    if Cuu is not None:
+        Cuu = csr_matrix(Cuu)
+    n = Kuu.shape[0]
+
+    def force(i):
+        f = np.zeros(n)
+        fi = _at(fu, i, t[i])
+        if fi is not None:
+            f += fi
+        return f + _prescribed_force(Kuk, Cuk, Muk, uk, vk, ak, i, t[i])
+
+    u = np.zeros(n) if u0 is None else np.array(u0, dtype=float)
+    v = np.zeros(n) if v0 is None else np.array(v0, dtype=float)
+
+    # initial acceleration from the equation of motion
+    f = force(0)
+    r = f - Kuu @ u
+    if Cuu is not None:
+        r -= Cuu @ v
+    a = sparse_factor(Muu, method).solve(r)
+
+    c0 = 1/(beta*dt**2)
+    c1 = gamma/(beta*dt)
+    Keff = c0*Muu + (1 + alpha)*Kuu
+    if Cuu is not None:
+        Keff = Keff + (1 + alpha)*c1*Cuu
+    factor = sparse_factor(Keff, method)
+
+    if save_dofs is None:
+        save_dofs = slice(None)
+    saved = range(0, nt, save_every)
+    if output is None:
+        nsave = u[save_dofs].shape[0]
+        uout = np.zeros((nsave, len(saved)))
+        vout = np.zeros((nsave, len(saved)))
+        aout = np.zeros((nsave, len(saved)))
+        def output(i, ti, ui, vi, ai):
+            j = i//save_every
+            uout[:, j] = ui
+            vout[:, j] = vi
+            aout[:, j] = ai
+        store = True
+    else:
+        store = False
+    output(0, t[0], u[save_dofs], v[save_dofs], a[save_dofs])
+
+    for i in range(1, nt):
+        fnew = force(i)
+        # predictors
+        upred = u + dt*v + dt**2*(0.5 - beta)*a
+        vpred = v + dt*(1 - gamma)*a
+        rhs = (1 + alpha)*fnew - alpha*f + alpha*(Kuu @ u) + Muu @ (c0*upred)
+        if Cuu is not None:
+            rhs += Cuu @ (alpha*v + (1 + alpha)*(c1*upred - vpred))
+        unew = factor.solve(rhs)
+        a = c0*(unew - upred)
+        v = vpred + gamma*dt*a
+        u = unew
+        f = fnew
+        if i % save_every == 0:
+            output(i, t[i], u[save_dofs], v[save_dofs], a[save_dofs])
+
+    if store:
+        return uout, vout, aout
+    return None
+
+
+def central_difference(Kuu, mdiag, fu, t, u0=None, v0=None, a0=0.,
+        save_dofs=None, save_every=1, output=None):
+    r"""Explicit direct time integration with the central difference method
+
+    The internal forces are computed as ``Kuu @ u``, such that with a
+    matrix-free `Kuu`, for instance a :class:`.matrixfree.ElementOperator`,
+    the cost per time step is proportional to the number of elements and no
+    linear system is solved. The velocities are advanced at the middle of
+    each time step::
+
+        v[n+1/2] = v[n-1/2] + dt*a[n]
+        u[n+1] = u[n] + dt*v[n+1/2]
+
+    The method is conditionally stable, the time step must be smaller than
+    the critical time step, see :func:`.matrixfree.critical_time_step`.
+
+    Parameters
+    ----------
+    Kuu : array-like, sparse matrix or `LinearOperator`
+        Stiffness corresponding to the unknown DOFs
+    mdiag : (n,) array-like
+        Diagonal lumped mass corresponding to the unknown DOFs, see
+        :func:`.matrixfree.lumped_mass_diagonal`
+    fu : (n, nt) array-like, (n,) array-like, callable or None
+        External forces at the unknown DOFs, see :func:`newmark`
+    t : (nt,) array-like
+        Uniformly spaced time vector
+    u0, v0 : (n,) array-like or None, optional
+        Initial displacements and velocities, zero by default
+    a0 : float, optional
+        Mass-proportional damping coefficient, such that the damping matrix
+        ``a0*M`` remains diagonal
+    save_dofs : array-like or None, optional
+        Indices of the unknown DOFs to be saved, by default all
+    save_every : int, optional
+        Save every `save_every` time steps
+    output : callable or None, optional
+        Function ``output(i, ti, u, v, a)`` called at each saved step, see
+        :func:`newmark`
+
+    Returns
+    -------
+    u, v, a : (nsave, nsaved_steps) array-like or None
+        Displacements, velocities and accelerations at the saved DOFs and
+        time steps, ``None`` when `output` is given
+
+    """
+    t = np.asarray(t)
+    dt = time_step(t)
+    nt = t.shape[0]
+    mdiag = np.asarray(mdiag, dtype=float)
+    if np.any(mdiag <= 0):
+        raise ValueError('all unknown DOFs must have a positive lumped mass')
+    minv = 1/mdiag
+    n = mdiag.shape[0]
+
+    def accel(i, u, v):
+        f = -(Kuu @ u)
+        fi = _at(fu, i, t[i])
+        if fi is not None:
+            f += fi
+        return minv*f - a0*v
+
+    u = np.zeros(n) if u0 is None else np.array(u0, dtype=float)
+    v = np.zeros(n) if v0 is None else np.array(v0, dtype=float)
+    a = accel(0, u, v)
+
+    if save_dofs is None:
+        save_dofs = slice(None)
+    saved = range(0, nt, save_every)
+    if output is None:
+        nsave = u[save_dofs].shape[0]
+        uout = np.zeros((nsave, len(saved)))
+        vout = np.zeros((nsave, len(saved)))
+        aout = np.zeros((nsave, len(saved)))
+        def output(i, ti, ui, vi, ai):
+            j = i//save_every
+            uout[:, j] = ui
+            vout[:, j] = vi
+            aout[:, j] = ai
+        store = True
+    else:
+        store = False
+    output(0, t[0], u[save_dofs], v[save_dofs], a[save_dofs])
+
+    # velocity at the middle of the first step
+    vhalf = v + dt/2*a
+    c = a0*dt/2
+    for i in range(1, nt):
+        u = u + dt*vhalf
+        fint = -(Kuu @ u)
+        fi = _at(fu, i, t[i])
+        if fi is not None:
+            fint += fi
+        vhalf_new = ((1 - c)*vhalf + dt*minv*fint)/(1 + c)
+        if i % save_every == 0:
+            # velocity and acceleration at t[i], consistent with damping
+            v = (vhalf + vhalf_new)/2
+            a = (vhalf_new - vhalf)/dt
+            output(i, t[i], u[save_dofs], v[save_dofs], a[save_dofs])
+        vhalf = vhalf_new
+
+    if store:
+        return uout, vout, aout
+    return None
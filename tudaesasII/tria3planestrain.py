@@ -1,19 +1,28 @@
 import numpy as np
 
+from .tria3planestress import B_operator, strains
+
 DOF = 2
 
 class Tria3PlaneStrainIso(object):
-    __slots__ = ['n1', 'n2', 'n3', 'E', 'nu', 'A', 'h', 'rho']
+    """Constant strain triangle, plane strain
+
+    The constant derivatives of the shape functions are cached in `dNdx` by
+    :func:`update_K_M`, to be reused by :func:`B_operator`.
+
+    """
+    __slots__ = ['n1', 'n2', 'n3', 'E', 'nu', 'A', 'h', 'rho', 'dNdx']
     def __init__(self):
         self.n1 = None
         self.n2 = None
         self.n3 = None
+        self.dNdx = None
         # Material Lastrobe Lescalloy
         self.E = None
         self.nu = None
         self.rho = None
 
-def update_K_M(tria, nid_pos, ncoords, K, M):
+def update_K_M(tria, nid_pos, ncoords, K, M, lumped=False):
     """Update a global stiffness matrix K and mass matrix M
 
     Properties
@@ -27,7 +36,10 @@ def update_K_M(tria, nid_pos, ncoords, K, M):
     K : np.array
         Global stiffness matrix updated in-place
     M : np.array
-        Global mass matrix updated in-place
+        Global mass matrix updated in-place (affected by parameter `lumped`)
+    lumped : bool
+        If lumped mass matrix should be used
+
     """
     pos1 = nid_pos[tria.n1]
     pos2 = nid_pos[tria.n2]
@@ -42,6 +54,10 @@ def update_K_M(tria, nid_pos, ncoords, K, M):
     N1y = (-x2 + x3)/(2*A)
     N2y = (x1 - x3)/(2*A)
     N3y = (-x1 + x2)/(2*A)
+    # sign of the node ordering, such that the recovered strains are also
+    # correct for clockwise elements
+    sign = np.sign(x1*(y2 - y3) + x2*(y3 - y1) + x3*(y1 - y2))
+    tria.dNdx = sign*np.array([[N1x, N2x, N3x], [N1y, N2y, N3y]])
 
     tria.A = A
     E = tria.E
@@ -54,44 +70,44 @@ def update_K_M(tria, nid_pos, ncoords, K, M):
     c2 = DOF*pos2
     c3 = DOF*pos3
 
-    K[0+c1, 0+c1] += A*E*h*(N1x**2*nu - N1x**2 + 2*N1y**2*nu - N1y**2)/(2*nu**2 + nu - 1)
-    K[0+c1, 1+c1] += A*E*N1x*N1y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[0+c1, 0+c2] += A*E*h*(N1x*N2x*nu - N1x*N2x + 2*N1y*N2y*nu - N1y*N2y)/(2*nu**2 + nu - 1)
-    K[0+c1, 1+c2] += A*E*h*(-N1x*N2y*nu + 2*N1y*N2x*nu - N1y*N2x)/(2*nu**2 + nu - 1)
-    K[0+c1, 0+c3] += A*E*h*(N1x*N3x*nu - N1x*N3x + 2*N1y*N3y*nu - N1y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c1, 1+c3] += A*E*h*(-N1x*N3y*nu + 2*N1y*N3x*nu - N1y*N3x)/(2*nu**2 + nu - 1)
-    K[1+c1, 0+c1] += A*E*N1x*N1y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[1+c1, 1+c1] += A*E*h*(2*N1x**2*nu - N1x**2 + N1y**2*nu - N1y**2)/(2*nu**2 + nu - 1)
-    K[1+c1, 0+c2] += A*E*h*(2*N1x*N2y*nu - N1x*N2y - N1y*N2x*nu)/(2*nu**2 + nu - 1)
-    K[1+c1, 1+c2] += A*E*h*(2*N1x*N2x*nu - N1x*N2x + N1y*N2y*nu - N1y*N2y)/(2*nu**2 + nu - 1)
-    K[1+c1, 0+c3] += A*E*h*(2*N1x*N3y*nu - N1x*N3y - N1y*N3x*nu)/(2*nu**2 + nu - 1)
-    K[1+c1, 1+c3] += A*E*h*(2*N1x*N3x*nu - N1x*N3x + N1y*N3y*nu - N1y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c2, 0+c1] += A*E*h*(N1x*N2x*nu - N1x*N2x + 2*N1y*N2y*nu - N1y*N2y)/(2*nu**2 + nu - 1)
-    K[0+c2, 1+c1] += A*E*h*(2*N1x*N2y*nu - N1x*N2y - N1y*N2x*nu)/(2*nu**2 + nu - 1)
-    K[0+c2, 0+c2] += A*E*h*(N2x**2*nu - N2x**2 + 2*N2y**2*nu - N2y**2)/(2*nu**2 + nu - 1)
-    K[0+c2, 1+c2] += A*E*N2x*N2y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[0+c2, 0+c3] += A*E*h*(N2x*N3x*nu - N2x*N3x + 2*N2y*N3y*nu - N2y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c2, 1+c3] += A*E*h*(-N2x*N3y*nu + 2*N2y*N3x*nu - N2y*N3x)/(2*nu**2 + nu - 1)
-    K[1+c2, 0+c1] += A*E*h*(-N1x*N2y*nu + 2*N1y*N2x*nu - N1y*N2x)/(2*nu**2 + nu - 1)
-    K[1+c2, 1+c1] += A*E*h*(2*N1x*N2x*nu - N1x*N2x + N1y*N2y*nu - N1y*N2y)/(2*nu**2 + nu - 1)
-    K[1+c2, 0+c2] += A*E*N2x*N2y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[1+c2, 1+c2] += A*E*h*(2*N2x**2*nu - N2x**2 + N2y**2*nu - N2y**2)/(2*nu**2 + nu - 1)
-    K[1+c2, 0+c3] += A*E*h*(2*N2x*N3y*nu - N2x*N3y - N2y*N3x*nu)/(2*nu**2 + nu - 1)
-    K[1+c2, 1+c3] += A*E*h*(2*N2x*N3x*nu - N2x*N3x + N2y*N3y*nu - N2y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c3, 0+c1] += A*E*h*(N1x*N3x*nu - N1x*N3x + 2*N1y*N3y*nu - N1y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c3, 1+c1] += A*E*h*(2*N1x*N3y*nu - N1x*N3y - N1y*N3x*nu)/(2*nu**2 + nu - 1)
-    K[0+c3, 0+c2] += A*E*h*(N2x*N3x*nu - N2x*N3x + 2*N2y*N3y*nu - N2y*N3y)/(2*nu**2 + nu - 1)
-    K[0+c3, 1+c2] += A*E*h*(2*N2x*N3y*nu - N2x*N3y - N2y*N3x*nu)/(2*nu**2 + nu - 1)
-    K[0+c3, 0+c3] += A*E*h*(N3x**2*nu - N3x**2 + 2*N3y**2*nu - N3y**2)/(2*nu**2 + nu - 1)
-    K[0+c3, 1+c3] += A*E*N3x*N3y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[1+c3, 0+c1] += A*E*h*(-N1x*N3y*nu + 2*N1y*N3x*nu - N1y*N3x)/(2*nu**2 + nu - 1)
-    K[1+c3, 1+c1] += A*E*h*(2*N1x*N3x*nu - N1x*N3x + N1y*N3y*nu - N1y*N3y)/(2*nu**2 + nu - 1)
-    K[1+c3, 0+c2] += A*E*h*(-N2x*N3y*nu + 2*N2y*N3x*nu - N2y*N3x)/(2*nu**2 + nu - 1)
-    K[1+c3, 1+c2] += A*E*h*(2*N2x*N3x*nu - N2x*N3x + N2y*N3y*nu - N2y*N3y)/(2*nu**2 + nu - 1)
-    K[1+c3, 0+c3] += A*E*N3x*N3y*h*(nu - 1)/(2*nu**2 + nu - 1)
-    K[1+c3, 1+c3] += A*E*h*(2*N3x**2*nu - N3x**2 + N3y**2*nu - N3y**2)/(2*nu**2 + nu - 1)
-
-    if tria.lumped:
+    K[0+c1, 0+c1] += A*E*h*(2*N1x**2*nu - 2*N1x**2 + 2*N1y**2*nu - N1y**2)/(2*(2*nu**2 + nu - 1))
+    K[0+c1, 1+c1] += -A*E*N1x*N1y*h/(4*nu**2 + 2*nu - 2)
+    K[0+c1, 0+c2] += A*E*h*(2*N1x*N2x*nu - 2*N1x*N2x + 2*N1y*N2y*nu - N1y*N2y)/(2*(2*nu**2 + nu - 1))
+    K[0+c1, 1+c2] += A*E*h*(-2*N1x*N2y*nu + 2*N1y*N2x*nu - N1y*N2x)/(2*(2*nu**2 + nu - 1))
+    K[0+c1, 0+c3] += A*E*h*(2*N1x*N3x*nu - 2*N1x*N3x + 2*N1y*N3y*nu - N1y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c1, 1+c3] += A*E*h*(-2*N1x*N3y*nu + 2*N1y*N3x*nu - N1y*N3x)/(2*(2*nu**2 + nu - 1))
+    K[1+c1, 0+c1] += -A*E*N1x*N1y*h/(4*nu**2 + 2*nu - 2)
+    K[1+c1, 1+c1] += A*E*h*(2*N1x**2*nu - N1x**2 + 2*N1y**2*nu - 2*N1y**2)/(2*(2*nu**2 + nu - 1))
+    K[1+c1, 0+c2] += A*E*h*(2*N1x*N2y*nu - N1x*N2y - 2*N1y*N2x*nu)/(2*(2*nu**2 + nu - 1))
+    K[1+c1, 1+c2] += A*E*h*(2*N1x*N2x*nu - N1x*N2x + 2*N1y*N2y*nu - 2*N1y*N2y)/(2*(2*nu**2 + nu - 1))
+    K[1+c1, 0+c3] += A*E*h*(2*N1x*N3y*nu - N1x*N3y - 2*N1y*N3x*nu)/(2*(2*nu**2 + nu - 1))
+    K[1+c1, 1+c3] += A*E*h*(2*N1x*N3x*nu - N1x*N3x + 2*N1y*N3y*nu - 2*N1y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c2, 0+c1] += A*E*h*(2*N1x*N2x*nu - 2*N1x*N2x + 2*N1y*N2y*nu - N1y*N2y)/(2*(2*nu**2 + nu - 1))
+    K[0+c2, 1+c1] += A*E*h*(2*N1x*N2y*nu - N1x*N2y - 2*N1y*N2x*nu)/(2*(2*nu**2 + nu - 1))
+    K[0+c2, 0+c2] += A*E*h*(2*N2x**2*nu - 2*N2x**2 + 2*N2y**2*nu - N2y**2)/(2*(2*nu**2 + nu - 1))
+    K[0+c2, 1+c2] += -A*E*N2x*N2y*h/(4*nu**2 + 2*nu - 2)
+    K[0+c2, 0+c3] += A*E*h*(2*N2x*N3x*nu - 2*N2x*N3x + 2*N2y*N3y*nu - N2y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c2, 1+c3] += A*E*h*(-2*N2x*N3y*nu + 2*N2y*N3x*nu - N2y*N3x)/(2*(2*nu**2 + nu - 1))
+    K[1+c2, 0+c1] += A*E*h*(-2*N1x*N2y*nu + 2*N1y*N2x*nu - N1y*N2x)/(2*(2*nu**2 + nu - 1))
+    K[1+c2, 1+c1] += A*E*h*(2*N1x*N2x*nu - N1x*N2x + 2*N1y*N2y*nu - 2*N1y*N2y)/(2*(2*nu**2 + nu - 1))
+    K[1+c2, 0+c2] += -A*E*N2x*N2y*h/(4*nu**2 + 2*nu - 2)
+    K[1+c2, 1+c2] += A*E*h*(2*N2x**2*nu - N2x**2 + 2*N2y**2*nu - 2*N2y**2)/(2*(2*nu**2 + nu - 1))
+    K[1+c2, 0+c3] += A*E*h*(2*N2x*N3y*nu - N2x*N3y - 2*N2y*N3x*nu)/(2*(2*nu**2 + nu - 1))
+    K[1+c2, 1+c3] += A*E*h*(2*N2x*N3x*nu - N2x*N3x + 2*N2y*N3y*nu - 2*N2y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 0+c1] += A*E*h*(2*N1x*N3x*nu - 2*N1x*N3x + 2*N1y*N3y*nu - N1y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 1+c1] += A*E*h*(2*N1x*N3y*nu - N1x*N3y - 2*N1y*N3x*nu)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 0+c2] += A*E*h*(2*N2x*N3x*nu - 2*N2x*N3x + 2*N2y*N3y*nu - N2y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 1+c2] += A*E*h*(2*N2x*N3y*nu - N2x*N3y - 2*N2y*N3x*nu)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 0+c3] += A*E*h*(2*N3x**2*nu - 2*N3x**2 + 2*N3y**2*nu - N3y**2)/(2*(2*nu**2 + nu - 1))
+    K[0+c3, 1+c3] += -A*E*N3x*N3y*h/(4*nu**2 + 2*nu - 2)
+    K[1+c3, 0+c1] += A*E*h*(-2*N1x*N3y*nu + 2*N1y*N3x*nu - N1y*N3x)/(2*(2*nu**2 + nu - 1))
+    K[1+c3, 1+c1] += A*E*h*(2*N1x*N3x*nu - N1x*N3x + 2*N1y*N3y*nu - 2*N1y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[1+c3, 0+c2] += A*E*h*(-2*N2x*N3y*nu + 2*N2y*N3x*nu - N2y*N3x)/(2*(2*nu**2 + nu - 1))
+    K[1+c3, 1+c2] += A*E*h*(2*N2x*N3x*nu - N2x*N3x + 2*N2y*N3y*nu - 2*N2y*N3y)/(2*(2*nu**2 + nu - 1))
+    K[1+c3, 0+c3] += -A*E*N3x*N3y*h/(4*nu**2 + 2*nu - 2)
+    K[1+c3, 1+c3] += A*E*h*(2*N3x**2*nu - N3x**2 + 2*N3y**2*nu - 2*N3y**2)/(2*(2*nu**2 + nu - 1))
+
+    if lumped:
         M[0+c1, 0+c1] += A*h*rho/3
         M[1+c1, 1+c1] += A*h*rho/3
         M[0+c2, 0+c2] += A*h*rho/3
@@ -117,3 +133,54 @@ def update_K_M(tria, nid_pos, ncoords, K, M):
         M[1+c3, 1+c1] += A*h*rho/12
         M[1+c3, 1+c2] += A*h*rho/12
         M[1+c3, 1+c3] += A*h*rho/6
+
+
+def stresses(trias, eps):
+    """Plane strain stresses of all elements at once
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3PlaneStrainIso` objects
+    eps : (nelem, 3) or (nelem, 3, nvec) array-like
+        Strains, see :func:`.tria3planestress.strains`
+
+    Returns
+    -------
+    sigma : (nelem, 3) or (nelem, 3, nvec) array-like
+        ``sxx, syy, txy`` of each element, with ``szz = nu*(sxx + syy)``
+
+    """
+    eps = np.asarray(eps)
+    shape = (-1,) + (1,)*(eps.ndim - 2)
+    E = np.array([tria.E for tria in trias], dtype=float).reshape(shape)
+    nu = np.array([tria.nu for tria in trias], dtype=float).reshape(shape)
+    exx, eyy, gxy = eps[:, 0], eps[:, 1], eps[:, 2]
+    c = E/((1 + nu)*(1 - 2*nu))
+    return np.stack([c*((1 - nu)*exx + nu*eyy), c*(nu*exx + (1 - nu)*eyy),
+        c*(1 - 2*nu)/2*gxy], axis=1)
+
+
+def von_mises(trias, sigma):
+    """Von Mises stress of all elements at once, including ``szz``
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3PlaneStrainIso` objects
+    sigma : (nelem, 3) or (nelem, 3, nvec) array-like
+        Stresses, see :func:`stresses`
+
+    Returns
+    -------
+    svm : (nelem,) or (nelem, nvec) array-like
+        Von Mises stress of each element
+
+    """
+    sigma = np.asarray(sigma)
+    shape = (-1,) + (1,)*(sigma.ndim - 2)
+    nu = np.array([tria.nu for tria in trias], dtype=float).reshape(shape)
+    sxx, syy, txy = sigma[:, 0], sigma[:, 1], sigma[:, 2]
+    szz = nu*(sxx + syy)
+    return np.sqrt(((sxx - syy)**2 + (syy - szz)**2 + (szz - sxx)**2)/2
+            + 3*txy**2)
@@ -1,13 +1,21 @@
 import numpy as np
+from scipy.sparse import coo_matrix
 
 DOF = 2
 
 class Tria3PlaneStressIso(object):
-    __slots__ = ['n1', 'n2', 'n3', 'E', 'nu', 'A', 'h', 'rho']
+    """Constant strain triangle, plane stress
+
+    The constant derivatives of the shape functions are cached in `dNdx` by
+    :func:`update_K_M`, to be reused by :func:`B_operator`.
+
+    """
+    __slots__ = ['n1', 'n2', 'n3', 'E', 'nu', 'A', 'h', 'rho', 'dNdx']
     def __init__(self):
         self.n1 = None
         self.n2 = None
         self.n3 = None
+        self.dNdx = None
         # Material Lastrobe Lescalloy
         self.E = None
         self.nu = None
@@ -46,6 +54,10 @@ def update_K_M(tria, nid_pos, ncoords, K, M, lumped=False):
     N1y = (-x2 + x3)/(2*A)
     N2y = (x1 - x3)/(2*A)
     N3y = (-x1 + x2)/(2*A)
+    # sign of the node ordering, such that the recovered strains are also
+    # correct for clockwise elements
+    sign = np.sign(x1*(y2 - y3) + x2*(y3 - y1) + x3*(y1 - y2))
+    tria.dNdx = sign*np.array([[N1x, N2x, N3x], [N1y, N2y, N3y]])
 
     tria.A = A
     E = tria.E
@@ -58,42 +70,42 @@ def update_K_M(tria, nid_pos, ncoords, K, M, lumped=False):
     c2 = DOF*pos2
     c3 = DOF*pos3
 
-    K[0+c1, 0+c1] += A*E*h*(-N1x**2 + N1y**2*nu - N1y**2)/(nu**2 - 1)
-    K[0+c1, 1+c1] += -A*E*N1x*N1y*h/(nu**2 - 1)
-    K[0+c1, 0+c2] += A*E*h*(-N1x*N2x + N1y*N2y*nu - N1y*N2y)/(nu**2 - 1)
-    K[0+c1, 1+c2] += A*E*h*(-N1x*N2y*nu + N1y*N2x*nu - N1y*N2x)/(nu**2 - 1)
-    K[0+c1, 0+c3] += A*E*h*(-N1x*N3x + N1y*N3y*nu - N1y*N3y)/(nu**2 - 1)
-    K[0+c1, 1+c3] += A*E*h*(-N1x*N3y*nu + N1y*N3x*nu - N1y*N3x)/(nu**2 - 1)
-    K[1+c1, 0+c1] += -A*E*N1x*N1y*h/(nu**2 - 1)
-    K[1+c1, 1+c1] += A*E*h*(N1x**2*nu - N1x**2 - N1y**2)/(nu**2 - 1)
-    K[1+c1, 0+c2] += A*E*h*(N1x*N2y*nu - N1x*N2y - N1y*N2x*nu)/(nu**2 - 1)
-    K[1+c1, 1+c2] += A*E*h*(N1x*N2x*nu - N1x*N2x - N1y*N2y)/(nu**2 - 1)
-    K[1+c1, 0+c3] += A*E*h*(N1x*N3y*nu - N1x*N3y - N1y*N3x*nu)/(nu**2 - 1)
-    K[1+c1, 1+c3] += A*E*h*(N1x*N3x*nu - N1x*N3x - N1y*N3y)/(nu**2 - 1)
-    K[0+c2, 0+c1] += A*E*h*(-N1x*N2x + N1y*N2y*nu - N1y*N2y)/(nu**2 - 1)
-    K[0+c2, 1+c1] += A*E*h*(N1x*N2y*nu - N1x*N2y - N1y*N2x*nu)/(nu**2 - 1)
-    K[0+c2, 0+c2] += A*E*h*(-N2x**2 + N2y**2*nu - N2y**2)/(nu**2 - 1)
-    K[0+c2, 1+c2] += -A*E*N2x*N2y*h/(nu**2 - 1)
-    K[0+c2, 0+c3] += A*E*h*(-N2x*N3x + N2y*N3y*nu - N2y*N3y)/(nu**2 - 1)
-    K[0+c2, 1+c3] += A*E*h*(-N2x*N3y*nu + N2y*N3x*nu - N2y*N3x)/(nu**2 - 1)
-    K[1+c2, 0+c1] += A*E*h*(-N1x*N2y*nu + N1y*N2x*nu - N1y*N2x)/(nu**2 - 1)
-    K[1+c2, 1+c1] += A*E*h*(N1x*N2x*nu - N1x*N2x - N1y*N2y)/(nu**2 - 1)
-    K[1+c2, 0+c2] += -A*E*N2x*N2y*h/(nu**2 - 1)
-    K[1+c2, 1+c2] += A*E*h*(N2x**2*nu - N2x**2 - N2y**2)/(nu**2 - 1)
-    K[1+c2, 0+c3] += A*E*h*(N2x*N3y*nu - N2x*N3y - N2y*N3x*nu)/(nu**2 - 1)
-    K[1+c2, 1+c3] += A*E*h*(N2x*N3x*nu - N2x*N3x - N2y*N3y)/(nu**2 - 1)
-    K[0+c3, 0+c1] += A*E*h*(-N1x*N3x + N1y*N3y*nu - N1y*N3y)/(nu**2 - 1)
-    K[0+c3, 1+c1] += A*E*h*(N1x*N3y*nu - N1x*N3y - N1y*N3x*nu)/(nu**2 - 1)
-    K[0+c3, 0+c2] += A*E*h*(-N2x*N3x + N2y*N3y*nu - N2y*N3y)/(nu**2 - 1)
-    K[0+c3, 1+c2] += A*E*h*(N2x*N3y*nu - N2x*N3y - N2y*N3x*nu)/(nu**2 - 1)
-    K[0+c3, 0+c3] += A*E*h*(-N3x**2 + N3y**2*nu - N3y**2)/(nu**2 - 1)
-    K[0+c3, 1+c3] += -A*E*N3x*N3y*h/(nu**2 - 1)
-    K[1+c3, 0+c1] += A*E*h*(-N1x*N3y*nu + N1y*N3x*nu - N1y*N3x)/(nu**2 - 1)
-    K[1+c3, 1+c1] += A*E*h*(N1x*N3x*nu - N1x*N3x - N1y*N3y)/(nu**2 - 1)
-    K[1+c3, 0+c2] += A*E*h*(-N2x*N3y*nu + N2y*N3x*nu - N2y*N3x)/(nu**2 - 1)
-    K[1+c3, 1+c2] += A*E*h*(N2x*N3x*nu - N2x*N3x - N2y*N3y)/(nu**2 - 1)
-    K[1+c3, 0+c3] += -A*E*N3x*N3y*h/(nu**2 - 1)
-    K[1+c3, 1+c3] += A*E*h*(N3x**2*nu - N3x**2 - N3y**2)/(nu**2 - 1)
+    K[0+c1, 0+c1] += A*E*h*(-2*N1x**2 + N1y**2*nu - N1y**2)/(2*(nu**2 - 1))
+    K[0+c1, 1+c1] += -A*E*N1x*N1y*h/(2*nu - 2)
+    K[0+c1, 0+c2] += A*E*h*(-2*N1x*N2x + N1y*N2y*nu - N1y*N2y)/(2*(nu**2 - 1))
+    K[0+c1, 1+c2] += A*E*h*(-2*N1x*N2y*nu + N1y*N2x*nu - N1y*N2x)/(2*(nu**2 - 1))
+    K[0+c1, 0+c3] += A*E*h*(-2*N1x*N3x + N1y*N3y*nu - N1y*N3y)/(2*(nu**2 - 1))
+    K[0+c1, 1+c3] += A*E*h*(-2*N1x*N3y*nu + N1y*N3x*nu - N1y*N3x)/(2*(nu**2 - 1))
+    K[1+c1, 0+c1] += -A*E*N1x*N1y*h/(2*nu - 2)
+    K[1+c1, 1+c1] += A*E*h*(N1x**2*nu - N1x**2 - 2*N1y**2)/(2*(nu**2 - 1))
+    K[1+c1, 0+c2] += A*E*h*(N1x*N2y*nu - N1x*N2y - 2*N1y*N2x*nu)/(2*(nu**2 - 1))
+    K[1+c1, 1+c2] += A*E*h*(N1x*N2x*nu - N1x*N2x - 2*N1y*N2y)/(2*(nu**2 - 1))
+    K[1+c1, 0+c3] += A*E*h*(N1x*N3y*nu - N1x*N3y - 2*N1y*N3x*nu)/(2*(nu**2 - 1))
+    K[1+c1, 1+c3] += A*E*h*(N1x*N3x*nu - N1x*N3x - 2*N1y*N3y)/(2*(nu**2 - 1))
+    K[0+c2, 0+c1] += A*E*h*(-2*N1x*N2x + N1y*N2y*nu - N1y*N2y)/(2*(nu**2 - 1))
+    K[0+c2, 1+c1] += A*E*h*(N1x*N2y*nu - N1x*N2y - 2*N1y*N2x*nu)/(2*(nu**2 - 1))
+    K[0+c2, 0+c2] += A*E*h*(-2*N2x**2 + N2y**2*nu - N2y**2)/(2*(nu**2 - 1))
+    K[0+c2, 1+c2] += -A*E*N2x*N2y*h/(2*nu - 2)
+    K[0+c2, 0+c3] += A*E*h*(-2*N2x*N3x + N2y*N3y*nu - N2y*N3y)/(2*(nu**2 - 1))
+    K[0+c2, 1+c3] += A*E*h*(-2*N2x*N3y*nu + N2y*N3x*nu - N2y*N3x)/(2*(nu**2 - 1))
+    K[1+c2, 0+c1] += A*E*h*(-2*N1x*N2y*nu + N1y*N2x*nu - N1y*N2x)/(2*(nu**2 - 1))
+    K[1+c2, 1+c1] += A*E*h*(N1x*N2x*nu - N1x*N2x - 2*N1y*N2y)/(2*(nu**2 - 1))
+    K[1+c2, 0+c2] += -A*E*N2x*N2y*h/(2*nu - 2)
+    K[1+c2, 1+c2] += A*E*h*(N2x**2*nu - N2x**2 - 2*N2y**2)/(2*(nu**2 - 1))
+    K[1+c2, 0+c3] += A*E*h*(N2x*N3y*nu - N2x*N3y - 2*N2y*N3x*nu)/(2*(nu**2 - 1))
+    K[1+c2, 1+c3] += A*E*h*(N2x*N3x*nu - N2x*N3x - 2*N2y*N3y)/(2*(nu**2 - 1))
+    K[0+c3, 0+c1] += A*E*h*(-2*N1x*N3x + N1y*N3y*nu - N1y*N3y)/(2*(nu**2 - 1))
+    K[0+c3, 1+c1] += A*E*h*(N1x*N3y*nu - N1x*N3y - 2*N1y*N3x*nu)/(2*(nu**2 - 1))
+    K[0+c3, 0+c2] += A*E*h*(-2*N2x*N3x + N2y*N3y*nu - N2y*N3y)/(2*(nu**2 - 1))
+    K[0+c3, 1+c2] += A*E*h*(N2x*N3y*nu - N2x*N3y - 2*N2y*N3x*nu)/(2*(nu**2 - 1))
+    K[0+c3, 0+c3] += A*E*h*(-2*N3x**2 + N3y**2*nu - N3y**2)/(2*(nu**2 - 1))
+    K[0+c3, 1+c3] += -A*E*N3x*N3y*h/(2*nu - 2)
+    K[1+c3, 0+c1] += A*E*h*(-2*N1x*N3y*nu + N1y*N3x*nu - N1y*N3x)/(2*(nu**2 - 1))
+    K[1+c3, 1+c1] += A*E*h*(N1x*N3x*nu - N1x*N3x - 2*N1y*N3y)/(2*(nu**2 - 1))
+    K[1+c3, 0+c2] += A*E*h*(-2*N2x*N3y*nu + N2y*N3x*nu - N2y*N3x)/(2*(nu**2 - 1))
+    K[1+c3, 1+c2] += A*E*h*(N2x*N3x*nu - N2x*N3x - 2*N2y*N3y)/(2*(nu**2 - 1))
+    K[1+c3, 0+c3] += -A*E*N3x*N3y*h/(2*nu - 2)
+    K[1+c3, 1+c3] += A*E*h*(N3x**2*nu - N3x**2 - 2*N3y**2)/(2*(nu**2 - 1))
 
     if lumped:
         M[0+c1, 0+c1] += A*h*rho/3
@@ -121,3 +133,118 @@ def update_K_M(tria, nid_pos, ncoords, K, M, lumped=False):
         M[1+c3, 1+c1] += A*h*rho/12
         M[1+c3, 1+c2] += A*h*rho/12
         M[1+c3, 1+c3] += A*h*rho/6
+
+
+def B_operator(trias, nid_pos, N):
+    """Sparse strain-displacement operator of all elements
+
+    Built from the derivatives cached by :func:`update_K_M`, such that the
+    strains of all elements for many displacement states are obtained with a
+    single sparse matrix product
+
+    Parameters
+    ----------
+    trias : list
+        Tria elements, already used in :func:`update_K_M`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    N : int
+        Number of DOFs of the whole model
+
+    Returns
+    -------
+    B : (3*nelem, N) sparse matrix
+        Rows ``3*i``, ``3*i + 1`` and ``3*i + 2`` give ``exx``, ``eyy`` and
+        ``gxy`` of element ``i``
+
+    """
+    dNdx = [tria.dNdx for tria in trias]
+    if any(d is None for d in dNdx):
+        raise ValueError('derivatives not cached, call update_K_M first')
+    dNdx = np.asarray(dNdx)
+    Nx = dNdx[:, 0]
+    Ny = dNdx[:, 1]
+    nelem = len(trias)
+    pos = np.array([[nid_pos[tria.n1], nid_pos[tria.n2], nid_pos[tria.n3]]
+        for tria in trias])
+    cu = DOF*pos
+    cv = DOF*pos + 1
+    r0 = 3*np.arange(nelem)[:, None]*np.ones((1, 3), dtype=int)
+    rows = np.concatenate([r0, r0 + 1, r0 + 2, r0 + 2], axis=1)
+    cols = np.concatenate([cu, cv, cu, cv], axis=1)
+    data = np.concatenate([Nx, Ny, Ny, Nx], axis=1)
+    return coo_matrix((data.ravel(), (rows.ravel(), cols.ravel())),
+            shape=(3*nelem, N)).tocsr()
+
+
+def strains(trias, nid_pos, u, B=None):
+    """Strains of all elements at once
+
+    Parameters
+    ----------
+    trias : list
+        Tria elements, already used in :func:`update_K_M`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    u : (N,) or (N, nvec) array-like
+        Displacements of the whole model, e.g. mode shapes or time steps
+    B : sparse matrix or None, optional
+        Operator from :func:`B_operator`, to be reused between calls
+
+    Returns
+    -------
+    eps : (nelem, 3) or (nelem, 3, nvec) array-like
+        ``exx, eyy, gxy`` of each element
+
+    """
+    u = np.asarray(u)
+    if B is None:
+        B = B_operator(trias, nid_pos, u.shape[0])
+    return (B @ u).reshape((len(trias), 3) + u.shape[1:])
+
+
+def stresses(trias, eps):
+    """Plane stress stresses of all elements at once
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3PlaneStressIso` objects
+    eps : (nelem, 3) or (nelem, 3, nvec) array-like
+        Strains, see :func:`strains`
+
+    Returns
+    -------
+    sigma : (nelem, 3) or (nelem, 3, nvec) array-like
+        ``sxx, syy, txy`` of each element
+
+    """
+    eps = np.asarray(eps)
+    shape = (-1,) + (1,)*(eps.ndim - 2)
+    E = np.array([tria.E for tria in trias], dtype=float).reshape(shape)
+    nu = np.array([tria.nu for tria in trias], dtype=float).reshape(shape)
+    exx, eyy, gxy = eps[:, 0], eps[:, 1], eps[:, 2]
+    c = E/(1 - nu**2)
+    return np.stack([c*(exx + nu*eyy), c*(nu*exx + eyy),
+        c*(1 - nu)/2*gxy], axis=1)
+
+
+def von_mises(trias, sigma):
+    """Von Mises stress of all elements at once
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3PlaneStressIso` objects
+    sigma : (nelem, 3) or (nelem, 3, nvec) array-like
+        Stresses, see :func:`stresses`
+
+    Returns
+    -------
+    svm : (nelem,) or (nelem, nvec) array-like
+        Von Mises stress of each element
+
+    """
+    sigma = np.asarray(sigma)
+    sxx, syy, txy = sigma[:, 0], sigma[:, 1], sigma[:, 2]
+    return np.sqrt(sxx**2 - sxx*syy + syy**2 + 3*txy**2)
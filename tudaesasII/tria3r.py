@@ -1,6 +1,9 @@
 import numpy as np
 from numpy.linalg import norm
 
+from .quad4r import (SUBSET_DOFS, membrane_bending_uncoupled, update_subset,
+        element_strains, element_stress_resultants)
+
 DOF = 5
 
 class Tria3R(object):
@@ -8,9 +11,13 @@ class Tria3R(object):
 
     Formulated based on the first-order shear deformation theory for plates
 
+    The derivatives of the shape functions and the transverse shear
+    reduction factor are cached in `dNdx` and `shear_factor` by
+    :func:`update_K`, to be reused by :func:`strains`.
+
     """
     __slots__ = ['n1', 'n2', 'n3', 'ABDE', 'A', 'h', 'rho',
-            'scf13', 'scf23']
+            'scf13', 'scf23', 'dNdx', 'shear_factor']
     def __init__(self):
         self.n1 = None
         self.n2 = None
@@ -20,8 +27,10 @@ class Tria3R(object):
         self.rho = None
         self.scf13 = 5/6. # transverse shear correction factor XZ
         self.scf23 = 5/6. # transverse shear correction factor YZ
+        self.dNdx = None
+        self.shear_factor = None
 
-def update_K(tria, nid_pos, ncoords, K):
+def update_K(tria, nid_pos, ncoords, K, subset=None):
     """Update K according to a tria element
 
     Properties
@@ -34,8 +43,19 @@ def update_K(tria, nid_pos, ncoords, K):
         Nodal coordinates of the whole model
     K : np.array
         Global stiffness matrix
+    subset : str or None, optional
+        ``'membrane'`` or ``'bending'`` to assemble only the corresponding
+        DOFs, in which case `K` has ``len(SUBSET_DOFS[subset])`` DOFs per
+        node. Only allowed when :func:`.quad4r.membrane_bending_uncoupled` is
+        ``True``
 
     """
+    if subset is not None:
+        if not membrane_bending_uncoupled(tria.ABDE):
+            raise ValueError('membrane and bending are coupled, B matrix is not zero')
+        update_subset(update_K, tria, [tria.n1, tria.n2, tria.n3], nid_pos,
+                ncoords, K, subset)
+        return
     pos1 = nid_pos[tria.n1]
     pos2 = nid_pos[tria.n2]
     pos3 = nid_pos[tria.n3]
@@ -82,6 +102,7 @@ def update_K(tria, nid_pos, ncoords, K):
     N1y = (-x2 + x3)/(2*A)
     N2y = (x1 - x3)/(2*A)
     N3y = (-x1 + x2)/(2*A)
+    tria.dNdx = np.array([[N1x, N2x, N3x], [N1y, N2y, N3y]])
 
     # positions c1, c2 in the stiffness and mass matrices
     c1 = DOF*pos1
@@ -95,6 +116,7 @@ def update_K(tria, nid_pos, ncoords, K):
     #NOTE strategy to prevent shear locking used in BFG elements imported here...
     alpha = 1.15
     factor = alpha*maxl**2/h**2
+    tria.shear_factor = 1 / (1 + factor)
     E44 = 1 / (1 + factor) * E44
     # E45 = 1 / (1 + factor) * E45
     E55 = 1 / (1 + factor) * E55
@@ -290,7 +312,7 @@ def update_K(tria, nid_pos, ncoords, K):
     K[4+c3, 4+c3] += A*(6*D22*N3y**2 + 12*D26*N3x*N3y + 6*D66*N3x**2 + E44)/6
 
 
-def update_M(tria, nid_pos, ncoords, M):
+def update_M(tria, nid_pos, ncoords, M, subset=None):
     """Update M according to a tria element
 
     Properties
@@ -303,8 +325,15 @@ def update_M(tria, nid_pos, ncoords, M):
         Nodal coordinates of the whole model
     M : np.array
         Global mass matrix
+    subset : str or None, optional
+        ``'membrane'`` or ``'bending'`` to assemble only the corresponding
+        DOFs, see :func:`update_K`
 
     """
+    if subset is not None:
+        update_subset(update_M, tria, [tria.n1, tria.n2, tria.n3], nid_pos,
+                ncoords, M, subset)
+        return
     pos1 = nid_pos[tria.n1]
     pos2 = nid_pos[tria.n2]
     pos3 = nid_pos[tria.n3]
@@ -392,3 +421,52 @@ def update_M(tria, nid_pos, ncoords, M):
     M[4+c3, 4+c2] += A*h**3*rho/144
     M[4+c3, 4+c3] += A*h**3*rho/72
 
+
+
+def strains(trias, nid_pos, u):
+    """Generalized strains of all tria elements at once
+
+    Evaluated at the centroid using the derivatives cached by
+    :func:`update_K`, such that the strains of many modes or time steps are
+    obtained with a few array operations
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3R` objects, already used in :func:`update_K`
+    nid_pos : dict
+        Correspondence between node ids and their position in the global assembly
+    u : (N,) or (N, nvec) array-like
+        Displacements of the whole model, e.g. mode shapes or time steps
+
+    Returns
+    -------
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``exx, eyy, gxy, kxx, kyy, kxy, gyz, gxz``, in the order of the rows
+        of ``ABDE``
+
+    """
+    nodes = [[tria.n1, tria.n2, tria.n3] for tria in trias]
+    return element_strains(trias, nodes, nid_pos, u, np.full(3, 1/3))
+
+
+def stress_resultants(trias, eps):
+    """Stress resultants of all tria elements at once
+
+    Parameters
+    ----------
+    trias : list
+        `.Tria3R` objects, already used in :func:`update_K`
+    eps : (nelem, 8) or (nelem, 8, nvec) array-like
+        Generalized strains, see :func:`strains`
+
+    Returns
+    -------
+    res : (nelem, 8) or (nelem, 8, nvec) array-like
+        ``Nxx, Nyy, Nxy, Mxx, Myy, Mxy, Qy, Qx``, with the transverse shear
+        correction factors and the shear-locking reduction of
+        :func:`update_K` applied
+
+    """
+    shear_factor = np.array([tria.shear_factor for tria in trias], dtype=float)
+    return element_stress_resultants(trias, eps, shear_factor)
@@ -1,12 +1,78 @@
+import queue
+import shutil
+import subprocess
+import threading
+
+import numpy as np
 import matplotlib.pyplot as plt
-from scipy.sparse import coo_matrix
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+from matplotlib.text import Text
+from scipy.sparse import coo_matrix, csr_matrix, issparse
+
+def sparse_matrix_density(m, resolution=512):
+    """Number of nonzeros of a sparse matrix binned on a coarse grid
+
+    The bins are computed with ``np.bincount`` directly from the CSR indices,
+    without converting the matrix to COO.
+
+    Parameters
+    ----------
+    m : array-like or sparse matrix
+        Matrix to be binned
+    resolution : int, optional
+        Maximum number of bins along each direction
+
+    Returns
+    -------
+    density : (nr, nc) array-like
+        Number of nonzeros in each bin, ``nr = min(resolution, m.shape[0])``
+        and ``nc = min(resolution, m.shape[1])``
+
+    """
+    if not (issparse(m) and m.format == 'csr'):
+        m = csr_matrix(m)
+    nrows, ncols = m.shape
+    nr = min(resolution, nrows)
+    nc = min(resolution, ncols)
+    # bin of each row repeated by the number of nonzeros of the row
+    rowbin = np.arange(nrows, dtype=np.int64)*nr//nrows
+    rowbin = np.repeat(rowbin, np.diff(m.indptr))
+    colbin = m.indices.astype(np.int64)*nc//ncols
+    density = np.bincount(rowbin*nc + colbin, minlength=nr*nc)
+    return density.reshape(nr, nc)
 
-def plot_sparse_matrix(m):
-    if not isinstance(m, coo_matrix):
-        m = coo_matrix(m)
+
+def plot_sparse_matrix(m, resolution=None):
+    """Plot the sparsity pattern of a matrix
+
+    Parameters
+    ----------
+    m : array-like or sparse matrix
+        Matrix to be plotted
+    resolution : int or None, optional
+        With ``None`` one marker is plotted per nonzero. Otherwise the
+        nonzeros are binned with :func:`sparse_matrix_density` and drawn as
+        a single image, in logarithmic scale, such that the drawing time
+        does not depend on the number of nonzeros
+
+    Returns
+    -------
+    ax : `matplotlib.axes.Axes`
+        Axes with the plot
+
+    """
     fig = plt.figure()
     ax = fig.add_subplot(111, facecolor='black')
-    ax.plot(m.col, m.row, 's', color='white', ms=0.1)
+    if resolution is None:
+        if not isinstance(m, coo_matrix):
+            m = coo_matrix(m)
+        ax.plot(m.col, m.row, 's', color='white', ms=0.1)
+    else:
+        density = sparse_matrix_density(m, resolution)
+        ax.imshow(np.log1p(density), cmap='gray', interpolation='nearest',
+                extent=(0, m.shape[1], m.shape[0], 0), aspect='auto')
     ax.set_xlim(0, m.shape[1])
     ax.set_ylim(0, m.shape[0])
     ax.set_aspect('equal')
@@ -17,3 +83,238 @@ def plot_sparse_matrix(m):
     ax.set_xticks([])
     ax.set_yticks([])
     return ax
+
+
+def _frame_data(artist, data):
+    """Frame data as arrays and number of frames"""
+    if isinstance(artist, Line2D):
+        x, y = np.asarray(data[0]), np.asarray(data[1])
+        nframes = [a.shape[0] for a in (x, y) if a.ndim == 2]
+        return (x, y), (nframes[0] if nframes else None)
+    if isinstance(artist, Text):
+        return list(data), len(data)
+    if isinstance(artist, Collection):
+        data = np.asarray(data)
+        return data, data.shape[0]
+    raise ValueError('artists must be Line2D, Text or Collection objects')
+
+
+def _set_frame(artist, data, i):
+    if isinstance(artist, Line2D):
+        x, y = data
+        artist.set_data(x[i] if x.ndim == 2 else x, y[i] if y.ndim == 2 else y)
+    elif isinstance(artist, Text):
+        artist.set_text(data[i])
+    else:
+        artist.set_offsets(data[i])
+
+
+class _PillowWriter(object):
+    def __init__(self, filename, fps):
+        self.filename = filename
+        self.fps = fps
+        self.images = []
+
+    def __call__(self, frame):
+        from PIL import Image
+        image = Image.fromarray(frame[:, :, :3])
+        self.images.append(image.convert('P', palette=Image.ADAPTIVE))
+
+    def close(self):
+        self.images[0].save(self.filename, save_all=True,
+                append_images=self.images[1:], duration=1000/self.fps, loop=0)
+
+
+class _FFMpegWriter(object):
+    def __init__(self, filename, fps):
+        if shutil.which('ffmpeg') is None:
+            raise RuntimeError('ffmpeg not found, use writer="pillow"')
+        self.filename = filename
+        self.fps = fps
+        self.proc = None
+
+    def __call__(self, frame):
+        if self.proc is None:
+            height, width = frame.shape[:2]
+            self.proc = subprocess.Popen(['ffmpeg', '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', '%dx%d' % (width,
+                height), '-r', str(self.fps), '-i', '-', '-vf',
+                'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p',
+                self.filename], stdin=subprocess.PIPE)
+        self.proc.stdin.write(frame.tobytes())
+
+    def close(self):
+        if self.proc is not None:
+            self.proc.stdin.close()
+            if self.proc.wait() != 0:
+                raise RuntimeError('ffmpeg failed writing %s' % self.filename)
+
+
+def _consume(frames, write, errors):
+    while True:
+        frame = frames.get()
+        if frame is None:
+            break
+        if not errors:
+            try:
+                write(frame)
+            except Exception as e:
+                errors.append(e)
+
+
+class _BlitAnimation(object):
+    """Interactive animation blitting the whole figure
+
+    The background of the whole figure is cached at every full draw, such
+    that artists outside the axes, e.g. titles, are also restored and redrawn
+    at every frame. Frames are advanced by a timer of the canvas.
+
+    """
+    __slots__ = ['fig', 'artists', 'update', 'nframes', 'frame',
+            'background', 'timer', 'cids']
+    def __init__(self, fig, artists, update, nframes, interval):
+        self.fig = fig
+        self.artists = artists
+        self.update = update
+        self.nframes = nframes
+        self.frame = 0
+        self.background = None
+        for artist in artists:
+            artist.set_animated(True)
+        canvas = fig.canvas
+        self.cids = [canvas.mpl_connect('draw_event', self._on_draw),
+                     canvas.mpl_connect('close_event', self._on_close)]
+        self.timer = canvas.new_timer(interval=interval)
+        self.timer.add_callback(self._step)
+        self.timer.start()
+
+    def _on_draw(self, event):
+        # the animated artists are skipped by full draws
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def _on_close(self, event):
+        self.timer.stop()
+        for cid in self.cids:
+            self.fig.canvas.mpl_disconnect(cid)
+        # such that the last frame is kept by later full draws, e.g. savefig
+        for artist in self.artists:
+            artist.set_animated(False)
+
+    def _step(self):
+        self.draw_frame(self.frame)
+        self.frame = (self.frame + 1) % self.nframes
+
+    def draw_frame(self, i):
+        """Draw frame `i` restoring the background of the whole figure"""
+        if self.background is None:
+            return
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        for artist in self.update(i):
+            self.fig.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+
+def animate(fig, artists, data, filename=None, fps=25, writer=None,
+        queue_size=64):
+    """Animate precomputed frames using blitting
+
+    The data of all frames, e.g. the deformed geometry at every time step,
+    is computed beforehand as arrays, such that each frame only updates the
+    artists. The static parts of the figure are rendered once and only the
+    artists are redrawn on top of them.
+
+    Parameters
+    ----------
+    fig : `matplotlib.figure.Figure`
+        Figure containing the artists
+    artists : list
+        Artists created beforehand, ``Line2D`` (e.g. from ``ax.plot``),
+        ``Text`` (e.g. from ``ax.set_title``) or collections (e.g. from
+        ``ax.scatter``). Axes limits must be set beforehand
+    data : list
+        Frame data of each artist: ``(x, y)`` for ``Line2D``, where each of
+        `x` and `y` is either ``(nframes, npoints)`` or a constant
+        ``(npoints,)`` array; a sequence of ``nframes`` strings for ``Text``;
+        and an ``(nframes, npoints, 2)`` array of offsets for collections
+    filename : str or None, optional
+        If given, the frames are rendered off-screen and written to this
+        file by a background thread. Otherwise a blitted animation is
+        returned for interactive display, in both cases the background of
+        the whole figure is restored at each frame, such that titles and
+        other artists outside the axes are also updated
+    fps : int, optional
+        Frames per second
+    writer : str, callable or None, optional
+        ``'ffmpeg'`` (requires the ``ffmpeg`` executable in the path),
+        ``'pillow'`` or a function receiving each frame as an ``(height,
+        width, 4)`` RGBA array. By default ``'pillow'`` for ``.gif`` files and
+        ``'ffmpeg'`` otherwise
+    queue_size : int, optional
+        Maximum number of rendered frames waiting to be written
+
+    Returns
+    -------
+    ani : object or None
+        Animation when `filename` is ``None``, advanced by a timer of the
+        canvas, a reference to it must be kept until the figure is closed.
+        Its ``draw_frame(i)`` method draws a given frame
+
+    """
+    frames = [_frame_data(artist, d) for artist, d in zip(artists, data)]
+    data = [d for d, _ in frames]
+    nframes = set(n for _, n in frames if n is not None)
+    if len(nframes) != 1:
+        raise ValueError('all artists must have the same number of frames')
+    nframes = nframes.pop()
+
+    def update(i):
+        for artist, d in zip(artists, data):
+            _set_frame(artist, d, i)
+        return artists
+
+    if filename is None and not callable(writer):
+        return _BlitAnimation(fig, artists, update, nframes,
+                interval=int(1000/fps))
+
+    if callable(writer):
+        write = writer
+    elif writer == 'pillow' or (writer is None and
+            str(filename).lower().endswith('.gif')):
+        write = _PillowWriter(filename, fps)
+    elif writer in (None, 'ffmpeg'):
+        write = _FFMpegWriter(filename, fps)
+    else:
+        raise ValueError('writer must be "ffmpeg", "pillow" or callable')
+
+    canvas = fig.canvas
+    if not isinstance(canvas, FigureCanvasAgg):
+        canvas = FigureCanvasAgg(fig)
+    for artist in artists:
+        artist.set_animated(True)
+    queue_frames = queue.Queue(maxsize=queue_size)
+    errors = []
+    thread = threading.Thread(target=_consume, args=(queue_frames, write,
+        errors), daemon=True)
+    thread.start()
+    try:
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        for i in range(nframes):
+            canvas.restore_region(background)
+            for artist in update(i):
+                fig.draw_artist(artist)
+            queue_frames.put(np.array(canvas.buffer_rgba()))
+    finally:
+        queue_frames.put(None)
+        thread.join()
+        for artist in artists:
+            artist.set_animated(False)
+    if errors:
+        raise errors[0]
+    if hasattr(write, 'close'):
+        write.close()
+    return None